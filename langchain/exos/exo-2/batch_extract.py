@@ -0,0 +1,318 @@
+import os
+import math
+import glob
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import Dict, List, Any, Optional
+
+import openai
+from dotenv import load_dotenv
+
+from models import OptimizationProblem, ProblemStatement
+from load_data import load_problem_description
+from llm_cache import LLMCache
+from replay_model import ReplayChatModel
+from extract_problem import create_llm, MODEL_NAME, TEMPERATURE
+from table_parser import prepare_extraction, complete_extraction
+
+load_dotenv()
+
+# Erreurs pour lesquelles un nouvel essai a un sens (quota, réseau, serveur)
+TRANSIENT_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    ConnectionError,
+    asyncio.TimeoutError
+)
+
+class TokenBucket:
+    """
+    Limiteur de débit à jetons : rate appels par seconde, rafales de capacity appels
+
+    Les jetons se remplissent en continu ; acquire() attend le prochain
+    jeton disponible sans bloquer la boucle d'événements.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        """
+        Args:
+            rate: Jetons ajoutés par seconde
+            capacity: Nombre maximal de jetons (par défaut : max(1, rate))
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Attend puis consomme un jeton"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentile q (0-100) par rang le plus proche"""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+def find_input_files(inputs: List[str]) -> List[str]:
+    """Énoncés désignés par des répertoires (*.txt), motifs glob ou fichiers, sans doublon"""
+    files = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.txt"))
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        files.extend(sorted(matches))
+    return list(dict.fromkeys(files))
+
+def output_files(input_files: List[str], output_dir: str) -> List[str]:
+    """Fichier d'extraction de chaque énoncé : nom de l'énoncé, suffixé en cas de doublon"""
+    files, used = [], set()
+    for input_file in input_files:
+        name = os.path.splitext(os.path.basename(input_file))[0]
+        candidate, k = name, 1
+        while candidate in used:
+            k += 1
+            candidate = f"{name}_{k}"
+        used.add(candidate)
+        files.append(os.path.join(output_dir, f"{candidate}.json"))
+    return files
+
+def write_result(problem: OptimizationProblem, output_file: str):
+    """Écrit une extraction (remplacement atomique : jamais de fichier partiel)"""
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(problem.model_dump(), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, output_file)
+
+async def extract_one(
+    structured_llms: Dict[Any, Any],
+    input_file: str,
+    output_file: str,
+    semaphore: asyncio.Semaphore,
+    bucket: Optional[TokenBucket],
+    cache: Optional[LLMCache],
+    store: bool = True,
+    max_retries: int = 4,
+    base_delay: float = 1.0,
+    timeout_seconds: float = 120,
+    use_table_parser: bool = True
+) -> Dict[str, Any]:
+    """
+    Extrait un énoncé : cache, limite de concurrence et de débit, nouveaux essais
+
+    Les erreurs transitoires (TRANSIENT_ERRORS) sont réessayées après une
+    attente exponentielle avec gigue (base_delay x 2^essai x [0.5, 1.5]) ;
+    les autres (réponse non conforme au schéma...) échouent immédiatement.
+    Le résultat est écrit dans output_file dès qu'il est disponible, et
+    mis en cache si store est vrai (pas pour les réponses rejouées). Toute
+    autre erreur (lecture de l'énoncé, écriture...) est rapportée dans le
+    résultat au lieu d'interrompre le lot. Le
+    tableau des enseignants est lu sans LLM s'il est reconnu (voir
+    prepare_extraction) : structured_llms associe un runnable à chaque schéma.
+
+    Returns:
+        Dictionnaire {input_file, output_file, status, attempts, latency, error}
+    """
+    start = time.perf_counter()
+    result = {"input_file": input_file, "output_file": None, "status": "failed", "attempts": 0,
+              "latency": 0.0, "error": None}
+
+    try:
+        description = await asyncio.to_thread(load_problem_description, input_file)
+        prompt, schema, teachers = prepare_extraction(description, use_table_parser)
+        key = LLMCache.key(prompt, MODEL_NAME, TEMPERATURE, schema)
+        problem = cache.get(key, schema) if cache is not None else None
+        if problem is not None:
+            result["status"] = "cached"
+        else:
+            async with semaphore:
+                for attempt in range(max_retries + 1):
+                    if bucket is not None:
+                        await bucket.acquire()
+                    result["attempts"] += 1
+                    try:
+                        problem = await asyncio.wait_for(structured_llms[schema].ainvoke(prompt), timeout_seconds)
+                        result["status"] = "extracted"
+                        break
+                    except TRANSIENT_ERRORS as error:
+                        result["error"] = f"{type(error).__name__}: {error}"
+                        if attempt == max_retries:
+                            break
+                        await asyncio.sleep(base_delay * 2 ** attempt * random.uniform(0.5, 1.5))
+                    except Exception as error:
+                        result["error"] = f"{type(error).__name__}: {error}"
+                        break
+            if problem is not None and cache is not None and store:
+                cache.put(key, problem, prompt, MODEL_NAME, TEMPERATURE)
+
+        if problem is not None:
+            problem = complete_extraction(problem, teachers)
+            await asyncio.to_thread(write_result, problem, output_file)
+            result.update(output_file=output_file, error=None)
+    except Exception as error:
+        # Énoncé illisible, écriture impossible... : l'échec reste propre à cet énoncé
+        result.update(status="failed", output_file=None, error=f"{type(error).__name__}: {error}")
+    result["latency"] = time.perf_counter() - start
+    return result
+
+async def extract_batch(
+    input_files: List[str],
+    output_dir: str = "extractions",
+    llm: Any = None,
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    burst: Optional[int] = None,
+    cache: Optional[LLMCache] = None,
+    max_retries: int = 4,
+    base_delay: float = 1.0,
+    use_table_parser: bool = True
+) -> Dict[str, Any]:
+    """
+    Extrait de nombreux énoncés en parallèle (ainvoke du runnable structuré)
+
+    Un runnable with_structured_output est partagé par schéma de sortie ;
+    au plus concurrency appels sont en cours et, si rate est donné, au plus
+    rate appels démarrent par seconde (seau à jetons). Chaque extraction est
+    écrite dans output_dir/<énoncé>.json dès qu'elle se termine (suffixé
+    _2, _3... si deux énoncés portent le même nom, voir output_files).
+
+    Args:
+        input_files: Fichiers d'énoncé
+        output_dir: Répertoire des extractions
+        llm: Modèle de chat (par défaut : ChatOpenAI, voir create_llm)
+        concurrency: Nombre maximal d'appels simultanés
+        rate: Appels par seconde (None : pas de limite de débit)
+        burst: Rafale maximale du seau à jetons
+        cache: Cache des extractions (None : toujours appeler le LLM)
+        max_retries: Nouveaux essais après une erreur transitoire
+        base_delay: Attente initiale avant un nouvel essai (s)
+        use_table_parser: Lit les tableaux d'enseignants sans LLM s'ils sont reconnus
+
+    Returns:
+        Rapport {inputs, extracted, cached, failed, retries, elapsed,
+        throughput, latency_p50, latency_p95, latency_p99, results}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    llm = llm or create_llm()
+    structured_llms = {
+        schema: llm.with_structured_output(schema) for schema in (OptimizationProblem, ProblemStatement)
+    }
+    store = not isinstance(llm, ReplayChatModel)
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate, burst) if rate else None
+
+    start = time.perf_counter()
+    tasks = [
+        asyncio.create_task(extract_one(
+            structured_llms, input_file, output_file,
+            semaphore, bucket, cache, store, max_retries, base_delay,
+            use_table_parser=use_table_parser
+        ))
+        for input_file, output_file in zip(input_files, output_files(input_files, output_dir))
+    ]
+    results = []
+    for done, task in enumerate(asyncio.as_completed(tasks), 1):
+        result = await task
+        results.append(result)
+        print(f"  [{done}/{len(tasks)}] {result['input_file']} : {result['status']} "
+              f"({result['latency']:.2f}s" + (f", {result['attempts']} essais)" if result['attempts'] > 1 else ")")
+              + (f" {result['error']}" if result['error'] else ""))
+    elapsed = time.perf_counter() - start
+
+    latencies = [result["latency"] for result in results if result["status"] == "extracted"]
+    report = {
+        "inputs": len(input_files),
+        "extracted": len(latencies),
+        "cached": sum(1 for result in results if result["status"] == "cached"),
+        "failed": sum(1 for result in results if result["status"] == "failed"),
+        "retries": sum(max(0, result["attempts"] - 1) for result in results),
+        "elapsed": elapsed,
+        "throughput": len(results) / elapsed if elapsed > 0 else 0.0
+    }
+    if latencies:
+        report.update({f"latency_p{q}": percentile(latencies, q) for q in (50, 95, 99)})
+    report["results"] = sorted(results, key=lambda result: input_files.index(result["input_file"]))
+    return report
+
+def print_report(report: Dict[str, Any]):
+    """Affiche le débit et les latences des extractions"""
+    print("\n" + "="*60)
+    print("EXTRACTION EN LOT")
+    print("="*60)
+    print(f"Énoncés : {report['inputs']} ({report['extracted']} extraits, {report['cached']} en cache, "
+          f"{report['failed']} en échec, {report['retries']} nouveaux essais)")
+    print(f"Durée : {report['elapsed']:.2f}s, débit : {report['throughput']:.2f} énoncés/s")
+    if "latency_p99" in report:
+        print(f"Latence : p50 {report['latency_p50']:.2f}s, p95 {report['latency_p95']:.2f}s, "
+              f"p99 {report['latency_p99']:.2f}s")
+    print("="*60)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extraction en lot de nombreux énoncés")
+    parser.add_argument("inputs", nargs="+", help="Répertoires (*.txt), motifs glob ou fichiers d'énoncé")
+    parser.add_argument("--output-dir", default="extractions", help="Répertoire des extractions")
+    parser.add_argument("--concurrency", type=int, default=8, help="Appels simultanés au maximum")
+    parser.add_argument("--rate", type=float, default=None, help="Appels par seconde au maximum")
+    parser.add_argument("--burst", type=int, default=None, help="Rafale maximale (seau à jetons)")
+    parser.add_argument("--retries", type=int, default=4, help="Nouveaux essais après une erreur transitoire")
+    parser.add_argument("--no-cache", action="store_true", help="Toujours appeler le LLM")
+    parser.add_argument("--replay", action="store_true",
+                        help="Modèle local rejouant les réponses enregistrées (hors ligne)")
+    parser.add_argument("--replay-file", default=None,
+                        help="Réponse JSON rejouée pour un énoncé jamais enregistré")
+    parser.add_argument("--replay-latency", type=float, default=0.0,
+                        help="Latence simulée de chaque appel en mode rejeu (s)")
+    parser.add_argument("--replay-failure-rate", type=float, default=0.0,
+                        help="Proportion d'échecs transitoires simulés en mode rejeu")
+    parser.add_argument("--no-table-parser", action="store_true",
+                        help="Envoyer aussi les tableaux d'enseignants au LLM")
+    args = parser.parse_args()
+
+    input_files = find_input_files(args.inputs)
+    if not input_files:
+        parser.error("aucun fichier d'énoncé")
+
+    cache = None if args.no_cache else LLMCache()
+    llm = None
+    if args.replay:
+        llm = ReplayChatModel.from_cache(
+            cache or LLMCache(ttl_seconds=None),
+            default_file=args.replay_file,
+            latency_seconds=args.replay_latency,
+            failure_rate=args.replay_failure_rate
+        )
+
+    print(f"{len(input_files)} énoncés, extractions dans {args.output_dir}/")
+    report = asyncio.run(extract_batch(
+        input_files,
+        output_dir=args.output_dir,
+        llm=llm,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        burst=args.burst,
+        cache=cache,
+        max_retries=args.retries,
+        base_delay=0.1 if args.replay else 1.0,
+        use_table_parser=not args.no_table_parser
+    ))
+    print_report(report)
+
+    report_file = os.path.join(args.output_dir, "batch_report.json")
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n[OK] Rapport écrit dans {report_file}")
@@ -1,21 +1,62 @@
 import os
 import json
+import time
+import argparse
+from typing import Optional
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 
 from models import OptimizationProblem
 from load_data import load_problem_description
-from prompt_template import create_extraction_prompt
+from llm_cache import LLMCache, DEFAULT_TTL_SECONDS
+from replay_model import ReplayChatModel
+from table_parser import prepare_extraction, complete_extraction
 
 # Charger les variables d'environnement
 load_dotenv()
 
-def extract_optimization_problem(problem_file: str = "teachers_data.txt") -> OptimizationProblem:
+# Modèle et température de l'extraction
+MODEL_NAME = "gpt-4o-mini"
+TEMPERATURE = 0
+
+def create_llm(replay: bool = False, cache: Optional[LLMCache] = None, replay_file: Optional[str] = None):
+    """
+    Modèle de chat de l'extraction : ChatOpenAI, ou rejeu local hors ligne
+
+    Args:
+        replay: Rejoue les réponses enregistrées au lieu d'appeler l'API
+        cache: Cache dont les réponses sont rejouées
+        replay_file: Réponse JSON rejouée pour un prompt inconnu du cache
+    """
+    if replay:
+        return ReplayChatModel.from_cache(cache or LLMCache(ttl_seconds=None), default_file=replay_file)
+    return ChatOpenAI(
+        model=MODEL_NAME,
+        temperature=TEMPERATURE,
+        api_key=os.getenv("OPENAI_API_KEY")
+    )
+
+def extract_optimization_problem(
+    problem_file: str = "teachers_data.txt",
+    cache: Optional[LLMCache] = None,
+    replay: bool = False,
+    replay_file: Optional[str] = None,
+    use_table_parser: bool = True
+) -> OptimizationProblem:
     """
     Extrait la structure du problème d'optimisation depuis un énoncé en langage naturel
 
+    Le résultat validé est mis en cache (prompt, modèle, température et
+    schéma) : un énoncé inchangé ne fait ni appel au LLM ni création de client.
+    Un tableau d'enseignants (markdown ou CSV) est lu sans LLM : seul le
+    reste de l'énoncé (contraintes, objectif...) est alors envoyé au modèle.
+
     Args:
         problem_file: Chemin vers le fichier contenant l'énoncé
+        cache: Cache des extractions (None : toujours appeler le LLM)
+        replay: Utilise le modèle local qui rejoue les réponses enregistrées (hors ligne)
+        replay_file: Réponse JSON rejouée pour un énoncé jamais enregistré
+        use_table_parser: Lit le tableau des enseignants sans LLM s'il est reconnu
 
     Returns:
         Objet OptimizationProblem contenant toute la structure extraite
@@ -24,27 +65,37 @@ def extract_optimization_problem(problem_file: str = "teachers_data.txt") -> Opt
     print("Chargement de l'énoncé du problème...")
     problem_description = load_problem_description(problem_file)
 
-    # 2. Créer le prompt d'extraction
+    # 2. Créer le prompt d'extraction (tableau des enseignants lu sans LLM si possible)
     print("Création du prompt d'extraction...")
-    prompt = create_extraction_prompt(problem_description)
+    prompt, schema, teachers = prepare_extraction(problem_description, use_table_parser)
+    if teachers is not None:
+        print(f"Tableau des enseignants lu sans LLM ({len(teachers)} enseignants)")
+
+    # Extraction déjà faite pour ce prompt, ce modèle et ce schéma
+    key = LLMCache.key(prompt, MODEL_NAME, TEMPERATURE, schema)
+    if cache is not None:
+        result = cache.get(key, schema)
+        if result is not None:
+            print("Structure trouvée dans le cache : aucun appel au LLM")
+            return complete_extraction(result, teachers)
 
     # 3. Initialiser le LLM avec structured output
-    print("Initialisation du LLM...")
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0,
-        api_key=os.getenv("OPENAI_API_KEY")
-    )
+    print("Initialisation du LLM..." + (" (rejeu hors ligne)" if replay else ""))
+    llm = create_llm(replay, cache, replay_file)
 
     # 4. Créer un LLM structuré avec le schéma Pydantic
-    structured_llm = llm.with_structured_output(OptimizationProblem)
+    structured_llm = llm.with_structured_output(schema)
 
     # 5. Extraire la structure du problème
     print("Extraction de la structure du problème...")
-    problem = structured_llm.invoke(prompt)
+    start = time.perf_counter()
+    result = structured_llm.invoke(prompt)
 
-    print("Structure extraite avec succès!")
-    return problem
+    print(f"Structure extraite avec succès! ({time.perf_counter() - start:.2f}s)")
+    if cache is not None and not replay:
+        # Les réponses rejouées ne sont pas celles du modèle : pas de mise en cache
+        cache.put(key, result, prompt, MODEL_NAME, TEMPERATURE)
+    return complete_extraction(result, teachers)
 
 def save_problem_to_json(problem: OptimizationProblem, output_file: str = "problem_structure.json"):
     """
@@ -59,8 +110,25 @@ def save_problem_to_json(problem: OptimizationProblem, output_file: str = "probl
     print(f"Structure sauvegardée dans {output_file}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extraction de la structure du problème d'optimisation")
+    parser.add_argument("--input", default="teachers_data.txt", help="Fichier de l'énoncé")
+    parser.add_argument("--no-cache", action="store_true", help="Toujours appeler le LLM")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL_SECONDS,
+                        help="Durée de validité (s) des extractions en cache")
+    parser.add_argument("--replay", action="store_true",
+                        help="Hors ligne : rejouer les réponses enregistrées (modèle local)")
+    parser.add_argument("--replay-file", default=None,
+                        help="Réponse JSON rejouée pour un énoncé jamais enregistré")
+    parser.add_argument("--no-table-parser", action="store_true",
+                        help="Envoyer aussi le tableau des enseignants au LLM")
+    args = parser.parse_args()
+
     # Extraire la structure du problème
-    problem = extract_optimization_problem()
+    cache = None if args.no_cache else LLMCache(ttl_seconds=args.cache_ttl)
+    problem = extract_optimization_problem(args.input, cache=cache, replay=args.replay, replay_file=args.replay_file,
+                                           use_table_parser=not args.no_table_parser)
+    if cache is not None:
+        cache.print_statistics()
 
     # Afficher le résultat
     print("\n" + "="*60)
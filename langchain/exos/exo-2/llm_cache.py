@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+from typing import Dict, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from models import OptimizationProblem
+
+# Durée de validité par défaut d'une réponse (7 jours) et nombre maximal d'entrées
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 500
+
+def prompt_hash(prompt: str) -> str:
+    """Empreinte SHA-256 d'un prompt (clé des enregistrements rejoués)"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+class LLMCache:
+    """
+    Cache disque des extractions LLM validées
+
+    Une entrée par fichier JSON, nommé d'après l'empreinte du prompt, du
+    modèle, de la température et du schéma Pydantic attendu : changer l'un
+    d'eux (y compris un champ de OptimizationProblem) invalide l'entrée.
+    Les entrées expirent après ttl_seconds ; au-delà de max_entries, les
+    moins récemment utilisées (date de modification) sont supprimées.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = ".llm_cache",
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Args:
+            cache_dir: Répertoire du cache
+            ttl_seconds: Durée de validité d'une entrée (None : sans expiration)
+            max_entries: Nombre maximal d'entrées conservées
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(prompt: str, model: str, temperature: float, schema: Type[BaseModel] = OptimizationProblem) -> str:
+        """
+        Clé d'une extraction : empreinte du prompt, du modèle, de la
+        température et du schéma JSON de la sortie structurée
+        """
+        payload = json.dumps({
+            "prompt": prompt,
+            "model": model,
+            "temperature": temperature,
+            "schema": schema.model_json_schema()
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _entries(self):
+        """Fichiers des entrées du cache"""
+        return [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+
+    def get(self, key: str, schema: Type[BaseModel] = OptimizationProblem) -> Optional[BaseModel]:
+        """
+        Réponse validée associée à la clé
+
+        Une entrée expirée ou qui n'est plus conforme au schéma est supprimée.
+
+        Returns:
+            Instance du schéma, ou None si absente
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if self.ttl_seconds is not None and time.time() - entry["created_at"] > self.ttl_seconds:
+                raise KeyError("entrée expirée")
+            result = schema.model_validate(entry["result"])
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (KeyError, ValueError, ValidationError):
+            os.remove(path)
+            self.misses += 1
+            return None
+
+        os.utime(path)  # Dernière utilisation, pour l'éviction LRU
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: BaseModel, prompt: str, model: str, temperature: float):
+        """
+        Enregistre une réponse validée (écriture atomique), puis applique la limite d'entrées
+
+        L'empreinte du prompt est conservée pour que les réponses enregistrées
+        puissent être rejouées hors ligne (voir ReplayChatModel).
+        """
+        entry = {
+            "created_at": time.time(),
+            "model": model,
+            "temperature": temperature,
+            "prompt_hash": prompt_hash(prompt),
+            "result": result.model_dump()
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> int:
+        """Supprime les entrées expirées puis les moins récemment utilisées ; renvoie leur nombre"""
+        entries = self._entries()
+        now = time.time()
+        removed = 0
+        if self.ttl_seconds is not None:
+            # Date de modification >= date de création : ces entrées sont forcément expirées
+            for entry in list(entries):
+                if now - entry.stat().st_mtime > self.ttl_seconds:
+                    os.remove(entry.path)
+                    entries.remove(entry)
+                    removed += 1
+        if len(entries) > self.max_entries:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:len(entries) - self.max_entries]:
+                os.remove(entry.path)
+                removed += 1
+        return removed
+
+    def recordings(self) -> Dict[str, str]:
+        """
+        Réponses enregistrées indexées par empreinte de prompt, sans tenir
+        compte de l'expiration (rejeu hors ligne)
+
+        Returns:
+            Dictionnaire {empreinte du prompt: réponse JSON}
+        """
+        recordings = {}
+        for entry in self._entries():
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            recordings[record["prompt_hash"]] = json.dumps(record["result"], ensure_ascii=False)
+        return recordings
+
+    def clear(self):
+        """Vide le cache"""
+        for entry in self._entries():
+            os.remove(entry.path)
+
+    def print_statistics(self):
+        """Affiche les succès et échecs du cache"""
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0.0
+        print(f"Cache LLM : {self.hits} succès, {self.misses} échecs ({rate:.0f}%), "
+              f"{len(self._entries())} entrées dans {self.cache_dir}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gestion du cache des extractions LLM")
+    parser.add_argument("--cache-dir", default=".llm_cache", help="Répertoire du cache")
+    parser.add_argument("--clear", action="store_true", help="Vider le cache")
+    args = parser.parse_args()
+
+    cache = LLMCache(args.cache_dir, ttl_seconds=None)
+    if args.clear:
+        cache.clear()
+        print(f"Cache {args.cache_dir} vidé")
+    else:
+        for entry in sorted(cache._entries(), key=lambda entry: entry.stat().st_mtime):
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            age_hours = (time.time() - record["created_at"]) / 3600
+            print(f"{entry.name[:12]}  {record['model']} (t={record['temperature']})  "
+                  f"{record['result']['problem_name']}  ({age_hours:.1f}h)")
+        cache.print_statistics()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 class Teacher(BaseModel):
     """Représente un enseignant et ses caractéristiques"""
@@ -7,12 +7,28 @@ class Teacher(BaseModel):
     subject: str = Field(description="Matière enseignée")
     hours_per_week: int = Field(description="Nombre d'heures à enseigner par semaine")
     available_days: List[str] = Field(description="Liste des jours de disponibilité")
+    room: Optional[str] = Field(default=None, description="Salle nécessaire aux cours de l'enseignant (aucune si non précisée)")
+    groups: List[str] = Field(default_factory=list, description="Classes assistant à chacun des cours de l'enseignant")
+    preferred_days: List[str] = Field(default_factory=list, description="Jours souhaités par l'enseignant (préférence, vide si aucune)")
+    preferred_periods: List[str] = Field(default_factory=list, description="Périodes souhaitées ('matin', 'après-midi'), vide si aucune")
+
+class Room(BaseModel):
+    """Représente une salle partagée entre enseignants"""
+    name: str = Field(description="Nom de la salle")
+    capacity: int = Field(default=1, description="Nombre de cours pouvant s'y tenir en même temps")
+
+class Group(BaseModel):
+    """Représente une classe (groupe d'élèves) qui ne peut suivre qu'un cours à la fois"""
+    name: str = Field(description="Nom de la classe")
 
 class Constraint(BaseModel):
     """Représente une contrainte du problème d'optimisation"""
     id: int = Field(description="Identifiant unique de la contrainte")
     description: str = Field(description="Description textuelle de la contrainte")
     type: str = Field(description="Type de contrainte: 'hard' (obligatoire) ou 'soft' (préférence)")
+    kind: Optional[str] = Field(default=None, description="Préférence concernée par une contrainte soft: 'preferred_days' ou 'preferred_periods'")
+    weight: int = Field(default=1, description="Poids d'un créneau hors préférence (contrainte soft)")
+    priority: int = Field(default=1, description="Priorité de la contrainte soft (1 : satisfaite en premier)")
 
 class Variable(BaseModel):
     """Représente une variable de décision"""
@@ -29,6 +45,26 @@ class OptimizationProblem(BaseModel):
     """Structure complète du problème d'optimisation extrait"""
     problem_name: str = Field(description="Nom du problème")
     teachers: List[Teacher] = Field(description="Liste des enseignants")
+    rooms: List[Room] = Field(default_factory=list, description="Salles partagées (vide si l'énoncé n'en mentionne pas)")
+    groups: List[Group] = Field(default_factory=list, description="Classes (vide si l'énoncé n'en mentionne pas)")
+    variables: List[Variable] = Field(description="Variables de décision du problème")
+    constraints: List[Constraint] = Field(description="Liste des contraintes")
+    objective: Objective = Field(description="Fonction objectif")
+
+class TeacherDetails(BaseModel):
+    """Informations sur un enseignant du tableau données ailleurs dans le texte de l'énoncé"""
+    name: str = Field(description="Nom de l'enseignant, tel qu'écrit dans le tableau")
+    room: Optional[str] = Field(default=None, description="Salle nécessaire aux cours de l'enseignant (aucune si non précisée)")
+    groups: List[str] = Field(default_factory=list, description="Classes assistant à chacun des cours de l'enseignant")
+    preferred_days: List[str] = Field(default_factory=list, description="Jours souhaités par l'enseignant (préférence, vide si aucune)")
+    preferred_periods: List[str] = Field(default_factory=list, description="Périodes souhaitées ('matin', 'après-midi'), vide si aucune")
+
+class ProblemStatement(BaseModel):
+    """Partie textuelle du problème, extraite quand le tableau des enseignants est lu sans LLM"""
+    problem_name: str = Field(description="Nom du problème")
+    teacher_details: List[TeacherDetails] = Field(default_factory=list, description="Enseignants dont le texte précise salle, classes ou préférences (vide sinon)")
+    rooms: List[Room] = Field(default_factory=list, description="Salles partagées (vide si l'énoncé n'en mentionne pas)")
+    groups: List[Group] = Field(default_factory=list, description="Classes (vide si l'énoncé n'en mentionne pas)")
     variables: List[Variable] = Field(description="Variables de décision du problème")
     constraints: List[Constraint] = Field(description="Liste des contraintes")
-    objective: Objective = Field(description="Fonction objectif")
\ No newline at end of file
+    objective: Objective = Field(description="Fonction objectif")
@@ -34,6 +34,7 @@ def create_extraction_prompt(problem_description: str) -> str:
        - Liste TOUTES les contraintes mentionnées
        - Distingue les contraintes HARD (obligatoires, doivent être respectées absolument)
        - Distingue les contraintes SOFT (préférences, souhaitables mais pas obligatoires)
+       - Pour une contrainte SOFT, précise si possible sa priorité et son poids
        - Donne un ID unique à chaque contrainte
 
     3. Pour la FONCTION OBJECTIF :
@@ -42,6 +43,9 @@ def create_extraction_prompt(problem_description: str) -> str:
 
     4. Pour les DONNÉES :
        - Extrais les enseignants avec toutes leurs caractéristiques
+       - Si l'énoncé mentionne des salles ou des classes, extrais-les (capacité
+         de chaque salle) et indique pour chaque enseignant sa salle et ses classes
+       - Indique pour chaque enseignant ses jours et périodes préférés s'ils sont mentionnés
        - Structure les données de manière exploitable
 
     **IMPORTANT :**
@@ -85,4 +89,42 @@ def create_extraction_prompt(problem_description: str) -> str:
 
     Génère maintenant la structure complète du problème au format JSON.
     """
-    return prompt
\ No newline at end of file
+    return prompt
+
+def create_statement_prompt(problem_description: str, teacher_names: list) -> str:
+    """
+    Crée le prompt d'extraction quand le tableau des enseignants a été lu sans LLM
+
+    Le tableau est retiré de l'énoncé : seuls le texte (contraintes,
+    objectif...) et les noms des enseignants cités dans ce texte sont envoyés.
+
+    Args:
+        problem_description: Énoncé du problème, sans le tableau des enseignants
+        teacher_names: Enseignants du tableau mentionnés dans le texte
+
+    Returns:
+        Prompt formaté pour le LLM
+    """
+    mentioned = ", ".join(teacher_names) if teacher_names else "aucun"
+    prompt = f"""
+    **CONTEXTE :**
+    Tu es un expert en optimisation et en analyse de problèmes mathématiques.
+    Ton rôle est d'extraire et structurer les informations d'un problème d'optimisation pour permettre sa résolution par un solveur.
+
+    **ÉNONCÉ DU PROBLÈME (le tableau des enseignants a déjà été extrait) :**
+    {problem_description}
+
+    **OBJECTIF :**
+    Extraire la structure du problème : variables de décision, contraintes
+    (hard et soft, avec un ID unique, et pour une contrainte SOFT sa priorité
+    et son poids si possible) et fonction objectif (minimiser ou maximiser).
+
+    **INSTRUCTIONS :**
+    - N'extrais PAS la liste des enseignants : elle est déjà connue
+    - Si l'énoncé mentionne des salles ou des classes, extrais-les (capacité de chaque salle)
+    - Enseignants du tableau cités dans le texte : {mentioned}.
+      Pour ceux-ci seulement, indique la salle, les classes et les jours et
+      périodes préférés que le texte précise
+    - Ne résous PAS le problème, extrais seulement sa structure
+    """
+    return prompt
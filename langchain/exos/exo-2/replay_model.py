@@ -0,0 +1,83 @@
+import time
+import random
+import asyncio
+from typing import Any, Dict, List, Optional, Type
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import BaseModel
+
+from llm_cache import LLMCache, prompt_hash
+
+class ReplayChatModel(BaseChatModel):
+    """
+    Modèle de chat local qui rejoue des réponses enregistrées, sans réseau
+
+    La réponse est choisie d'après l'empreinte du prompt (réponses du cache
+    LLM, voir LLMCache.recordings), ou à défaut la réponse par défaut.
+    with_structured_output valide la réponse JSON avec le schéma Pydantic,
+    comme le ferait le modèle distant. Latence et échecs transitoires
+    (ConnectionError) peuvent être simulés pour tester les appels en lot.
+    """
+
+    responses: Dict[str, str] = {}
+    default_response: Optional[str] = None
+    latency_seconds: float = 0.0
+    failure_rate: float = 0.0
+    model_name: str = "replay"
+
+    @classmethod
+    def from_cache(
+        cls,
+        cache: LLMCache,
+        default_file: Optional[str] = None,
+        latency_seconds: float = 0.0,
+        failure_rate: float = 0.0
+    ) -> 'ReplayChatModel':
+        """
+        Modèle rejouant les réponses du cache
+
+        Args:
+            cache: Cache LLM contenant les réponses enregistrées
+            default_file: Réponse JSON renvoyée pour un prompt inconnu
+                (par exemple un problem_structure.json)
+            latency_seconds: Latence simulée de chaque appel
+            failure_rate: Proportion d'appels en échec transitoire simulé
+        """
+        default_response = None
+        if default_file is not None:
+            with open(default_file, 'r', encoding='utf-8') as f:
+                default_response = f.read()
+        return cls(responses=cache.recordings(), default_response=default_response,
+                   latency_seconds=latency_seconds, failure_rate=failure_rate)
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _response(self, messages: List[BaseMessage]) -> ChatResult:
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise ConnectionError("échec transitoire simulé (mode rejeu)")
+        prompt = "\n".join(str(message.content) for message in messages)
+        content = self.responses.get(prompt_hash(prompt), self.default_response)
+        if content is None:
+            raise KeyError("aucune réponse enregistrée pour ce prompt (mode rejeu)")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None,
+                  **kwargs) -> ChatResult:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self._response(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None,
+                         **kwargs) -> ChatResult:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return self._response(messages)
+
+    def with_structured_output(self, schema: Type[BaseModel], **kwargs) -> Runnable:
+        """Sortie structurée : la réponse JSON est validée par le schéma"""
+        return self | RunnableLambda(lambda message: schema.model_validate_json(message.content))
@@ -0,0 +1,526 @@
+import re
+import csv
+import json
+import time
+import random
+import argparse
+import unicodedata
+from typing import Dict, List, Any, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from models import Teacher, ProblemStatement, OptimizationProblem
+from prompt_template import create_extraction_prompt, create_statement_prompt
+
+try:
+    import tiktoken
+except ImportError:  # Compteur optionnel : repli sur une estimation (4 caractères par jeton)
+    tiktoken = None
+
+DAYS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+# Début du mot (sans accents) -> période
+PERIOD_PREFIXES = {"matin": "matin", "apres": "après-midi"}
+
+# Colonnes reconnues : champ de Teacher -> mots-clés de l'en-tête (sans accents, en minuscules).
+# L'ordre compte : "Jours préférés" doit être reconnu avant "Disponibilités (jours)".
+COLUMN_KEYWORDS = [
+    ("preferred_days", ("jours pref", "jours souhait")),
+    ("preferred_periods", ("periode",)),
+    ("available_days", ("disponib", "jours")),
+    ("hours_per_week", ("heure",)),
+    ("subject", ("matiere",)),
+    ("room", ("salle",)),
+    ("groups", ("classe", "groupe")),
+    ("name", ("enseignant", "professeur", "nom")),
+]
+REQUIRED_COLUMNS = ("name", "subject", "hours_per_week", "available_days")
+
+# Délimiteurs essayés pour un tableau CSV ; une cellule d'en-tête est courte
+# et sans ponctuation de phrase (une phrase à virgules n'est pas un en-tête)
+CSV_DELIMITERS = (";", "\t", ",")
+CSV_HEADER_MAX_WORDS = 4
+CSV_HEADER_MAX_LENGTH = 40
+_SENTENCE_PUNCTUATION = re.compile(r"[.!?:]")
+
+# Hypothèses du modèle de latence LLM (ordre de grandeur pour gpt-4o-mini)
+LLM_OVERHEAD_SECONDS = 0.5
+PROMPT_TOKENS_PER_SECOND = 20000
+OUTPUT_TOKENS_PER_SECOND = 80
+MAX_CONTEXT_TOKENS = 128000
+MAX_OUTPUT_TOKENS = 16384
+
+_MARKDOWN_SEPARATOR = re.compile(r"^:?-{3,}:?$")
+_LIST_SEPARATOR = re.compile(r"[\s,;/+]+")
+_DAY_KEYS = [(day.lower(), day) for day in DAYS]
+
+def _normalize(text: str) -> str:
+    """Texte en minuscules, sans accents ni espaces superflus"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).lower().split())
+
+def normalize_day(day: str) -> Optional[str]:
+    """
+    Nom de jour normalisé ("lun.", "MERCREDI", "Jeu" -> "Lundi", "Mercredi", "Jeudi")
+
+    Returns:
+        Jour de DAYS, ou None si le texte n'est pas un jour
+    """
+    key = _normalize(day).strip(".")
+    if len(key) < 3:
+        return None
+    return next((name for lower, name in _DAY_KEYS if lower.startswith(key)), None)
+
+def parse_days(cell: str) -> Optional[List[str]]:
+    """
+    Jours d'une cellule ("Lundi, Mercredi et Vendredi"), dans l'ordre de la semaine
+
+    Returns:
+        Liste de jours sans doublon, ou None si un mot n'est pas un jour
+    """
+    days = set()
+    for token in _LIST_SEPARATOR.split(cell.strip()):
+        if not token or _normalize(token) == "et":
+            continue
+        day = normalize_day(token)
+        if day is None:
+            return None
+        days.add(day)
+    return [day for day in DAYS if day in days]
+
+def parse_periods(cell: str) -> Optional[List[str]]:
+    """Périodes d'une cellule ("matin", "Après-midi"), ou None si l'une est inconnue"""
+    periods = []
+    for token in re.split(r"[,;/+]+|\bet\b", cell):
+        key = _normalize(token)
+        if not key or key == "-":
+            continue
+        period = next((period for prefix, period in PERIOD_PREFIXES.items() if key.startswith(prefix)), None)
+        if period is None:
+            return None
+        if period not in periods:
+            periods.append(period)
+    return periods
+
+def map_columns(header: List[str]) -> Optional[Dict[int, str]]:
+    """
+    Associe les colonnes d'un en-tête aux champs de Teacher
+
+    Returns:
+        Dictionnaire {index de colonne: champ}, ou None s'il manque une colonne obligatoire
+    """
+    columns = {}
+    for index, label in enumerate(header):
+        key = _normalize(label)
+        for field, keywords in COLUMN_KEYWORDS:
+            if field not in columns.values() and any(keyword in key for keyword in keywords):
+                columns[index] = field
+                break
+    if not all(field in columns.values() for field in REQUIRED_COLUMNS):
+        return None
+    return columns
+
+def parse_row(cells: List[str], columns: Dict[int, str]) -> Optional[Teacher]:
+    """
+    Enseignant décrit par une ligne du tableau
+
+    Returns:
+        Teacher, ou None si une cellule ne peut pas être lue sans ambiguïté
+    """
+    values = {}
+    for index, field in columns.items():
+        cell = cells[index].strip() if index < len(cells) else ""
+        if field in ("name", "subject"):
+            if not cell:
+                return None
+            values[field] = cell
+        elif field == "hours_per_week":
+            match = re.fullmatch(r"(\d+)\s*(h|heures?)?", cell, re.IGNORECASE)
+            if match is None:
+                return None
+            values[field] = int(match.group(1))
+        elif field in ("available_days", "preferred_days"):
+            days = parse_days(cell)
+            if days is None or (field == "available_days" and not days):
+                return None
+            values[field] = days
+        elif field == "preferred_periods":
+            periods = parse_periods(cell)
+            if periods is None:
+                return None
+            values[field] = periods
+        elif field == "room":
+            values[field] = cell if cell and cell != "-" else None
+        elif field == "groups":
+            values[field] = [group.strip() for group in re.split(r"[,;/]+", cell) if group.strip() not in ("", "-")]
+    return Teacher(**values)
+
+def _markdown_cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+def _find_markdown_tables(lines: List[str]) -> List[Tuple[int, int]]:
+    """Blocs (début, fin exclue) de lignes de tableau markdown"""
+    blocks = []
+    start = None
+    for i, line in enumerate(lines + [""]):
+        if line.strip().startswith("|") and line.count("|") >= 2:
+            if start is None:
+                start = i
+        elif start is not None:
+            blocks.append((start, i))
+            start = None
+    return blocks
+
+def _parse_markdown_table(lines: List[str]) -> Optional[List[Teacher]]:
+    columns = map_columns(_markdown_cells(lines[0]))
+    if columns is None:
+        return None
+    rows = lines[1:]
+    if rows and all(_MARKDOWN_SEPARATOR.match(cell.replace(" ", "")) for cell in _markdown_cells(rows[0]) if cell):
+        rows = rows[1:]
+    teachers = []
+    for line in rows:
+        teacher = parse_row(_markdown_cells(line), columns)
+        if teacher is None:
+            return None
+        teachers.append(teacher)
+    return teachers
+
+def _is_csv_header(cells: List[str]) -> bool:
+    """Cellules courtes, sans ponctuation de phrase : en-tête plausible"""
+    return all(
+        len(cell.strip()) <= CSV_HEADER_MAX_LENGTH and len(cell.split()) <= CSV_HEADER_MAX_WORDS
+        and not _SENTENCE_PUNCTUATION.search(cell)
+        for cell in cells
+    )
+
+def _parse_csv_table(lines: List[str], start: int) -> Optional[Tuple[int, Optional[List[Teacher]]]]:
+    """
+    Tableau CSV commençant par un en-tête à la ligne start
+
+    Les lignes suivantes sont lues jusqu'à la première ligne vide ; si la
+    colonne des disponibilités est la dernière, les champs en trop (jours
+    séparés par le délimiteur) lui sont rattachés. La ligne n'est un
+    en-tête que si la suivante a le même nombre de colonnes : une phrase
+    qui cite les colonnes n'est pas un tableau.
+
+    Returns:
+        Tuple (fin du bloc exclue, enseignants ou None si une ligne est
+        illisible), ou None si la ligne n'est pas un en-tête de tableau
+    """
+    for delimiter in CSV_DELIMITERS:
+        if delimiter not in lines[start]:
+            continue
+        header = next(csv.reader([lines[start]], delimiter=delimiter))
+        if not _is_csv_header(header):
+            continue
+        columns = map_columns(header)
+        if columns is None:
+            continue
+        end = start + 1
+        while end < len(lines) and lines[end].strip():
+            end += 1
+        teachers = []
+        last_is_days = columns.get(len(header) - 1) == "available_days"
+        for cells in csv.reader(lines[start + 1:end], delimiter=delimiter):
+            if len(cells) > len(header) and last_is_days:
+                cells = cells[:len(header) - 1] + [", ".join(cells[len(header) - 1:])]
+            elif len(cells) != len(header):
+                if not teachers:
+                    break  # Première ligne d'une autre forme : pas un tableau
+                return end, None
+            teacher = parse_row(cells, columns)
+            if teacher is None:
+                return end, None
+            teachers.append(teacher)
+        if teachers:
+            return end, teachers
+    return None
+
+def split_roster(problem_description: str) -> Optional[Tuple[List[Teacher], str]]:
+    """
+    Lit sans LLM les tableaux d'enseignants (markdown ou CSV) d'un énoncé
+
+    Un tableau est reconnu à son en-tête (Enseignant, Matière, Heures,
+    Disponibilités, et éventuellement Salle, Classes, Jours préférés,
+    Périodes). Chaque tableau est remplacé dans le texte par une ligne
+    indiquant qu'il a été extrait. Si une ligne d'un tableau reconnu ne peut
+    pas être lue sans ambiguïté (jour inconnu, heures non entières...),
+    l'énoncé entier doit passer par le LLM.
+
+    Args:
+        problem_description: Énoncé du problème
+
+    Returns:
+        Tuple (enseignants, énoncé sans les tableaux), ou None si aucun
+        tableau n'est reconnu ou si l'un d'eux est illisible
+    """
+    lines = problem_description.splitlines()
+    tables = []  # (début, fin exclue, enseignants)
+    markdown_blocks = _find_markdown_tables(lines)
+    for start, end in markdown_blocks:
+        teachers = _parse_markdown_table(lines[start:end])
+        if teachers is None and map_columns(_markdown_cells(lines[start])) is not None:
+            return None
+        if teachers:
+            tables.append((start, end, teachers))
+
+    # Tableaux CSV : jamais dans un bloc markdown ni sur la ligne qui le précède
+    i = 0
+    while i < len(lines):
+        if any(start - 1 <= i < end for start, end in markdown_blocks):
+            i += 1
+            continue
+        parsed = _parse_csv_table(lines, i) if lines[i].strip() else None
+        if parsed is not None:
+            end, teachers = parsed
+            if teachers is None:
+                return None
+            tables.append((i, end, teachers))
+            i = end
+        else:
+            i += 1
+
+    if not tables:
+        return None
+    tables.sort()
+    teachers = []
+    remaining = []
+    previous = 0
+    for start, end, table_teachers in tables:
+        remaining.extend(lines[previous:start])
+        remaining.append(f"[Tableau des enseignants ({len(table_teachers)} lignes) : déjà extrait]")
+        teachers.extend(table_teachers)
+        previous = end
+    remaining.extend(lines[previous:])
+    return teachers, "\n".join(remaining)
+
+def mentioned_teachers(teachers: List[Teacher], text: str) -> List[str]:
+    """Noms des enseignants cités dans le texte (hors tableau)"""
+    return [teacher.name for teacher in teachers if teacher.name in text]
+
+def merge_statement(teachers: List[Teacher], statement: ProblemStatement) -> OptimizationProblem:
+    """
+    Problème complet : enseignants du tableau et partie textuelle extraite par le LLM
+
+    Les précisions du texte (salle, classes, préférences) complètent les
+    colonnes absentes du tableau ; celles qui désignent un enseignant
+    inconnu du tableau sont ignorées.
+
+    Args:
+        teachers: Enseignants lus dans le tableau
+        statement: Partie textuelle extraite par le LLM
+
+    Returns:
+        Objet OptimizationProblem
+    """
+    details = {detail.name: detail for detail in statement.teacher_details}
+    merged = []
+    for teacher in teachers:
+        detail = details.get(teacher.name)
+        if detail is not None:
+            updates = {}
+            for field in ("room", "groups", "preferred_days", "preferred_periods"):
+                value = getattr(detail, field)
+                if value and not getattr(teacher, field):
+                    updates[field] = value
+            if "preferred_days" in updates:
+                updates["preferred_days"] = [normalize_day(day) or day for day in updates["preferred_days"]]
+            teacher = teacher.model_copy(update=updates)
+        merged.append(teacher)
+    return OptimizationProblem(teachers=merged, **statement.model_dump(exclude={"teacher_details"}))
+
+def prepare_extraction(
+    problem_description: str,
+    use_table_parser: bool = True
+) -> Tuple[str, Type[BaseModel], Optional[List[Teacher]]]:
+    """
+    Prompt et schéma de la sortie structurée d'un énoncé
+
+    Si le tableau des enseignants est lisible, seul le reste de l'énoncé est
+    envoyé au LLM (schéma ProblemStatement) ; sinon l'énoncé entier l'est
+    (schéma OptimizationProblem).
+
+    Args:
+        problem_description: Énoncé du problème
+        use_table_parser: Lit le tableau des enseignants sans LLM s'il est reconnu
+
+    Returns:
+        Tuple (prompt, schéma, enseignants lus ou None)
+    """
+    roster = split_roster(problem_description) if use_table_parser else None
+    if roster is None:
+        return create_extraction_prompt(problem_description), OptimizationProblem, None
+    teachers, remaining = roster
+    return create_statement_prompt(remaining, mentioned_teachers(teachers, remaining)), ProblemStatement, teachers
+
+def complete_extraction(result: BaseModel, teachers: Optional[List[Teacher]]) -> OptimizationProblem:
+    """Problème complet à partir de la réponse du LLM (voir prepare_extraction)"""
+    return result if teachers is None else merge_statement(teachers, result)
+
+# ----------------------------------------------------------------------
+# Mesure : jetons du prompt et latence de bout en bout
+# ----------------------------------------------------------------------
+
+def count_tokens(text: str) -> int:
+    """Nombre de jetons (tiktoken si installé, sinon estimation à 4 caractères par jeton)"""
+    if tiktoken is not None:
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    return (len(text) + 3) // 4
+
+def generate_roster_text(n_teachers: int, seed: int = 0) -> str:
+    """
+    Énoncé du type de teachers_data.txt avec un tableau de n_teachers enseignants
+
+    Args:
+        n_teachers: Nombre de lignes du tableau
+        seed: Graine du générateur
+
+    Returns:
+        Texte de l'énoncé
+    """
+    rng = random.Random(seed)
+    subjects = ["Mathématiques", "Physique", "Français", "Histoire", "Anglais", "SVT", "Chimie", "Musique"]
+    rows = []
+    for i in range(n_teachers):
+        days = sorted(rng.sample(range(5), rng.randint(2, 4)))
+        rows.append((f"Enseignant {i:05d}", rng.choice(subjects), str(rng.randint(2, 6)),
+                     ", ".join(DAYS[day] for day in days)))
+    header = ("Enseignant", "Matière", "Heures par semaine", "Disponibilités (jours)")
+    widths = [max(len(header[c]), *(len(row[c]) for row in rows)) for c in range(4)]
+    table = [
+        "| " + " | ".join(cell.ljust(width) for cell, width in zip(header, widths)) + " |",
+        "| " + " | ".join("-" * width for width in widths) + " |",
+    ] + ["| " + " | ".join(cell.ljust(width) for cell, width in zip(row, widths)) + " |" for row in rows]
+    return "\n".join([
+        f"L'école \"Le Campus\" doit planifier l'emploi du temps de {n_teachers} enseignants sur une semaine de 5 jours",
+        "(lundi à vendredi). Chaque enseignant a une disponibilité spécifique et chaque matière a un nombre d'heures à répartir.",
+        "",
+        *table,
+        "",
+        "Contraintes :",
+        "- Chaque enseignant ne peut donner qu'une seule matière par jour.",
+        "- Chaque matière doit atteindre le nombre total d'heures assigné.",
+        "- Les créneaux horaires sont divisés en demi-journées (matin / après-midi).",
+        "- Chaque créneau (matin ou après-midi) dure 2 heures",
+    ])
+
+def estimate_llm_seconds(prompt_tokens: int, output_tokens: int) -> float:
+    """Durée estimée d'un appel LLM (voir les hypothèses LLM_*, *_TOKENS_PER_SECOND)"""
+    return LLM_OVERHEAD_SECONDS + prompt_tokens / PROMPT_TOKENS_PER_SECOND + output_tokens / OUTPUT_TOKENS_PER_SECOND
+
+def benchmark(sizes: List[int], statement: ProblemStatement, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Compare l'extraction complète par le LLM et le chemin rapide (tableau lu sans LLM)
+
+    Pour chaque taille, les étapes locales (prompt, lecture du tableau,
+    validation Pydantic de la réponse, fusion) sont chronométrées ; l'appel
+    LLM est estimé d'après ses jetons d'entrée et de sortie (réponse JSON
+    attendue). Un appel qui dépasse la fenêtre de contexte ou la sortie
+    maximale du modèle est signalé : il échouerait ou serait tronqué.
+
+    Args:
+        sizes: Nombres d'enseignants à tester
+        statement: Partie textuelle attendue (réponse du LLM au chemin rapide)
+        seed: Graine du générateur
+
+    Returns:
+        Liste de résultats (une ligne par taille)
+    """
+    results = []
+    for n_teachers in sizes:
+        text = generate_roster_text(n_teachers, seed)
+
+        # Chemin actuel : tout l'énoncé est envoyé, tous les enseignants sont générés
+        start = time.perf_counter()
+        full_prompt = create_extraction_prompt(text)
+        full_local = time.perf_counter() - start
+
+        # Chemin rapide : tableau lu localement, seul le texte est envoyé
+        start = time.perf_counter()
+        teachers, remaining = split_roster(text)
+        fast_prompt = create_statement_prompt(remaining, mentioned_teachers(teachers, remaining))
+        split_seconds = time.perf_counter() - start
+
+        statement_json = statement.model_dump_json()
+        start = time.perf_counter()
+        problem = merge_statement(teachers, ProblemStatement.model_validate_json(statement_json))
+        fast_local = split_seconds + time.perf_counter() - start
+
+        full_json = problem.model_dump_json()
+        start = time.perf_counter()
+        OptimizationProblem.model_validate_json(full_json)
+        full_local += time.perf_counter() - start
+
+        row = {"n_teachers": n_teachers, "parsed_teachers": len(teachers)}
+        for path, prompt, output, local in (("full", full_prompt, full_json, full_local),
+                                            ("fast", fast_prompt, statement_json, fast_local)):
+            prompt_tokens = count_tokens(prompt)
+            output_tokens = count_tokens(output)
+            row.update({
+                f"{path}_prompt_tokens": prompt_tokens,
+                f"{path}_output_tokens": output_tokens,
+                f"{path}_local_seconds": local,
+                f"{path}_seconds": local + estimate_llm_seconds(prompt_tokens, output_tokens),
+                f"{path}_within_limits": prompt_tokens + output_tokens <= MAX_CONTEXT_TOKENS
+                                         and output_tokens <= MAX_OUTPUT_TOKENS
+            })
+        row["prompt_reduction"] = 1 - row["fast_prompt_tokens"] / row["full_prompt_tokens"]
+        row["speedup"] = row["full_seconds"] / row["fast_seconds"]
+        results.append(row)
+    return results
+
+def print_benchmark(results: List[Dict[str, Any]]):
+    """Affiche la comparaison des deux chemins d'extraction"""
+    print("\n" + "="*60)
+    print("LECTURE DU TABLEAU SANS LLM : JETONS ET LATENCE")
+    print("="*60)
+    print(f"Jetons : {'tiktoken (o200k_base)' if tiktoken is not None else 'estimation (4 caractères par jeton)'}")
+    print(f"Modèle de latence : {LLM_OVERHEAD_SECONDS}s + entrée à {PROMPT_TOKENS_PER_SECOND} jetons/s "
+          f"+ sortie à {OUTPUT_TOKENS_PER_SECOND} jetons/s (limites : contexte {MAX_CONTEXT_TOKENS}, "
+          f"sortie {MAX_OUTPUT_TOKENS})")
+    for row in results:
+        print(f"\n{row['n_teachers']} enseignants ({row['parsed_teachers']} lus dans le tableau) :")
+        for path, label in (("full", "LLM seul"), ("fast", "Tableau + LLM")):
+            limits = "" if row[f"{path}_within_limits"] else "  [dépasse les limites du modèle]"
+            print(f"  {label:<14} prompt {row[f'{path}_prompt_tokens']:>8} jetons, "
+                  f"sortie {row[f'{path}_output_tokens']:>8} jetons, "
+                  f"local {row[f'{path}_local_seconds']*1000:>8.1f}ms, "
+                  f"total ~{row[f'{path}_seconds']:.1f}s{limits}")
+        print(f"  Réduction du prompt : {row['prompt_reduction']:.1%}, accélération ~x{row['speedup']:.0f}")
+    print("="*60)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lecture sans LLM du tableau des enseignants d'un énoncé")
+    parser.add_argument("--input", default="teachers_data.txt", help="Fichier de l'énoncé")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Comparer jetons et latence avec l'extraction complète par le LLM")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 500, 5000],
+                        help="Nombres d'enseignants du benchmark")
+    parser.add_argument("--statement-file", default="../../../ortools/problem_structure.json",
+                        help="Réponse attendue du LLM pour la partie textuelle (benchmark)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats du benchmark")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        with open(args.statement_file, 'r', encoding='utf-8') as f:
+            statement = ProblemStatement.model_validate_json(f.read())
+        results = benchmark(args.sizes, statement)
+        print_benchmark(results)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            print(f"\n[OK] Résultats écrits dans {args.output}")
+    else:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            description = f.read()
+        split = split_roster(description)
+        if split is None:
+            print("Aucun tableau d'enseignants lisible : l'énoncé entier passera par le LLM")
+        else:
+            teachers, remaining = split
+            print(f"Enseignants lus dans le tableau ({len(teachers)}) :")
+            for teacher in teachers:
+                print(f"  - {teacher.name} : {teacher.subject}, {teacher.hours_per_week}h/semaine, "
+                      f"{', '.join(teacher.available_days)}")
+            print("\nTexte envoyé au LLM :")
+            print(remaining)
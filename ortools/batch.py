@@ -0,0 +1,237 @@
+import os
+import glob
+import json
+import time
+import argparse
+import contextlib
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from tabulate import tabulate
+from typing import Dict, List, Any, Optional
+
+from main import main, OUTPUT_FILES, ENGINES
+
+# Statuts pour lesquels une solution a été trouvée
+SOLVED_STATUSES = ("OPTIMAL", "FEASIBLE")
+
+def find_problem_files(inputs: List[str]) -> List[str]:
+    """
+    Fichiers de problème désignés par des répertoires, motifs glob ou fichiers
+
+    Un répertoire désigne ses fichiers *.json (non récursif). L'ordre des
+    entrées est conservé, chaque fichier n'apparaissant qu'une fois.
+    """
+    files = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.json"))
+        else:
+            matches = glob.glob(pattern, recursive=True) or ([pattern] if os.path.exists(pattern) else [])
+        if not matches:
+            print(f"[ATTENTION] Aucun fichier pour {pattern}")
+        files.extend(sorted(matches))
+    return list(dict.fromkeys(files))
+
+def output_dirs(problem_files: List[str], output_root: str) -> List[str]:
+    """Répertoire de sortie de chaque fichier : nom du fichier, suffixé en cas de doublon"""
+    dirs, used = [], set()
+    for problem_file in problem_files:
+        name = os.path.splitext(os.path.basename(problem_file))[0]
+        candidate, k = name, 1
+        while candidate in used:
+            k += 1
+            candidate = f"{name}_{k}"
+        used.add(candidate)
+        dirs.append(os.path.join(output_root, candidate))
+    return dirs
+
+def solve_file(problem_file: str, output_dir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Chaîne complète (chargement, modèle, résolution, validation, export) d'un fichier
+
+    Exécuté dans un processus du pool : la sortie de main est écrite dans
+    output_dir/log.txt, et une erreur inattendue est rapportée dans le
+    résumé au lieu d'interrompre le lot.
+
+    Args:
+        problem_file: Fichier du problème
+        output_dir: Répertoire des fichiers générés pour ce problème
+        options: Arguments supplémentaires de main (format, moteur, limites...)
+
+    Returns:
+        Résumé de main, complété du temps total et de l'éventuelle erreur
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    log_file = os.path.join(output_dir, "log.txt")
+    start = time.perf_counter()
+    with open(log_file, 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        try:
+            summary = main(problem_file=problem_file, output_dir=output_dir, **options)
+            summary["error"] = None
+        except Exception as error:
+            traceback.print_exc(file=log)
+            summary = {"problem_file": problem_file, "status": "ERROR", "objective_value": None,
+                       "solve_time_seconds": None, "valid": False, "violations": None, "files": [],
+                       "error": f"{type(error).__name__}: {error}"}
+    summary.update(output_dir=output_dir, log_file=log_file, wall_time=time.perf_counter() - start)
+    return summary
+
+def solve_isolated(problem_file: str, output_dir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    solve_file dans un processus dédié : si ce processus est arrêté, seul
+    ce fichier est rapporté en échec
+
+    Returns:
+        Résumé de solve_file, ou résumé d'échec si le processus s'est arrêté
+    """
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(solve_file, problem_file, output_dir, options).result()
+        except BrokenProcessPool as error:
+            return {"problem_file": problem_file, "status": "ERROR", "objective_value": None,
+                    "solve_time_seconds": None, "valid": False, "violations": None, "files": [],
+                    "error": f"processus arrêté ({type(error).__name__})", "output_dir": output_dir,
+                    "log_file": os.path.join(output_dir, "log.txt"), "wall_time": time.perf_counter() - start}
+
+def run_batch(
+    problem_files: List[str],
+    output_root: str = "batch_output",
+    max_workers: Optional[int] = None,
+    time_limit_seconds: int = 30,
+    **options
+) -> Dict[str, Any]:
+    """
+    Résout un lot de fichiers de problème dans un ProcessPoolExecutor
+
+    Chaque fichier est une tâche du pool ; la recherche CP-SAT de chaque
+    tâche utilise cœurs / processus threads, pour que le débit du lot
+    augmente avec le nombre de cœurs sans surcharger la machine.
+    Si un processus est arrêté brutalement, les fichiers qu'il interrompt
+    sont relancés chacun seul (solve_isolated) : seul le fichier fautif est
+    rapporté en échec.
+
+    Args:
+        problem_files: Fichiers de problème
+        output_root: Répertoire racine des résultats (un sous-répertoire par fichier)
+        max_workers: Nombre de processus (par défaut : nombre de cœurs)
+        time_limit_seconds: Limite de temps de résolution de chaque fichier
+        **options: Arguments supplémentaires de main
+
+    Returns:
+        Rapport {files, elapsed, throughput, solved, valid, failed, results}
+    """
+    max_workers = min(max_workers or os.cpu_count() or 1, max(len(problem_files), 1))
+    options = dict(
+        options,
+        time_limit_seconds=time_limit_seconds,
+        search_workers=max(1, (os.cpu_count() or 1) // max_workers),
+        max_pages=1,
+        use_cache=False  # Cache partagé entre processus : non utilisé en lot
+    )
+
+    start = time.perf_counter()
+    dirs = output_dirs(problem_files, output_root)
+    results = [None] * len(problem_files)
+    broken = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(solve_file, problem_file, output_dir, options): i
+            for i, (problem_file, output_dir) in enumerate(zip(problem_files, dirs))
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except BrokenProcessPool:
+                # Un processus a été arrêté (mémoire, arrêt natif de CP-SAT) : tous
+                # les fichiers encore dans le pool échouent, ils sont relancés seuls
+                broken.append(i)
+                continue
+            print(f"  [{done}/{len(problem_files)}] {problem_files[i]} : {results[i]['status']} "
+                  f"({results[i]['wall_time']:.2f}s)")
+
+    if broken:
+        print(f"\n[ATTENTION] Processus arrêté : {len(broken)} fichier(s) relancé(s) chacun dans un processus isolé")
+    for i in sorted(broken):
+        results[i] = solve_isolated(problem_files[i], dirs[i], options)
+        print(f"  {problem_files[i]} : {results[i]['status']} ({results[i]['wall_time']:.2f}s)")
+    elapsed = time.perf_counter() - start
+
+    return {
+        "files": len(problem_files),
+        "workers": max_workers,
+        "elapsed": elapsed,
+        "throughput": len(problem_files) / elapsed if elapsed > 0 else 0.0,
+        "cpu_time": sum(result["wall_time"] for result in results),
+        "solved": sum(1 for result in results if result["status"] in SOLVED_STATUSES),
+        "valid": sum(1 for result in results if result["valid"]),
+        "failed": sum(1 for result in results if not result["valid"]),
+        "results": results
+    }
+
+def write_report(report: Dict[str, Any], output_root: str) -> str:
+    """Écrit le rapport agrégé (batch_report.json) et renvoie son chemin"""
+    os.makedirs(output_root, exist_ok=True)
+    report_file = os.path.join(output_root, "batch_report.json")
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report_file
+
+def print_report(report: Dict[str, Any]):
+    """Affiche une ligne par fichier puis les totaux du lot"""
+    rows = [
+        {
+            "fichier": result["problem_file"],
+            "statut": result["status"],
+            "objectif": result["objective_value"],
+            "résolution (s)": round(result["solve_time_seconds"], 3) if result["solve_time_seconds"] is not None else None,
+            "total (s)": round(result["wall_time"], 3),
+            "valide": "oui" if result["valid"] else "non",
+            "erreur": result["error"] or ""
+        }
+        for result in report["results"]
+    ]
+    print("\n" + "="*80)
+    print("RAPPORT DU LOT")
+    print("="*80)
+    print(tabulate(rows, headers="keys", tablefmt="github"))
+    print(f"\n{report['files']} fichiers, {report['solved']} résolus, {report['valid']} valides, "
+          f"{report['failed']} en échec")
+    print(f"Durée : {report['elapsed']:.2f}s avec {report['workers']} processus, "
+          f"{report['throughput']:.2f} fichiers/s (temps cumulé des fichiers : {report['cpu_time']:.2f}s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Résout un lot de fichiers de problème en parallèle")
+    parser.add_argument("inputs", nargs="+", help="Répertoires, motifs glob ou fichiers de problème")
+    parser.add_argument("--output-dir", default="batch_output",
+                        help="Répertoire des résultats (un sous-répertoire par fichier)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--time-limit", type=int, default=30,
+                        help="Limite de temps (s) de résolution de chaque fichier")
+    parser.add_argument("--format", choices=list(OUTPUT_FILES), default="json",
+                        help="Format des fichiers de solution")
+    parser.add_argument("--engine", choices=ENGINES, default="auto",
+                        help="Moteur de modélisation (voir main.py)")
+    parser.add_argument("--no-fast-path", action="store_true",
+                        help="Toujours utiliser CP-SAT, même si la résolution directe est possible")
+    args = parser.parse_args()
+
+    problem_files = find_problem_files(args.inputs)
+    if not problem_files:
+        parser.error("aucun fichier de problème")
+
+    print(f"{len(problem_files)} fichiers de problème, résultats dans {args.output_dir}/")
+    report = run_batch(
+        problem_files,
+        output_root=args.output_dir,
+        max_workers=args.workers,
+        time_limit_seconds=args.time_limit,
+        output_format=args.format,
+        engine=args.engine,
+        fast_path=not args.no_fast_path
+    )
+    print_report(report)
+    print(f"\n[OK] Rapport écrit dans {write_report(report, args.output_dir)}")
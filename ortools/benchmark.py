@@ -0,0 +1,602 @@
+import io
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import resource
+import subprocess
+import contextlib
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import ortools
+from ortools.sat.python import cp_model
+from tabulate import tabulate
+from typing import Dict, List, Any, Optional
+
+from model import SchedulingModel
+from solver import SchedulingSolver
+from fast_scheduler import FastScheduler
+from generate_problem import generate_problem, HOUR_DISTRIBUTIONS
+from load_problem import load_problem_data, DAYS, PERIODS
+from visualize import validate_solution, export_to_csv
+
+# Phases du pipeline de main.py, chronométrées séparément par benchmark_pipeline
+PIPELINE_PHASES = ("load", "model", "solve", "extract", "validate", "export")
+
+def build_model(data: Dict[str, Any], **options) -> tuple:
+    """
+    Construit un SchedulingModel sans afficher les traces de construction
+
+    Returns:
+        Tuple (modèle, temps de construction en secondes)
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduling_model = SchedulingModel(data=data, **options)
+    return scheduling_model, time.perf_counter() - start
+
+def benchmark_build(sizes: List[int], seed: int = 0, check: bool = True) -> List[Dict[str, Any]]:
+    """
+    Mesure le temps de construction classique et bulk pour plusieurs tailles
+
+    Args:
+        sizes: Nombres d'enseignants à tester
+        seed: Graine du générateur
+        check: Vérifie que les deux modes produisent le même proto
+
+    Returns:
+        Liste de résultats (une ligne par taille)
+    """
+    results = []
+    for n_teachers in sizes:
+        data = generate_problem(n_teachers, seed)
+
+        classic, classic_time = build_model(data)
+        bulk, bulk_time = build_model(data, bulk=True)
+
+        row = {
+            "teachers": n_teachers,
+            "variables": len(classic.model.Proto().variables),
+            "constraints": len(classic.model.Proto().constraints),
+            "classic_s": round(classic_time, 3),
+            "bulk_s": round(bulk_time, 3),
+            "speedup": round(classic_time / bulk_time, 2) if bulk_time > 0 else None
+        }
+        if check:
+            row["identical"] = classic.model.Proto() == bulk.model.Proto()
+        results.append(row)
+
+    return results
+
+def solve_quietly(scheduling_model: SchedulingModel, time_limit_seconds: int = 30) -> tuple:
+    """
+    Résout un modèle sans afficher les traces
+
+    Returns:
+        Tuple (solution ou None, temps de résolution en secondes)
+    """
+    solver = SchedulingSolver(scheduling_model)
+    solver.solver.parameters.num_workers = 1  # Recherche déterministe
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        solution = solver.extract_solution() if solver.solve(time_limit_seconds) else None
+    return solution, time.perf_counter() - start
+
+def benchmark_sparse(sizes: List[int], seed: int = 0, solve: bool = True) -> List[Dict[str, Any]]:
+    """
+    Compare la taille du modèle dense et du modèle creux (sparse)
+
+    Args:
+        sizes: Nombres d'enseignants à tester
+        seed: Graine du générateur
+        solve: Résout les deux modèles et compare les solutions
+
+    Returns:
+        Liste de résultats (une ligne par taille)
+    """
+    results = []
+    for n_teachers in sizes:
+        data = generate_problem(n_teachers, seed)
+
+        dense, dense_time = build_model(data, bulk=True)
+        sparse, sparse_time = build_model(data, bulk=True, sparse=True)
+
+        unavailable = sum(
+            len(dense.days) - len(set(dense._available_day_indices(teacher)))
+            for teacher in dense.teachers
+        ) / (len(dense.teachers) * len(dense.days))
+
+        row = {
+            "teachers": n_teachers,
+            "unavailable_ratio": round(unavailable, 3),
+            "dense_vars": len(dense.model.Proto().variables),
+            "sparse_vars": len(sparse.model.Proto().variables),
+            "dense_constraints": len(dense.model.Proto().constraints),
+            "sparse_constraints": len(sparse.model.Proto().constraints),
+            "dense_build_s": round(dense_time, 3),
+            "sparse_build_s": round(sparse_time, 3)
+        }
+
+        if solve:
+            dense_solution, dense_solve = solve_quietly(dense)
+            sparse_solution, sparse_solve = solve_quietly(sparse)
+            row["dense_solve_s"] = round(dense_solve, 3)
+            row["sparse_solve_s"] = round(sparse_solve, 3)
+            row["same_objective"] = (
+                dense_solution is not None and sparse_solution is not None
+                and dense_solution["objective_value"] == sparse_solution["objective_value"]
+            )
+            row["same_schedule"] = (
+                row["same_objective"]
+                and dense_solution["teachers"] == sparse_solution["teachers"]
+            )
+
+        results.append(row)
+
+    return results
+
+def presolve_time(scheduling_model: SchedulingModel) -> float:
+    """Temps (en secondes) passé par CP-SAT dans le presolve seul"""
+    solver = cp_model.CpSolver()
+    solver.parameters.stop_after_presolve = True
+    solver.Solve(scheduling_model.model)
+    return solver.WallTime()
+
+def benchmark_encoding(
+    sizes: List[int],
+    seed: int = 0,
+    encodings: List[str] = SchedulingModel.DAY_ENCODINGS,
+    time_limit_seconds: int = 30
+) -> List[Dict[str, Any]]:
+    """
+    Compare les encodages de la contrainte "une période maximum par jour"
+
+    Mesure la taille du modèle, le temps de construction, de presolve et de
+    résolution pour chaque encodage.
+
+    Args:
+        sizes: Nombres d'enseignants à tester
+        seed: Graine du générateur
+        encodings: Encodages à comparer (voir SchedulingModel.DAY_ENCODINGS)
+        time_limit_seconds: Limite de temps de chaque résolution
+
+    Returns:
+        Liste de résultats (une ligne par taille et par encodage)
+    """
+    results = []
+    for n_teachers in sizes:
+        data = generate_problem(n_teachers, seed)
+
+        for encoding in encodings:
+            scheduling_model, build_time = build_model(data, bulk=True, day_encoding=encoding)
+            proto = scheduling_model.model.Proto()
+            solution, solve_time = solve_quietly(scheduling_model, time_limit_seconds)
+
+            results.append({
+                "teachers": n_teachers,
+                "encoding": encoding,
+                "aux_vars": len(proto.variables) - len(scheduling_model.slots),
+                "constraints": len(proto.constraints),
+                "build_s": round(build_time, 3),
+                "presolve_s": round(presolve_time(scheduling_model), 3),
+                "solve_s": round(solve_time, 3),
+                "status": solution["status"] if solution else "NO_SOLUTION"
+            })
+
+    return results
+
+def benchmark_resources(
+    sizes: List[int],
+    seed: int = 0,
+    teachers_per_group: List[Optional[int]] = (None, 4, 3, 2),
+    time_limit_seconds: int = 30,
+    solve: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Taille du modèle en fonction du nombre de salles et de classes
+
+    Pour chaque taille, une classe pour k enseignants et une salle pour 2k.
+    Les contraintes par enseignant doivent rester bornées : une contrainte
+    par (ressource, créneau), sans contrainte par couple d'enseignants. La
+    colonne pairwise donne, pour comparaison, le nombre de contraintes d'un
+    encodage par couples en conflit. Les instances les plus chargées peuvent
+    être infaisables (status NO_SOLUTION) : seule la taille du modèle compte ici.
+
+    Args:
+        sizes: Nombres d'enseignants à tester
+        seed: Graine du générateur
+        teachers_per_group: Valeurs de k (None : aucune ressource)
+        time_limit_seconds: Limite de temps de chaque résolution
+        solve: Résout aussi chaque modèle
+
+    Returns:
+        Liste de résultats (une ligne par taille et par valeur de k)
+    """
+    slots = len(DAYS) * len(PERIODS)
+    results = []
+    for n_teachers in sizes:
+        for k in teachers_per_group:
+            n_groups = n_teachers // k if k else 0
+            data = generate_problem(n_teachers, seed, n_rooms=n_groups // 2, n_groups=n_groups)
+            scheduling_model, build_time = build_model(data, bulk=True, day_encoding="period_choice")
+            proto = scheduling_model.model.Proto()
+
+            shared = list(scheduling_model.group_teachers.values()) + list(scheduling_model.room_teachers.values())
+            row = {
+                "teachers": n_teachers,
+                "rooms": len(scheduling_model.room_teachers),
+                "groups": n_groups,
+                "variables": len(proto.variables),
+                "constraints": len(proto.constraints),
+                "per_teacher": round(len(proto.constraints) / n_teachers, 2),
+                "pairwise": sum(len(teachers) * (len(teachers) - 1) // 2 for teachers in shared) * slots,
+                "build_s": round(build_time, 3)
+            }
+            if solve:
+                solution, solve_time = solve_quietly(scheduling_model, time_limit_seconds)
+                row["solve_s"] = round(solve_time, 3)
+                row["status"] = solution["status"] if solution else "NO_SOLUTION"
+            results.append(row)
+
+    return results
+
+def benchmark_decomposition(
+    sizes: List[int],
+    seed: int = 0,
+    workers: List[int] = (1, 2, 4),
+    day_encoding: str = "period_choice",
+    time_limit_seconds: int = 60
+) -> List[Dict[str, Any]]:
+    """
+    Compare la résolution monolithique et la résolution décomposée en parallèle
+
+    Le temps mesuré inclut la construction du (des) modèle(s) et la résolution.
+
+    Args:
+        sizes: Nombres d'enseignants à tester
+        seed: Graine du générateur
+        workers: Nombres de processus à tester pour la résolution décomposée
+        day_encoding: Encodage de la contrainte "une période par jour"
+        time_limit_seconds: Limite de temps de chaque résolution
+
+    Returns:
+        Liste de résultats (une ligne par taille et par configuration)
+    """
+    results = []
+    for n_teachers in sizes:
+        data = generate_problem(n_teachers, seed)
+
+        start = time.perf_counter()
+        scheduling_model, _ = build_model(data, bulk=True, day_encoding=day_encoding)
+        solution, _ = solve_quietly(scheduling_model, time_limit_seconds)
+        results.append({
+            "teachers": n_teachers,
+            "mode": "monolithique",
+            "workers": 1,
+            "total_s": round(time.perf_counter() - start, 3),
+            "status": solution["status"] if solution else "NO_SOLUTION",
+            "objective": solution["objective_value"] if solution else None
+        })
+
+        for max_workers in workers:
+            start = time.perf_counter()
+            lightweight, _ = build_model(data, bulk=True, day_encoding=day_encoding, build=False)
+            solver = SchedulingSolver(lightweight)
+            with contextlib.redirect_stdout(io.StringIO()):
+                found = solver.solve_decomposed(time_limit_seconds, max_workers=max_workers)
+            results.append({
+                "teachers": n_teachers,
+                "mode": "décomposé",
+                "workers": max_workers,
+                "total_s": round(time.perf_counter() - start, 3),
+                "status": solver.status_name(),
+                "objective": solver.objective_value() if found else None
+            })
+
+    return results
+
+def benchmark_fast_path(sizes: List[int], seed: int = 0, cp_sat: bool = True) -> List[Dict[str, Any]]:
+    """
+    Compare la résolution directe (FastScheduler) et CP-SAT
+
+    Args:
+        sizes: Nombres d'enseignants à tester
+        seed: Graine du générateur
+        cp_sat: Résout aussi avec CP-SAT (construction bulk, encodage period_choice)
+
+    Returns:
+        Liste de résultats (une ligne par taille)
+    """
+    results = []
+    for n_teachers in sizes:
+        data = generate_problem(n_teachers, seed)
+
+        start = time.perf_counter()
+        fast = FastScheduler(data)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fast.solve()
+            fast_solution = fast.extract_solution()
+        row = {
+            "teachers": n_teachers,
+            "fast_s": round(time.perf_counter() - start, 4),
+            "fast_objective": fast.objective_value()
+        }
+
+        if cp_sat:
+            start = time.perf_counter()
+            scheduling_model, _ = build_model(data, bulk=True, day_encoding="period_choice")
+            solution, _ = solve_quietly(scheduling_model)
+            row["cp_sat_s"] = round(time.perf_counter() - start, 3)
+            row["cp_sat_objective"] = solution["objective_value"] if solution else None
+            row["speedup"] = round(row["cp_sat_s"] / max(row["fast_s"], 1e-6), 1)
+
+        results.append(row)
+
+    return results
+
+def _run_pipeline(
+    n_teachers: int,
+    seed: int,
+    generator_options: Dict[str, Any],
+    model_options: Dict[str, Any],
+    engine: str,
+    time_limit_seconds: float,
+    trace_memory: bool
+) -> Dict[str, Any]:
+    """
+    Exécute le pipeline complet sur un problème généré, phase par phase
+
+    Lancé dans un processus neuf par taille : le pic mémoire du processus
+    (ru_maxrss) ne mesure alors que cette taille.
+
+    Returns:
+        Ligne de résultats (temps et mémoire par phase, statistiques CP-SAT)
+    """
+    row = {"teachers": n_teachers, "engine": engine}
+    workdir = tempfile.mkdtemp(prefix="benchmark_")
+    problem_file = os.path.join(workdir, "problem.json")
+    with open(problem_file, 'w', encoding='utf-8') as f:
+        json.dump(generate_problem(n_teachers, seed, **generator_options), f, ensure_ascii=False)
+
+    state = {}
+
+    def phase_load():
+        state["data"] = load_problem_data(problem_file)
+
+    def phase_model():
+        if engine == "fast":
+            state["solver"] = FastScheduler(state["data"])
+        else:
+            state["solver"] = SchedulingSolver(SchedulingModel(data=state["data"], **model_options))
+            state["solver"].solver.parameters.num_workers = 1  # Recherche déterministe
+
+    def phase_solve():
+        if engine == "fast":
+            state["found"] = state["solver"].solve()
+        else:
+            state["found"] = state["solver"].solve(time_limit_seconds)
+
+    def phase_extract():
+        state["solution"] = state["solver"].extract_solution()
+
+    def phase_validate():
+        state["valid"] = validate_solution(state["solution"])
+
+    def phase_export():
+        export_to_csv(state["solution"], os.path.join(workdir, "planning.csv"))
+
+    phases = dict(zip(PIPELINE_PHASES, (
+        phase_load, phase_model, phase_solve, phase_extract, phase_validate, phase_export
+    )))
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for name, phase in phases.items():
+                if name == "extract" and not state.get("found"):
+                    break  # Infaisable ou pas de solution : rien à extraire
+                if trace_memory:
+                    tracemalloc.reset_peak()
+                start = time.perf_counter()
+                phase()
+                row[f"{name}_s"] = round(time.perf_counter() - start, 4)
+                if trace_memory:
+                    row[f"{name}_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+        os.rmdir(workdir)
+
+    solver = state["solver"]
+    row["status"] = solver.status_name()
+    row["objective"] = solver.objective_value() if state.get("found") else None
+    row["valid"] = state.get("valid")
+    if engine == "cp-sat":
+        row["cp_sat_wall_s"] = round(solver.solver.WallTime(), 4)
+        row["branches"] = solver.solver.NumBranches()
+        row["conflicts"] = solver.solver.NumConflicts()
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    row["max_rss_mb"] = round(maxrss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+    return row
+
+def benchmark_pipeline(
+    sizes: List[int],
+    seed: int = 0,
+    generator_options: Optional[Dict[str, Any]] = None,
+    model_options: Optional[Dict[str, Any]] = None,
+    engine: str = "cp-sat",
+    time_limit_seconds: float = 60,
+    trace_memory: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Chronomètre chaque phase du pipeline (chargement, modèle, résolution,
+    extraction, validation, export) pour plusieurs tailles
+
+    Args:
+        sizes: Nombres d'enseignants à tester
+        seed: Graine du générateur
+        generator_options: Options de generate_problem (densité, heures, infaisabilité)
+        model_options: Options de SchedulingModel (moteur cp-sat)
+        engine: "cp-sat" (SchedulingModel + SchedulingSolver) ou "fast" (FastScheduler)
+        time_limit_seconds: Limite de temps de la résolution CP-SAT
+        trace_memory: Mesure aussi le pic d'allocations Python de chaque
+            phase (tracemalloc, ralentit nettement les phases Python)
+
+    Returns:
+        Liste de résultats (une ligne par taille)
+    """
+    results = []
+    for n_teachers in sizes:
+        # Un processus neuf par taille pour isoler le pic mémoire
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results.append(executor.submit(
+                _run_pipeline, n_teachers, seed, generator_options or {},
+                model_options or {}, engine, time_limit_seconds, trace_memory
+            ).result())
+    return results
+
+def environment_info() -> Dict[str, Any]:
+    """Versions et machine, enregistrées avec les résultats pour les comparer"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "ortools": ortools.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+def save_results(results: List[Dict[str, Any]], output_file: str, parameters: Dict[str, Any]):
+    """
+    Écrit les résultats d'un benchmark dans un fichier JSON
+
+    Args:
+        results: Lignes de résultats
+        output_file: Fichier de sortie
+        parameters: Paramètres du benchmark (tailles, graine, options...)
+    """
+    report = {"environment": environment_info(), "parameters": parameters, "results": results}
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[OK] Résultats enregistrés dans {output_file}")
+
+def compare_results(
+    baseline_file: str,
+    results: List[Dict[str, Any]],
+    threshold: float = 1.2
+) -> List[Dict[str, Any]]:
+    """
+    Compare des résultats à une exécution de référence
+
+    Les lignes sont appariées par (teachers, engine) ; chaque mesure en
+    secondes ou en Mo est comparée sous forme de ratio nouveau / référence.
+
+    Args:
+        baseline_file: Fichier JSON écrit par save_results
+        results: Nouveaux résultats
+        threshold: Ratio au-delà duquel une mesure est signalée comme régression
+
+    Returns:
+        Une ligne par mesure comparable
+    """
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    reference = {(row["teachers"], row.get("engine")): row for row in baseline["results"]}
+
+    comparison = []
+    for row in results:
+        base = reference.get((row["teachers"], row.get("engine")))
+        if base is None:
+            continue
+        for metric, value in row.items():
+            if not metric.endswith(("_s", "_mb")) or not isinstance(base.get(metric), (int, float)):
+                continue
+            ratio = value / base[metric] if base[metric] else None
+            comparison.append({
+                "teachers": row["teachers"],
+                "metric": metric,
+                "baseline": base[metric],
+                "current": value,
+                "ratio": round(ratio, 2) if ratio is not None else None,
+                "regression": ratio is not None and ratio > threshold
+            })
+    return comparison
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de construction du modèle")
+    parser.add_argument("benchmark", nargs="?", default="build", choices=["build", "sparse", "encoding", "resources", "decomposition", "fast", "pipeline"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-check", action="store_true", help="Ne pas comparer les protos / solutions")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="Nombres de processus testés (benchmark decomposition)")
+    parser.add_argument("--engine", choices=["cp-sat", "fast"], default="cp-sat",
+                        help="Moteur du benchmark pipeline")
+    parser.add_argument("--encoding", choices=SchedulingModel.DAY_ENCODINGS, default="reified",
+                        help="Encodage une-période-par-jour (benchmark pipeline)")
+    parser.add_argument("--bulk", action="store_true", help="Construction bulk (benchmark pipeline)")
+    parser.add_argument("--sparse", action="store_true", help="Modèle creux (benchmark pipeline)")
+    parser.add_argument("--density", type=float, default=None,
+                        help="Probabilité qu'un jour soit disponible (générateur)")
+    parser.add_argument("--hours", choices=HOUR_DISTRIBUTIONS, default="uniform", help="Répartition des heures requises (générateur)")
+    parser.add_argument("--infeasible-rate", type=float, default=0.0,
+                        help="Proportion d'enseignants infaisables (générateur)")
+    parser.add_argument("--time-limit", type=float, default=60, help="Limite de temps CP-SAT (s)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Pic mémoire Python par phase (tracemalloc, plus lent)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats")
+    parser.add_argument("--compare", default=None, metavar="REFERENCE",
+                        help="Comparer à un fichier de résultats précédent")
+    args = parser.parse_args()
+
+    if args.benchmark == "pipeline":
+        generator_options = {
+            "availability_density": args.density,
+            "hours_distribution": args.hours,
+            "infeasible_rate": args.infeasible_rate
+        }
+        model_options = {"bulk": args.bulk, "sparse": args.sparse, "day_encoding": args.encoding}
+        rows = benchmark_pipeline(
+            args.sizes, args.seed, generator_options, model_options,
+            engine=args.engine, time_limit_seconds=args.time_limit, trace_memory=args.trace_memory
+        )
+    elif args.benchmark == "fast":
+        rows = benchmark_fast_path(args.sizes, args.seed, cp_sat=not args.no_check)
+    elif args.benchmark == "decomposition":
+        rows = benchmark_decomposition(args.sizes, args.seed, args.workers)
+    elif args.benchmark == "resources":
+        rows = benchmark_resources(args.sizes, args.seed, time_limit_seconds=args.time_limit,
+                                   solve=not args.no_check)
+    elif args.benchmark == "encoding":
+        rows = benchmark_encoding(args.sizes, args.seed)
+    elif args.benchmark == "sparse":
+        rows = benchmark_sparse(args.sizes, args.seed, solve=not args.no_check)
+    else:
+        rows = benchmark_build(args.sizes, args.seed, check=not args.no_check)
+    print(tabulate(rows, headers="keys", tablefmt="github"))
+
+    if args.output:
+        parameters = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+        save_results(rows, args.output, parameters)
+    if args.compare:
+        comparison = compare_results(args.compare, rows)
+        print(tabulate(comparison, headers="keys", tablefmt="github"))
+        regressions = [row for row in comparison if row["regression"]]
+        if regressions:
+            print(f"\n[ATTENTION] {len(regressions)} mesure(s) en régression")
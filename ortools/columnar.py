@@ -0,0 +1,198 @@
+import numpy as np
+from collections import abc
+from typing import Dict, List, Any, Optional, Sequence
+
+from load_problem import DAYS, PERIODS
+
+# Au-delà de ce nombre d'enseignants, le résumé par enseignant n'est plus affiché
+VERBOSE_TEACHERS = 20
+
+class ColumnarSolution:
+    """
+    Solution du problème de planification stockée en colonnes
+
+    Les heures assignées sont un tableau NumPy hours[enseignant, jour, période] ;
+    noms, matières et heures requises sont des colonnes alignées sur le
+    premier axe. Le dictionnaire habituel (format de solution.json) n'est
+    construit qu'à la demande, par to_dict().
+    """
+
+    def __init__(
+        self,
+        problem_name: str,
+        status: str,
+        objective_value: float,
+        solve_time_seconds: float,
+        teachers: Sequence[str],
+        subjects: Sequence[str],
+        hours_required: np.ndarray,
+        hours: np.ndarray,
+        days: Sequence[str],
+        periods: Sequence[str]
+    ):
+        """
+        Args:
+            problem_name: Nom du problème
+            status: Statut de la résolution
+            objective_value: Valeur de l'objectif
+            solve_time_seconds: Temps de résolution
+            teachers: Noms des enseignants (axe 0)
+            subjects: Matière de chaque enseignant
+            hours_required: Heures requises de chaque enseignant
+            hours: Heures assignées, tableau (enseignants, jours, périodes),
+                éventuellement mappé en mémoire (voir solution_io)
+            days: Noms des jours (axe 1)
+            periods: Noms des périodes (axe 2)
+        """
+        self.problem_name = problem_name
+        self.status = status
+        self.objective_value = objective_value
+        self.solve_time_seconds = solve_time_seconds
+        # Les séquences (listes, tables de chaînes mappées en mémoire) sont
+        # conservées telles quelles, les tableaux gardent leur type entier
+        self.teachers = teachers if isinstance(teachers, abc.Sequence) else list(teachers)
+        self.subjects = subjects if isinstance(subjects, abc.Sequence) else list(subjects)
+        self.hours_required = np.asarray(hours_required)
+        self.hours = np.asarray(hours)
+        self.days = list(days)
+        self.periods = list(periods)
+
+    def __len__(self) -> int:
+        return len(self.teachers)
+
+    @property
+    def total_hours(self) -> np.ndarray:
+        """Heures assignées à chaque enseignant"""
+        return self.hours.sum(axis=(1, 2))
+
+    @property
+    def slot_counts(self) -> np.ndarray:
+        """Nombre de créneaux non vides de chaque enseignant"""
+        return (self.hours > 0).sum(axis=(1, 2))
+
+    @classmethod
+    def from_values(
+        cls,
+        values: np.ndarray,
+        slot_indices: np.ndarray,
+        problem_name: str,
+        status: str,
+        objective_value: float,
+        solve_time_seconds: float,
+        teachers: Sequence[str],
+        subjects: Sequence[str],
+        hours_required: Sequence[int],
+        days: Sequence[str],
+        periods: Sequence[str]
+    ) -> 'ColumnarSolution':
+        """
+        Construit la solution à partir des valeurs de toutes les variables CP-SAT
+
+        Args:
+            values: Valeur de chaque variable du modèle, par indice du proto
+                (CpSolverResponse.solution)
+            slot_indices: Indice de variable de chaque créneau, tableau
+                (enseignants, jours, périodes), -1 si le créneau n'a pas de variable
+            (autres arguments : voir __init__)
+        """
+        values = np.asarray(values, dtype=np.int64)
+        present = slot_indices >= 0
+        hours = np.zeros(slot_indices.shape, dtype=np.int64)
+        hours[present] = values[slot_indices[present]]
+        return cls(problem_name, status, objective_value, solve_time_seconds,
+                   teachers, subjects, hours_required, hours, days, periods)
+
+    @classmethod
+    def from_dict(cls, solution: Dict[str, Any], days: Sequence[str], periods: Sequence[str]) -> 'ColumnarSolution':
+        """Construit la forme en colonnes d'une solution au format de solution.json"""
+        day_index = {day: j for j, day in enumerate(days)}
+        period_index = {period: k for k, period in enumerate(periods)}
+        teachers = solution['teachers']
+
+        # Heures fractionnaires possibles avec un calendrier fin (moteur à intervalles)
+        fractional = any(isinstance(slot['hours'], float) for teacher in teachers for slot in teacher['time_slots'])
+        hours = np.zeros((len(teachers), len(days), len(periods)), dtype=np.float64 if fractional else np.int64)
+        for i, teacher in enumerate(teachers):
+            for slot in teacher['time_slots']:
+                hours[i, day_index[slot['day']], period_index[slot['period']]] = slot['hours']
+
+        return cls(
+            solution.get('problem_name'),
+            solution.get('status'),
+            solution.get('objective_value'),
+            solution.get('solve_time_seconds'),
+            [teacher['name'] for teacher in teachers],
+            [teacher['subject'] for teacher in teachers],
+            [teacher['hours_required'] for teacher in teachers],
+            hours, days, periods
+        )
+
+    def iter_teachers(self, chunk_size: int = 10000):
+        """
+        Génère le dictionnaire de chaque enseignant (format de solution.json)
+
+        Les enseignants sont traités par blocs de chunk_size : seuls les
+        créneaux non nuls du bloc sont parcourus (np.nonzero), et la mémoire
+        utilisée ne dépend pas de la taille totale (tableau mappé en mémoire).
+        """
+        for start in range(0, len(self.teachers), chunk_size):
+            block = self.hours[start:start + chunk_size]
+            time_slots: List[List[Dict[str, Any]]] = [[] for _ in range(len(block))]
+            teacher_idx, day_idx, period_idx = np.nonzero(block)
+            values = block[teacher_idx, day_idx, period_idx].tolist()
+            for i, j, k, hours in zip(teacher_idx.tolist(), day_idx.tolist(), period_idx.tolist(), values):
+                time_slots[i].append({"day": self.days[j], "period": self.periods[k], "hours": hours})
+
+            hours_required = self.hours_required[start:start + chunk_size].tolist()
+            total_hours = block.sum(axis=(1, 2)).tolist()
+            for i in range(len(block)):
+                yield {
+                    "name": self.teachers[start + i],
+                    "subject": self.subjects[start + i],
+                    "hours_required": hours_required[i],
+                    "time_slots": time_slots[i],
+                    "total_hours_assigned": total_hours[i]
+                }
+
+    def header(self) -> Dict[str, Any]:
+        """Champs de la solution autres que la liste des enseignants"""
+        return {
+            "problem_name": self.problem_name,
+            "status": self.status,
+            "objective_value": self.objective_value,
+            "solve_time_seconds": self.solve_time_seconds
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Construit le dictionnaire de solution (format de solution.json)
+
+        Jours et périodes n'y figurent que s'ils diffèrent de la grille fixe
+        (calendrier du moteur à intervalles).
+        """
+        header = self.header()
+        if list(self.days) != DAYS or list(self.periods) != PERIODS:
+            header.update(days=list(self.days), periods=list(self.periods))
+        return dict(header, teachers=list(self.iter_teachers()))
+
+    def print_summary(self, max_teachers: Optional[int] = VERBOSE_TEACHERS):
+        """
+        Affiche le résumé de chaque enseignant, ou un résumé global au-delà
+        de max_teachers enseignants (None : toujours le détail)
+        """
+        total_hours = self.total_hours.tolist()
+        if max_teachers is None or len(self.teachers) <= max_teachers:
+            slot_counts = self.slot_counts.tolist()
+            hours_required = self.hours_required.tolist()
+            for i, teacher in enumerate(self.teachers):
+                print(f"\n{teacher} ({self.subjects[i]}):")
+                print(f"  Heures requises : {hours_required[i]}h")
+                print(f"  Heures assignées : {total_hours[i]}h")
+                print(f"  Créneaux : {slot_counts[i]}")
+            return
+
+        complete = int((self.total_hours == self.hours_required).sum())
+        print(f"\n{len(self.teachers)} enseignants, {int(self.hours.sum())}h assignées "
+              f"sur {int(self.hours_required.sum())}h requises")
+        print(f"  Enseignants au complet : {complete}/{len(self.teachers)}")
+        print(f"  Créneaux utilisés : {int((self.hours > 0).sum())}")
@@ -0,0 +1,184 @@
+import io
+import os
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ortools.sat.python import cp_model
+from typing import Dict, List, Any, Optional
+
+from model import SchedulingModel
+
+def shared_resource_keys(teacher: Dict[str, Any]) -> List[str]:
+    """
+    Ressources partagées par un enseignant avec d'autres enseignants
+
+    Deux enseignants qui partagent une ressource sont couplés par une
+    contrainte et doivent être résolus dans le même sous-modèle : même
+    salle ou classe commune (voir SchedulingModel.constraint_shared_resources).
+
+    Returns:
+        Liste de clés de ressources (vide si l'enseignant est indépendant)
+    """
+    keys = [f"classe:{group}" for group in teacher.get('groups') or []]
+    if teacher.get('room'):
+        keys.append(f"salle:{teacher['room']}")
+    return keys
+
+def find_components(data: Dict[str, Any]) -> List[List[int]]:
+    """
+    Détecte les composantes indépendantes du graphe de contraintes
+
+    Les enseignants sont les sommets, et deux enseignants sont reliés s'ils
+    partagent une ressource (union-find sur les clés de ressources).
+
+    Args:
+        data: Données du problème
+
+    Returns:
+        Liste de composantes, chacune étant une liste d'indices d'enseignants
+    """
+    teachers = data['teachers']
+    parent = list(range(len(teachers)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, teacher in enumerate(teachers):
+        for key in shared_resource_keys(teacher):
+            if key in owner:
+                root_a, root_b = find(owner[key]), find(i)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+            else:
+                owner[key] = i
+
+    components = {}
+    for i in range(len(teachers)):
+        components.setdefault(find(i), []).append(i)
+
+    return list(components.values())
+
+def solve_components(
+    base_data: Dict[str, Any],
+    components: List[List[Dict[str, Any]]],
+    model_options: Dict[str, Any],
+    deadline: float
+) -> List[Dict[str, Any]]:
+    """
+    Construit et résout chaque composante comme un sous-modèle séparé
+
+    Exécuté dans un processus du pool : les traces de construction sont
+    masquées et chaque résolution utilise un seul thread CP-SAT.
+
+    Args:
+        base_data: Données du problème sans la liste des enseignants
+        components: Composantes à résoudre (enseignants de chaque composante)
+        model_options: Options de construction de SchedulingModel
+        deadline: Instant (time.time()) au-delà duquel la recherche s'arrête
+
+    Returns:
+        Un résultat par composante (statut, objectif, statistiques, créneaux non nuls)
+    """
+    results = []
+    for component in components:
+        sub_data = dict(base_data, teachers=component)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            sub_model = SchedulingModel(data=sub_data, **model_options)
+
+        solver = cp_model.CpSolver()
+        solver.parameters.num_workers = 1
+        solver.parameters.max_time_in_seconds = max(deadline - time.time(), 0.01)
+        status = solver.Solve(sub_model.model)
+
+        result = {
+            "status": solver.StatusName(status),
+            "objective_value": 0.0,
+            "wall_time": solver.WallTime(),
+            "branches": solver.NumBranches(),
+            "conflicts": solver.NumConflicts(),
+            "values": []
+        }
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            result["objective_value"] = solver.ObjectiveValue()
+            for key, var in sub_model.slots.items():
+                hours = solver.Value(var)
+                if hours > 0:
+                    result["values"].append((key, hours))
+        results.append(result)
+
+    return results
+
+def merge_status(statuses: List[str]) -> str:
+    """Statut global d'un ensemble de composantes indépendantes"""
+    for status in ("MODEL_INVALID", "INFEASIBLE", "UNKNOWN"):
+        if status in statuses:
+            return status
+    if all(status == "OPTIMAL" for status in statuses):
+        return "OPTIMAL"
+    return "FEASIBLE"
+
+def solve_decomposed(
+    data: Dict[str, Any],
+    model_options: Dict[str, Any],
+    time_limit_seconds: float = 30,
+    max_workers: Optional[int] = None,
+    components_per_task: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Résout le problème composante par composante dans un ProcessPoolExecutor
+
+    Args:
+        data: Données du problème
+        model_options: Options de construction de SchedulingModel
+        time_limit_seconds: Limite de temps globale
+        max_workers: Nombre de processus (par défaut : nombre de cœurs)
+        components_per_task: Composantes envoyées à chaque tâche du pool
+            (par défaut : ~4 tâches par processus)
+
+    Returns:
+        Dictionnaire contenant le statut global, l'objectif (somme des objectifs),
+        les statistiques cumulées et les valeurs {(teacher, day, period): heures}
+    """
+    start = time.perf_counter()
+    deadline = time.time() + time_limit_seconds
+
+    components = find_components(data)
+    max_workers = max_workers or os.cpu_count() or 1
+    if components_per_task is None:
+        components_per_task = max(1, len(components) // (max_workers * 4))
+
+    # Seuls les enseignants de chaque lot sont envoyés aux processus
+    base_data = {key: value for key, value in data.items() if key != 'teachers'}
+    teachers = data['teachers']
+    batches = [
+        [[teachers[i] for i in component] for component in components[start_idx:start_idx + components_per_task]]
+        for start_idx in range(0, len(components), components_per_task)
+    ]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(solve_components, base_data, batch, model_options, deadline)
+            for batch in batches
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+
+    values = {}
+    for result in results:
+        values.update(result["values"])
+
+    return {
+        "status": merge_status([result["status"] for result in results]),
+        "objective_value": sum(result["objective_value"] for result in results),
+        "wall_time": time.perf_counter() - start,
+        "branches": sum(result["branches"] for result in results),
+        "conflicts": sum(result["conflicts"] for result in results),
+        "components": len(components),
+        "values": values
+    }
@@ -0,0 +1,249 @@
+import time
+import numpy as np
+from typing import Dict, Any, Tuple, Optional, Union
+
+from load_problem import AvailabilityIndex, DAYS, PERIODS, HOURS_PER_SLOT
+from solver import write_solution
+from columnar import ColumnarSolution
+from solution_io import solution_format, write_csv
+
+# Champs gérés par la résolution directe : tout autre champ du problème
+# (nouvelles ressources, préférences...) impose de passer par CP-SAT
+SUPPORTED_PROBLEM_KEYS = {"problem_name", "teachers", "variables", "constraints", "objective"}
+SUPPORTED_TEACHER_KEYS = {"name", "subject", "hours_per_week", "available_days"}
+
+class FastScheduler:
+    """
+    Résolution directe du problème de planification, sans CP-SAT
+
+    Avec les seules contraintes actuelles (disponibilités, heures exactes,
+    une période de 0 à 2h par jour), chaque enseignant est indépendant et
+    son sous-problème se résout analytiquement : il faut et il suffit que
+    heures <= 2 x jours disponibles. Les heures sont réparties par tranches
+    de 2h sur les jours disponibles dans l'ordre de la semaine, le reste
+    (1h) sur le jour suivant, toujours le matin.
+
+    L'objectif (somme des heures assignées) est fixé par les contraintes
+    d'heures exactes : toute solution réalisable est optimale.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Initialise le solveur direct
+
+        Args:
+            data: Données du problème (format de problem_structure.json)
+        """
+        self.data = data
+        self.days = list(DAYS)
+        self.periods = list(PERIODS)
+        self.hours_per_slot = HOURS_PER_SLOT
+
+        teachers = data['teachers']
+        self.teachers = [t['name'] for t in teachers]
+        self.subjects = [t['subject'] for t in teachers]
+        self.hours_required = np.array([t['hours_per_week'] for t in teachers], dtype=np.int64)
+
+        # Masques de disponibilité et matrice enseignant x jour, jours inconnus ignorés
+        self.availability_index = AvailabilityIndex.from_data(data, self.days, self.periods)
+        self.available = self.availability_index.day_matrix()
+
+        self.hours = None       # Heures assignées (enseignant x jour x période)
+        self.status = None
+        self.solve_time = 0.0
+        self.solution = None
+        self.columnar = None
+
+    @classmethod
+    def from_columns(cls, columns: 'ProblemColumns') -> 'FastScheduler':
+        """
+        Crée le solveur directement depuis un problème chargé en colonnes
+        (stream_loader.load_problem_columns), sans dictionnaire intermédiaire
+        """
+        scheduler = cls({**columns.metadata, 'teachers': []})
+        scheduler.teachers = columns.teachers
+        scheduler.subjects = columns.subjects
+        scheduler.hours_required = columns.hours_required.astype(np.int64)
+        scheduler.available = columns.availability
+        scheduler.availability_index = columns.availability_index()
+        return scheduler
+
+    @staticmethod
+    def supports(data: Dict[str, Any]) -> Tuple[bool, str]:
+        """
+        Indique si le problème relève de la famille de contraintes gérée
+
+        Returns:
+            Tuple (supporté, raison si non supporté)
+        """
+        # Champs vides (aucune salle, aucune classe...) : sans effet sur la résolution
+        extra_keys = {key for key in set(data) - SUPPORTED_PROBLEM_KEYS if data[key]}
+        if extra_keys:
+            return False, f"champs non gérés : {', '.join(sorted(extra_keys))}"
+
+        if data['objective']['type'] not in ("maximize", "minimize"):
+            return False, f"objectif non géré : {data['objective']['type']}"
+
+        for teacher in data['teachers']:
+            extra_keys = {key for key in set(teacher) - SUPPORTED_TEACHER_KEYS if teacher[key]}
+            if extra_keys:
+                return False, f"{teacher.get('name')} : champs non gérés : {', '.join(sorted(extra_keys))}"
+            if not isinstance(teacher['hours_per_week'], int):
+                return False, f"{teacher['name']} : heures non entières"
+
+        return True, ""
+
+    @staticmethod
+    def supports_columns(columns: 'ProblemColumns') -> Tuple[bool, str]:
+        """Même vérification que supports() pour un problème chargé en colonnes"""
+        if columns.extra_teacher_keys:
+            return False, f"champs d'enseignant non gérés : {', '.join(columns.extra_teacher_keys)}"
+        return FastScheduler.supports({**columns.metadata, 'teachers': []})
+
+    def check_capacity(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vérification de faisabilité de chaque enseignant sur les masques de disponibilité
+
+        Returns:
+            Tuple (réalisable, capacité en heures) : tableaux alignés sur les
+            enseignants, la capacité valant 2h x nombre de jours disponibles (popcount)
+        """
+        capacity = self.hours_per_slot * self.availability_index.day_counts()
+        feasible = (self.hours_required >= 0) & (self.hours_required <= capacity)
+        return feasible, capacity
+
+    def solve(self) -> bool:
+        """
+        Résout tous les enseignants en une passe vectorisée, O(enseignants x jours)
+
+        Returns:
+            True si une solution a été trouvée, False sinon
+        """
+        print("\n" + "="*60)
+        print("RÉSOLUTION DIRECTE DU PROBLÈME (sans CP-SAT)")
+        print("="*60)
+
+        start = time.perf_counter()
+
+        feasible, capacity = self.check_capacity()
+        max_hours = self.hours_per_slot
+
+        # Rang de chaque jour disponible dans la semaine de l'enseignant (0, 1, ...)
+        rank = np.cumsum(self.available, axis=1) - 1
+        day_hours = np.clip(self.hours_required[:, None] - max_hours * rank, 0, max_hours)
+        day_hours *= self.available
+
+        self.hours = np.zeros((len(self.teachers), len(self.days), len(self.periods)), dtype=np.int64)
+        self.hours[:, :, 0] = day_hours
+
+        self.solve_time = time.perf_counter() - start
+
+        if not feasible.all():
+            self.status = "INFEASIBLE"
+            infeasible = np.flatnonzero(~feasible)
+            print("\n[ÉCHEC] Problème impossible à résoudre (contraintes incompatibles)")
+            for i in infeasible[:10]:
+                print(f"  - {self.teachers[i]} : {self.hours_required[i]}h requises, "
+                      f"{capacity[i]}h disponibles au maximum")
+            if len(infeasible) > 10:
+                print(f"  ... et {len(infeasible) - 10} autres enseignants")
+            return False
+
+        self.status = "OPTIMAL"
+        print("\n[SUCCÈS] Solution optimale trouvée!")
+        return True
+
+    def status_name(self) -> str:
+        """Statut de la dernière résolution"""
+        return self.status or "UNKNOWN"
+
+    def objective_value(self) -> float:
+        """Somme des heures assignées"""
+        return float(self.hours.sum()) if self.hours is not None else 0.0
+
+    def extract_solution(self, as_dict: bool = True) -> Union[Dict, ColumnarSolution, None]:
+        """
+        Construit la solution au format de SchedulingSolver.extract_solution
+
+        Args:
+            as_dict: Construit le dictionnaire de solution ; False renvoie la
+                solution en colonnes (voir SchedulingSolver.extract_solution)
+
+        Returns:
+            Dictionnaire contenant le planning pour chaque enseignant
+            (ColumnarSolution si as_dict est faux)
+        """
+        if self.status != "OPTIMAL":
+            return None
+
+        print("\n" + "="*60)
+        print("EXTRACTION DE LA SOLUTION")
+        print("="*60)
+
+        self.solution = None
+        self.columnar = self.extract_columnar()
+        self.columnar.print_summary()
+
+        return self.solution_dict() if as_dict else self.columnar
+
+    def solution_dict(self) -> Optional[Dict]:
+        """Dictionnaire de solution, construit une seule fois depuis la solution en colonnes"""
+        if self.solution is None and self.columnar is not None:
+            self.solution = self.columnar.to_dict()
+        return self.solution
+
+    def extract_columnar(self) -> Optional[ColumnarSolution]:
+        """
+        Solution en colonnes (tableau des heures tel quel), sans dictionnaire
+
+        Returns:
+            ColumnarSolution, ou None si le problème est infaisable
+        """
+        if self.status != "OPTIMAL":
+            return None
+
+        return ColumnarSolution(
+            self.data['problem_name'], self.status, self.objective_value(), self.solve_time,
+            self.teachers, self.subjects, self.hours_required, self.hours,
+            self.days, self.periods
+        )
+
+    def save_solution(self, output_file: str = "solution.json", format: Optional[str] = None):
+        """
+        Sauvegarde la solution dans un fichier
+
+        Les formats ndjson et binary sont écrits depuis la solution en
+        colonnes, sans passer par le dictionnaire complet.
+
+        Args:
+            output_file: Nom du fichier de sortie
+            format: "json", "ndjson" ou "binary" (par défaut : d'après l'extension)
+        """
+        format = format or solution_format(output_file)
+        solution = self.solution_dict() if format == "json" else self.columnar
+        write_solution(solution, output_file, format)
+
+    def export_csv(self, output_file: str = "planning.csv", layout: str = "long", compression: Optional[str] = None) -> int:
+        """
+        Exporte le planning en CSV directement depuis les valeurs des variables
+
+        Passe par la solution en colonnes (extract_columnar), jamais par le
+        dictionnaire de solution ; voir solution_io.write_csv.
+
+        Returns:
+            Nombre de lignes écrites
+        """
+        if self.columnar is None:
+            self.columnar = self.extract_columnar()
+        return write_csv(self.columnar, output_file, layout, compression)
+
+    def print_statistics(self):
+        """Affiche les statistiques de résolution"""
+        print("\n" + "="*60)
+        print("STATISTIQUES")
+        print("="*60)
+        print(f"Statut : {self.status}")
+        print(f"Méthode : résolution directe (sans CP-SAT)")
+        print(f"Valeur objectif : {self.objective_value()}")
+        print(f"Temps de résolution : {self.solve_time:.3f}s")
+        print("="*60)
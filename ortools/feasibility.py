@@ -0,0 +1,278 @@
+import io
+import contextlib
+from collections import Counter
+from ortools.sat.python import cp_model
+from typing import Dict, List, Any, Optional
+
+from load_problem import DAYS, PERIODS, HOURS_PER_SLOT, Calendar, extract_resources_info
+from model import SchedulingModel
+
+# Libellés des familles de contraintes suivies par track_assumptions
+CONSTRAINT_LABELS = {
+    "availability": "disponibilités",
+    "hours_required": "heures requises",
+    "one_slot_per_day": "une période maximum par jour",
+    "room_capacity": "capacité de la salle",
+    "group_overlap": "un cours à la fois par classe"
+}
+
+def _diagnostic(teacher: str, code: str, severity: str, message: str) -> Dict[str, str]:
+    return {"teacher": teacher, "code": code, "severity": severity, "message": message}
+
+def check_feasibility(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Vérifie des bornes simples avant toute construction de modèle
+
+    Chaque enseignant est vérifié indépendamment en temps constant :
+    - heures requises entières et positives
+    - heures requises <= 2h x nombre de jours disponibles (reconnus)
+    - noms de jours inconnus (traités comme indisponibles par le modèle)
+    - noms d'enseignants en double (fusionnés par le modèle)
+
+    Salles et classes partagées :
+    - capacité de salle invalide, salle utilisée sans être déclarée
+    - heures cumulées des enseignants d'une classe (ou d'une salle, multipliées
+      par sa capacité) supérieures aux heures de la semaine
+
+    Avec un calendrier (clé "calendar", moteur à intervalles), la capacité
+    d'un jour est celle du calendrier, et les heures doivent pouvoir être
+    découpées en cours de durée permise.
+
+    Args:
+        data: Données du problème
+
+    Returns:
+        Dictionnaire {"feasible": bool, "diagnostics": [...]}, chaque diagnostic
+        contenant teacher, code, severity ("error" ou "warning") et message
+    """
+    calendar = Calendar.from_data(data) if data.get('calendar') else None
+    week_days = calendar.week_days if calendar is not None else DAYS
+    day_hours = calendar.max_day_hours if calendar is not None else HOURS_PER_SLOT
+    known_days = set(week_days)
+    days_by_lower = {day.lower(): day for day in week_days}
+    diagnostics = []
+
+    name_counts = Counter(teacher['name'] for teacher in data['teachers'])
+    for name, count in name_counts.items():
+        if count > 1:
+            diagnostics.append(_diagnostic(
+                name, "duplicate_teacher", "error",
+                f"{count} enseignants portent ce nom (leurs données seraient fusionnées)"
+            ))
+
+    for teacher in data['teachers']:
+        name = teacher['name']
+        hours = teacher['hours_per_week']
+
+        if not isinstance(hours, int) or isinstance(hours, bool):
+            diagnostics.append(_diagnostic(
+                name, "invalid_hours", "error", f"heures requises non entières : {hours!r}"
+            ))
+            continue
+        if hours < 0:
+            diagnostics.append(_diagnostic(
+                name, "negative_hours", "error", f"heures requises négatives : {hours}h"
+            ))
+            continue
+
+        available = set()
+        for day in teacher['available_days']:
+            if day in known_days:
+                available.add(day)
+                continue
+            suggestion = days_by_lower.get(str(day).strip().lower())
+            hint = f" (vouliez-vous dire « {suggestion} » ?)" if suggestion else ""
+            diagnostics.append(_diagnostic(
+                name, "unknown_day", "warning",
+                f"jour inconnu « {day} », considéré comme indisponible{hint}"
+            ))
+
+        capacity = day_hours * len(available)
+        if hours > capacity:
+            diagnostics.append(_diagnostic(
+                name, "hours_exceed_capacity", "error",
+                f"{hours}h requises mais au plus {capacity}h possibles "
+                f"({len(available)} jour(s) disponible(s) x {day_hours}h)"
+            ))
+        elif calendar is not None and hours:
+            minutes = hours * 60 * calendar.weeks
+            min_lesson_minutes = calendar.min_lesson * calendar.granularity_minutes
+            if minutes % calendar.granularity_minutes or minutes < min_lesson_minutes:
+                diagnostics.append(_diagnostic(
+                    name, "invalid_hours", "error",
+                    f"{hours}h par semaine ne se découpent pas en cours de "
+                    f"{min_lesson_minutes} min minimum, par pas de {calendar.granularity_minutes} min"
+                ))
+
+    diagnostics.extend(_check_resources(data, calendar))
+
+    feasible = not any(d["severity"] == "error" for d in diagnostics)
+    return {"feasible": feasible, "diagnostics": diagnostics}
+
+def _check_resources(data: Dict[str, Any], calendar: Optional[Calendar]) -> List[Dict[str, str]]:
+    """Bornes simples sur les salles et classes partagées (voir check_feasibility)"""
+    diagnostics = []
+    room_capacity, room_teachers, group_teachers = extract_resources_info(data)
+    declared_rooms = {room['name'] for room in data.get('rooms') or []}
+    hours_required = {teacher['name']: teacher['hours_per_week'] for teacher in data['teachers']}
+
+    # Heures d'une ressource sur la semaine : toutes les fenêtres de tous les jours
+    if calendar is not None:
+        week_hours = calendar.hours(sum(end - start for start, end in calendar.windows)) * len(calendar.week_days)
+    else:
+        week_hours = HOURS_PER_SLOT * len(DAYS) * len(PERIODS)
+
+    def total_hours(teachers: List[str]) -> int:
+        return sum(hours for hours in (hours_required[t] for t in teachers) if isinstance(hours, int))
+
+    for room, capacity in room_capacity.items():
+        if not isinstance(capacity, int) or isinstance(capacity, bool) or capacity < 1:
+            diagnostics.append(_diagnostic(
+                f"salle {room}", "invalid_capacity", "error", f"capacité invalide : {capacity!r}"
+            ))
+            continue
+        if room in room_teachers and room not in declared_rooms:
+            diagnostics.append(_diagnostic(
+                f"salle {room}", "unknown_room", "warning", "salle non déclarée, capacité 1"
+            ))
+        hours = total_hours(room_teachers.get(room, []))
+        if hours > capacity * week_hours:
+            diagnostics.append(_diagnostic(
+                f"salle {room}", "room_overload", "error",
+                f"{hours}h requises mais au plus {capacity * week_hours}h possibles "
+                f"({capacity} cours simultané(s) x {week_hours}h)"
+            ))
+
+    for group, teachers in group_teachers.items():
+        hours = total_hours(teachers)
+        if hours > week_hours:
+            diagnostics.append(_diagnostic(
+                f"classe {group}", "group_overload", "error",
+                f"{hours}h de cours mais au plus {week_hours}h dans la semaine"
+            ))
+
+    return diagnostics
+
+def print_feasibility_report(report: Dict[str, Any], max_lines: int = 20):
+    """Affiche le résultat de check_feasibility"""
+    print("\n" + "="*60)
+    print("VÉRIFICATION PRÉALABLE DE FAISABILITÉ")
+    print("="*60)
+
+    diagnostics = report["diagnostics"]
+    for diagnostic in diagnostics[:max_lines]:
+        label = "ERREUR" if diagnostic["severity"] == "error" else "ATTENTION"
+        print(f"  [{label}] {diagnostic['teacher']} : {diagnostic['message']}")
+    if len(diagnostics) > max_lines:
+        print(f"  ... et {len(diagnostics) - max_lines} autres diagnostics")
+
+    if report["feasible"]:
+        print("\n[OK] Aucune incompatibilité détectée par les bornes simples")
+    else:
+        print("\n[ÉCHEC] Données impossibles à satisfaire (voir les erreurs ci-dessus)")
+
+def explain_infeasibility(
+    data: Dict[str, Any],
+    time_limit_seconds: float = 10,
+    minimize: bool = True,
+    **model_options
+) -> List[Dict[str, str]]:
+    """
+    Identifie un ensemble minimal d'enseignants et de contraintes incompatibles
+
+    Chaque famille de contraintes de chaque enseignant est conditionnée à un
+    littéral d'hypothèse ; CP-SAT renvoie un sous-ensemble suffisant
+    d'hypothèses expliquant l'infaisabilité
+    (SufficientAssumptionsForInfeasibility), réduit ensuite par suppression
+    successive quand minimize est activé.
+
+    Args:
+        data: Données du problème
+        time_limit_seconds: Limite de temps de chaque résolution
+        minimize: Réduit le conflit à un ensemble minimal
+        **model_options: Options de SchedulingModel (hors bulk)
+
+    Returns:
+        Liste de {"teacher", "constraint", "label"} (vide si le problème est réalisable
+        ou si aucun conflit n'a été trouvé dans le temps imparti)
+
+    Raises:
+        ValueError: modèle d'hypothèses refusé par CP-SAT (MODEL_INVALID)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduling_model = SchedulingModel(data=data, track_assumptions=True, **model_options)
+
+    model = scheduling_model.model
+    model.ClearObjective()
+    literal_owner = {
+        literal.Index(): key for key, literal in scheduling_model.assumption_literals.items()
+    }
+
+    def solve_with(literals: List[cp_model.IntVar]) -> tuple:
+        model.ClearAssumptions()
+        model.AddAssumptions(literals)
+        solver = cp_model.CpSolver()
+        solver.parameters.num_workers = 1
+        solver.parameters.max_time_in_seconds = time_limit_seconds
+        status = solver.Solve(model)
+        return status, solver
+
+    status, solver = solve_with(list(scheduling_model.assumption_literals.values()))
+    if status == cp_model.MODEL_INVALID:
+        # Un modèle invalide n'est pas un problème sans conflit
+        raise ValueError(f"Modèle d'hypothèses invalide : {model.Validate()}")
+    if status != cp_model.INFEASIBLE:
+        return []
+
+    core = [
+        scheduling_model.assumption_literals[literal_owner[index]]
+        for index in solver.SufficientAssumptionsForInfeasibility()
+    ]
+
+    if minimize:
+        # Suppression successive : une hypothèse est retirée si le reste reste infaisable
+        i = 0
+        while i < len(core):
+            candidate = core[:i] + core[i + 1:]
+            status, _ = solve_with(candidate)
+            if status == cp_model.INFEASIBLE:
+                core = candidate
+            else:
+                i += 1
+
+    conflict = []
+    for literal in core:
+        teacher, constraint = literal_owner[literal.Index()]
+        conflict.append({
+            "teacher": teacher,
+            "constraint": constraint,
+            "label": CONSTRAINT_LABELS.get(constraint, constraint)
+        })
+    return conflict
+
+def print_conflict(conflict: List[Dict[str, str]]):
+    """Affiche le résultat de explain_infeasibility, regroupé par enseignant"""
+    print("\n" + "="*60)
+    print("ANALYSE DE L'INFAISABILITÉ")
+    print("="*60)
+
+    if not conflict:
+        print("\nAucun conflit identifié")
+        return
+
+    by_teacher = {}
+    for item in conflict:
+        by_teacher.setdefault(item["teacher"], []).append(item["label"])
+
+    print(f"\nContraintes incompatibles ({len(conflict)}) :")
+    for teacher, labels in by_teacher.items():
+        print(f"  - {teacher} : {' + '.join(labels)}")
+
+if __name__ == "__main__":
+    from load_problem import load_problem_data
+
+    data = load_problem_data()
+    report = check_feasibility(data)
+    print_feasibility_report(report)
+
+    print_conflict(explain_infeasibility(data))
@@ -0,0 +1,188 @@
+import json
+import math
+import random
+import argparse
+from typing import Dict, Any, Optional
+
+from load_problem import DAYS, PERIODS
+
+SUBJECTS = [
+    "Mathématiques", "Physique", "Français", "Histoire", "Anglais",
+    "Chimie", "Biologie", "Géographie", "Philosophie", "Espagnol"
+]
+
+# Répartitions des heures requises, entre 1h et la capacité (2h x jours disponibles)
+HOUR_DISTRIBUTIONS = ("uniform", "low", "high", "saturated")
+
+def _required_hours(rng: random.Random, capacity: int, distribution: str) -> int:
+    """Tire un nombre d'heures réalisable selon la répartition demandée"""
+    if capacity == 0:
+        return 0
+    if distribution == "uniform":
+        return rng.randint(1, capacity)
+    if distribution == "saturated":
+        return capacity
+    # Loi triangulaire penchée vers 1h (low) ou vers la capacité (high)
+    mode = 1 if distribution == "low" else capacity
+    return min(capacity, max(1, round(rng.triangular(1, capacity, mode))))
+
+def generate_problem(
+    n_teachers: int,
+    seed: int = 0,
+    availability_density: Optional[float] = None,
+    hours_distribution: str = "uniform",
+    infeasible_rate: float = 0.0,
+    n_rooms: int = 0,
+    n_groups: int = 0,
+    preference_rate: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Génère un problème synthétique au format de problem_structure.json
+
+    Par défaut, chaque enseignant a entre 2 et 4 jours disponibles et un
+    nombre d'heures réalisable (au plus 2h par jour disponible).
+
+    Args:
+        n_teachers: Nombre d'enseignants à générer
+        seed: Graine du générateur aléatoire
+        availability_density: Probabilité qu'un jour donné soit disponible
+            (None : entre 2 et 4 jours tirés uniformément)
+        hours_distribution: Répartition des heures requises entre 1h et la
+            capacité (voir HOUR_DISTRIBUTIONS)
+        infeasible_rate: Proportion d'enseignants rendus infaisables
+            (heures requises au-delà de leur capacité)
+        n_rooms: Nombre de salles partagées ; chaque enseignant en utilise
+            une, de capacité un cours simultané pour 2 enseignants
+        n_groups: Nombre de classes ; chaque enseignant en a une (les
+            heures d'une classe peuvent dépasser la semaine si elle a trop
+            d'enseignants, voir feasibility.check_feasibility)
+        preference_rate: Proportion d'enseignants ayant des jours et une
+            période préférés (contraintes souples, voir soft_constraints)
+
+    Returns:
+        Dictionnaire contenant les données du problème
+    """
+    if hours_distribution not in HOUR_DISTRIBUTIONS:
+        raise ValueError(
+            f"Répartition inconnue : {hours_distribution} (attendu : {', '.join(HOUR_DISTRIBUTIONS)})"
+        )
+    if availability_density is not None and not 0 <= availability_density <= 1:
+        raise ValueError(f"availability_density doit être entre 0 et 1 : {availability_density}")
+    if not 0 <= infeasible_rate <= 1:
+        raise ValueError(f"infeasible_rate doit être entre 0 et 1 : {infeasible_rate}")
+    if not 0 <= preference_rate <= 1:
+        raise ValueError(f"preference_rate doit être entre 0 et 1 : {preference_rate}")
+
+    rng = random.Random(seed)
+
+    teachers = []
+    for i in range(n_teachers):
+        if availability_density is None:
+            n_days = rng.randint(2, 4)
+            available_days = sorted(rng.sample(DAYS, n_days), key=DAYS.index)
+        else:
+            available_days = [day for day in DAYS if rng.random() < availability_density]
+            n_days = len(available_days)
+        subject = rng.choice(SUBJECTS)
+        hours = _required_hours(rng, 2 * n_days, hours_distribution)
+        if infeasible_rate and rng.random() < infeasible_rate:
+            hours = 2 * n_days + rng.randint(1, 2)
+
+        teachers.append({
+            "name": f"Enseignant {i:06d}",
+            "subject": subject,
+            "hours_per_week": hours,
+            "available_days": available_days
+        })
+
+    # Ressources tirées après les enseignants (mêmes enseignants qu'un problème
+    # sans ressources), réparties équitablement : n_teachers / n ressources chacune
+    def balanced(n: int) -> list:
+        assignment = [k % n for k in range(n_teachers)]
+        rng.shuffle(assignment)
+        return assignment
+
+    resources = {}
+    if n_rooms:
+        room_count = [0] * n_rooms
+        for teacher, k in zip(teachers, balanced(n_rooms)):
+            teacher["room"] = f"Salle {k:04d}"
+            room_count[k] += 1
+        resources["rooms"] = [
+            {"name": f"Salle {k:04d}", "capacity": max(1, math.ceil(count / 2))}
+            for k, count in enumerate(room_count)
+        ]
+    if n_groups:
+        for teacher, k in zip(teachers, balanced(n_groups)):
+            teacher["groups"] = [f"Classe {k:04d}"]
+        resources["groups"] = [{"name": f"Classe {k:04d}"} for k in range(n_groups)]
+
+    # Préférences tirées en dernier : une partie des jours disponibles et une période
+    soft_constraints = []
+    if preference_rate:
+        for teacher in teachers:
+            if teacher["available_days"] and rng.random() < preference_rate:
+                n_preferred = rng.randint(1, len(teacher["available_days"]))
+                teacher["preferred_days"] = sorted(rng.sample(teacher["available_days"], n_preferred), key=DAYS.index)
+                teacher["preferred_periods"] = [rng.choice(PERIODS)]
+        soft_constraints = [
+            {"id": 4, "description": "Respecter les jours préférés des enseignants si possible.",
+             "type": "soft", "kind": "preferred_days", "weight": 1, "priority": 1},
+            {"id": 5, "description": "Respecter les périodes préférées des enseignants si possible.",
+             "type": "soft", "kind": "preferred_periods", "weight": 1, "priority": 2}
+        ]
+
+    return {
+        "problem_name": f"Problème synthétique ({n_teachers} enseignants, seed={seed})",
+        "teachers": teachers,
+        **resources,
+        "variables": [
+            {
+                "name": "x[i,j,k]",
+                "description": "Nombre d'heures de l'enseignant i le jour j pendant la période k",
+                "type": "integer"
+            }
+        ],
+        "constraints": [
+            {"id": 1, "description": "Chaque enseignant ne peut donner qu'une seule période par jour.", "type": "hard"},
+            {"id": 2, "description": "Chaque enseignant doit atteindre le nombre total d'heures assigné.", "type": "hard"},
+            {"id": 3, "description": "Les créneaux horaires sont divisés en demi-journées (matin / après-midi).", "type": "hard"},
+            *soft_constraints
+        ],
+        "objective": {
+            "description": "Maximiser l'utilisation des heures d'enseignement.",
+            "type": "maximize"
+        }
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère un problème de planification synthétique")
+    parser.add_argument("n_teachers", type=int, help="Nombre d'enseignants")
+    parser.add_argument("--seed", type=int, default=0, help="Graine aléatoire")
+    parser.add_argument("--output", default="problem_synthetic.json", help="Fichier de sortie")
+    parser.add_argument("--density", type=float, default=None,
+                        help="Probabilité qu'un jour soit disponible (défaut : 2 à 4 jours)")
+    parser.add_argument("--hours", choices=HOUR_DISTRIBUTIONS, default="uniform",
+                        help="Répartition des heures requises")
+    parser.add_argument("--infeasible-rate", type=float, default=0.0,
+                        help="Proportion d'enseignants infaisables")
+    parser.add_argument("--rooms", type=int, default=0, help="Nombre de salles partagées")
+    parser.add_argument("--groups", type=int, default=0, help="Nombre de classes")
+    parser.add_argument("--preference-rate", type=float, default=0.0,
+                        help="Proportion d'enseignants ayant des jours et une période préférés")
+    args = parser.parse_args()
+
+    problem = generate_problem(
+        args.n_teachers,
+        args.seed,
+        availability_density=args.density,
+        hours_distribution=args.hours,
+        infeasible_rate=args.infeasible_rate,
+        n_rooms=args.rooms,
+        n_groups=args.groups,
+        preference_rate=args.preference_rate
+    )
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(problem, f, ensure_ascii=False, indent=2)
+
+    print(f"[OK] {args.n_teachers} enseignants générés dans {args.output}")
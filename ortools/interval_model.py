@@ -0,0 +1,352 @@
+import math
+import numpy as np
+from ortools.sat.python import cp_model
+from typing import Dict, List, Any, Optional
+
+from load_problem import load_problem_data, extract_teachers_info, extract_resources_info, Calendar
+from columnar import ColumnarSolution
+from solver import SchedulingSolver
+
+class IntervalSchedulingModel:
+    """
+    Modèle de planification à base de variables d'intervalle
+
+    Chaque cours d'un enseignant est un intervalle optionnel
+    (NewOptionalIntervalVar) de durée comprise entre les bornes du
+    calendrier ; les cours d'un enseignant ne se chevauchent pas
+    (AddNoOverlap). Les disponibilités sont portées par les domaines des
+    débuts de cours : tout instant hors des fenêtres des jours disponibles
+    est retiré du domaine. La taille du modèle dépend du nombre de cours,
+    pas du nombre de créneaux de l'horizon (granularité fine, plusieurs
+    semaines).
+
+    Le calendrier (horizon, périodes, granularité) vient de la clé
+    "calendar" du problème ; sans elle, le modèle reproduit la grille de
+    SchedulingModel (5 jours, 2 périodes de 2h, un cours par jour).
+    """
+
+    def __init__(
+        self,
+        problem_file: str = "problem_structure.json",
+        data: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialise le modèle
+
+        Args:
+            problem_file: Chemin vers le fichier JSON du problème
+            data: Données du problème déjà chargées (remplace problem_file)
+        """
+        # Charger les données
+        self.data = data if data is not None else load_problem_data(problem_file)
+        self.teachers, self.subjects, self.hours_required, self.availability = \
+            extract_teachers_info(self.data)
+        self.room_capacity, self.room_teachers, self.group_teachers = extract_resources_info(self.data)
+
+        # Calendrier : jours de l'horizon, périodes et unité de temps
+        self.calendar = Calendar.from_data(self.data)
+        self.days = self.calendar.days
+        self.periods = self.calendar.period_names
+        self.teacher_index = {teacher: i for i, teacher in enumerate(self.teachers)}
+
+        # Créer le modèle CP-SAT
+        self.model = cp_model.CpModel()
+
+        # Cours de chaque enseignant : {teacher: [{present, size, start, end, day, period, interval}]}
+        self.lessons: Dict[str, List[Dict[str, Any]]] = {}
+        self._lesson_indices = None
+
+        # Interface commune avec SchedulingModel (utilisée par SchedulingSolver)
+        self.slots = {}
+        self.hints = {}
+
+        self.create_lessons()
+        self.add_constraints()
+        self.add_objective()
+        self.add_search_strategy()
+
+    def required_units(self, teacher: str) -> int:
+        """Durée totale à planifier sur l'horizon, en unités de temps"""
+        return self.calendar.to_units(self.hours_required[teacher] * 60 * self.calendar.weeks)
+
+    def available_day_indices(self, teacher: str) -> List[int]:
+        """Jours de l'horizon où l'enseignant est disponible (jours inconnus ignorés)"""
+        available = set(self.availability[teacher])
+        return [
+            j for j, k in enumerate(self.calendar.week_day_index)
+            if self.calendar.week_days[k] in available
+        ]
+
+    def lesson_count(self, teacher: str, day_indices: List[int]) -> int:
+        """Nombre de cours à prévoir : assez pour couvrir les heures, pas plus que l'horizon n'en contient"""
+        calendar = self.calendar
+        needed = math.ceil(self.required_units(teacher) / calendar.min_lesson)
+        if calendar.one_lesson_per_day:
+            per_day = 1
+        else:
+            per_day = sum((end - start) // calendar.min_lesson for start, end in calendar.windows)
+        return min(needed, per_day * len(day_indices))
+
+    def _start_domain(self, day_indices: List[int]) -> cp_model.Domain:
+        """Débuts de cours possibles : fenêtres des jours disponibles, le reste est interdit"""
+        calendar = self.calendar
+        intervals = []
+        for j in day_indices:
+            base = j * calendar.units_per_day
+            for start, end in calendar.windows:
+                if end - start >= calendar.min_lesson:
+                    intervals.append([base + start, base + end - calendar.min_lesson])
+        return cp_model.Domain.FromIntervals(intervals)
+
+    def create_lessons(self):
+        """
+        Crée les variables de chaque cours
+
+        - présence (booléen) et durée : 0 si absent, entre les durées
+          minimale et maximale sinon
+        - début (domaine restreint aux fenêtres disponibles), fin, intervalle optionnel
+        - jour et période : le cours tient dans la fenêtre (jour, période),
+          début = jour x unités par jour + décalage dans la journée
+        """
+        print("\nCréation des cours (variables d'intervalle)...")
+
+        calendar = self.calendar
+        model = self.model
+        units_per_day = calendar.units_per_day
+        window_starts = [start for start, _ in calendar.windows]
+        window_ends = [end for _, end in calendar.windows]
+        size_domain = cp_model.Domain.FromIntervals([[0, 0], [calendar.min_lesson, calendar.max_lesson]])
+
+        for teacher in self.teachers:
+            day_indices = self.available_day_indices(teacher)
+            start_domain = self._start_domain(day_indices)
+            lessons = []
+            for n in range(self.lesson_count(teacher, day_indices)):
+                name = f"{teacher}_cours{n}"
+                present = model.NewBoolVar(f"{name}_present")
+                size = model.NewIntVarFromDomain(size_domain, f"{name}_duree")
+                start = model.NewIntVarFromDomain(start_domain, f"{name}_debut")
+                end = model.NewIntVar(0, calendar.horizon, f"{name}_fin")
+                interval = model.NewOptionalIntervalVar(start, size, end, present, name)
+
+                day = model.NewIntVarFromDomain(cp_model.Domain.FromValues(day_indices), f"{name}_jour")
+                period = model.NewIntVar(0, len(calendar.windows) - 1, f"{name}_periode")
+                offset = model.NewIntVar(0, units_per_day - 1, f"{name}_decalage")
+                window_start = model.NewIntVar(0, units_per_day, f"{name}_fenetre_debut")
+                window_end = model.NewIntVar(0, units_per_day, f"{name}_fenetre_fin")
+                model.Add(start == day * units_per_day + offset)
+                model.AddElement(period, window_starts, window_start)
+                model.AddElement(period, window_ends, window_end)
+                model.Add(offset >= window_start)
+                model.Add(offset + size <= window_end)
+
+                # Présent <=> durée non nulle
+                model.Add(size >= calendar.min_lesson).OnlyEnforceIf(present)
+                model.Add(size == 0).OnlyEnforceIf(present.Not())
+
+                lessons.append({
+                    "present": present, "size": size, "start": start, "end": end,
+                    "day": day, "period": period, "interval": interval
+                })
+            self.lessons[teacher] = lessons
+
+        n_lessons = sum(len(lessons) for lessons in self.lessons.values())
+        n_slots = len(self.teachers) * len(calendar.days) * sum(end - start for start, end in calendar.windows)
+        print(f"  {n_lessons} cours ({len(self.model.Proto().variables)} variables) "
+              f"pour {n_slots} créneaux de {calendar.granularity_minutes} min")
+
+    def add_constraints(self):
+        """Ajoute les contraintes de chaque enseignant"""
+        print("\nAjout des contraintes...")
+
+        calendar = self.calendar
+        model = self.model
+        for teacher, lessons in self.lessons.items():
+            # [1] Pas de chevauchement entre les cours d'un enseignant
+            model.AddNoOverlap([lesson["interval"] for lesson in lessons])
+
+            # [2] Heures requises sur l'horizon
+            model.Add(cp_model.LinearExpr.Sum([lesson["size"] for lesson in lessons])
+                      == self.required_units(teacher))
+
+            # [3] Cours présents en premier, dans l'ordre chronologique (brise les
+            # symétries) ; un cours par jour au plus si le calendrier l'impose
+            for previous, lesson in zip(lessons, lessons[1:]):
+                model.AddImplication(lesson["present"], previous["present"])
+                if calendar.one_lesson_per_day:
+                    model.Add(lesson["day"] >= previous["day"] + 1).OnlyEnforceIf(lesson["present"])
+                else:
+                    model.Add(lesson["start"] >= previous["end"]).OnlyEnforceIf(lesson["present"])
+
+        print(f"  {len(self.lessons)} enseignants : non-chevauchement, heures requises"
+              + (", un cours par jour" if calendar.one_lesson_per_day else ""))
+
+        # [4] Salles et classes partagées : une contrainte globale par ressource
+        # (AddNoOverlap par classe, AddCumulative par salle), de taille
+        # proportionnelle au nombre de cours concernés
+        count = 0
+        for group, teachers in self.group_teachers.items():
+            if len(teachers) > 1:
+                model.AddNoOverlap(self._intervals(teachers))
+                count += 1
+        for room, teachers in self.room_teachers.items():
+            capacity = self.room_capacity[room]
+            if len(teachers) > capacity:
+                intervals = self._intervals(teachers)
+                model.AddCumulative(intervals, [1] * len(intervals), capacity)
+                count += 1
+        if count:
+            print(f"  {count} ressources partagées (salles, classes)")
+
+    def has_shared_resources(self) -> bool:
+        """Des enseignants sont couplés par une salle ou une classe"""
+        return bool(self.room_teachers or self.group_teachers)
+
+    def _intervals(self, teachers: List[str]) -> List[cp_model.IntervalVar]:
+        """Intervalles de tous les cours d'un ensemble d'enseignants"""
+        return [lesson["interval"] for teacher in teachers for lesson in self.lessons[teacher]]
+
+    def add_objective(self):
+        """Même objectif que SchedulingModel : durée totale assignée (en unités de temps)"""
+        print("\nDéfinition de l'objectif...")
+
+        objective_type = self.data['objective']['type']
+        total = cp_model.LinearExpr.Sum([
+            lesson["size"] for lessons in self.lessons.values() for lesson in lessons
+        ])
+        if objective_type == "maximize":
+            self.model.Maximize(total)
+            print("  Objectif défini: maximiser le nombre d'heures d'enseignement assignées")
+        elif objective_type == "minimize":
+            self.model.Minimize(total)
+            print("  Objectif défini: minimiser le nombre d'heures utilisées")
+
+    def add_search_strategy(self):
+        """
+        Stratégie de recherche : enseignant par enseignant, les cours les plus
+        longs d'abord, puis placés au plus tôt
+
+        Quand les enseignants sont indépendants, cette affectation gloutonne
+        trouve directement une solution complète ; sans elle, la recherche par
+        défaut ne conclut pas sur un calendrier fin à plusieurs cours par jour.
+        """
+        for lessons in self.lessons.values():
+            self.model.AddDecisionStrategy([lesson["size"] for lesson in lessons],
+                                           cp_model.CHOOSE_FIRST, cp_model.SELECT_MAX_VALUE)
+            self.model.AddDecisionStrategy([lesson["start"] for lesson in lessons],
+                                           cp_model.CHOOSE_FIRST, cp_model.SELECT_MIN_VALUE)
+
+    def lesson_indices(self) -> Dict[str, np.ndarray]:
+        """
+        Indices proto des variables de tous les cours (calculés une fois)
+
+        Returns:
+            {"teacher": indice de l'enseignant, "present", "size", "start",
+            "day", "period": indice de la variable correspondante}
+        """
+        if self._lesson_indices is None:
+            keys = ("present", "size", "start", "day", "period")
+            teacher_idx = []
+            indices = {key: [] for key in keys}
+            for teacher, lessons in self.lessons.items():
+                for lesson in lessons:
+                    teacher_idx.append(self.teacher_index[teacher])
+                    for key in keys:
+                        indices[key].append(lesson[key].Index())
+            self._lesson_indices = {key: np.array(values, dtype=np.int64) for key, values in indices.items()}
+            self._lesson_indices["teacher"] = np.array(teacher_idx, dtype=np.int64)
+        return self._lesson_indices
+
+class IntervalSchedulingSolver(SchedulingSolver):
+    """
+    Résolution du modèle à intervalles
+
+    Même interface que SchedulingSolver ; la solution a le même format
+    (heures par enseignant, jour et période), chaque enseignant ayant en
+    plus la liste de ses cours avec leurs horaires ("lessons").
+    """
+
+    def __init__(self, model: IntervalSchedulingModel):
+        super().__init__(model)
+        # Suit la stratégie du modèle (add_search_strategy) ; gloutonne par
+        # enseignant, elle n'est imposée que si les enseignants sont indépendants
+        if not model.has_shared_resources():
+            self.solver.parameters.search_branching = cp_model.FIXED_SEARCH
+
+    def solve_decomposed(self, time_limit_seconds: int = 30, max_workers: Optional[int] = None) -> bool:
+        raise ValueError("La résolution décomposée n'est pas disponible pour le moteur à intervalles")
+
+    def objective_value(self) -> float:
+        """Valeur de l'objectif, en heures"""
+        return super().objective_value() * self.model_instance.calendar.granularity_minutes / 60
+
+    def columnar_from_response(self, response, status: str, objective_value: float, solve_time_seconds: float) -> ColumnarSolution:
+        """Heures par (enseignant, jour, période) : somme des durées des cours présents"""
+        model = self.model_instance
+        calendar = model.calendar
+        values = np.fromiter(response.solution, dtype=np.int64, count=len(response.solution))
+        indices = model.lesson_indices()
+
+        present = values[indices["present"]] == 1
+        minutes = np.zeros((len(model.teachers), len(model.days), len(model.periods)), dtype=np.int64)
+        np.add.at(
+            minutes,
+            (indices["teacher"][present], values[indices["day"]][present], values[indices["period"]][present]),
+            values[indices["size"]][present] * calendar.granularity_minutes
+        )
+        # Heures entières si tous les cours tombent sur l'heure
+        hours = minutes // 60 if not (minutes % 60).any() else minutes / 60
+
+        return ColumnarSolution(
+            model.data['problem_name'],
+            status, objective_value, solve_time_seconds,
+            model.teachers, model.subjects,
+            [model.hours_required[teacher] * calendar.weeks for teacher in model.teachers],
+            hours, model.days, model.periods
+        )
+
+    def lessons_of(self, teacher: str) -> List[Dict[str, Any]]:
+        """Cours planifiés d'un enseignant, dans l'ordre chronologique"""
+        model = self.model_instance
+        calendar = model.calendar
+        lessons = []
+        for lesson in model.lessons[teacher]:
+            if not self.solver.Value(lesson["present"]):
+                continue
+            start = self.solver.Value(lesson["start"])
+            size = self.solver.Value(lesson["size"])
+            lessons.append({
+                "day": model.days[self.solver.Value(lesson["day"])],
+                "period": model.periods[self.solver.Value(lesson["period"])],
+                "start": calendar.format_time(start),
+                "end": calendar.format_time(start + size),
+                "hours": calendar.hours(size)
+            })
+        return lessons
+
+    def solution_dict(self) -> Optional[Dict]:
+        """Dictionnaire de solution (format de solution.json) avec les horaires des cours"""
+        if self.solution is None and self.columnar is not None:
+            for teacher_data in super().solution_dict()['teachers']:
+                teacher_data['lessons'] = self.lessons_of(teacher_data['name'])
+        return self.solution
+
+    def slot_value(self, teacher: str, day: str, period: str) -> float:
+        """Heures assignées à une fenêtre (jour, période)"""
+        return sum(
+            lesson["hours"] for lesson in self.lessons_of(teacher)
+            if lesson["day"] == day and lesson["period"] == period
+        )
+
+if __name__ == "__main__":
+    # Test du moteur à intervalles sur le problème par défaut
+    model = IntervalSchedulingModel()
+    solver = IntervalSchedulingSolver(model)
+
+    if solver.solve(time_limit_seconds=30):
+        solution = solver.extract_solution()
+        for teacher_data in solution['teachers']:
+            print(f"\n{teacher_data['name']} :")
+            for lesson in teacher_data['lessons']:
+                print(f"  - {lesson['day']} {lesson['start']}-{lesson['end']} ({lesson['hours']}h)")
+        solver.print_statistics()
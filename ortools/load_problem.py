@@ -1,5 +1,26 @@
 import json
-from typing import Dict, List, Any
+import numpy as np
+from typing import Dict, List, Any, Optional, Sequence
+
+# Paramètres fixes du problème : semaine de 5 jours, 2 demi-journées de 2h
+DAYS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi"]
+PERIODS = ["matin", "après-midi"]
+HOURS_PER_SLOT = 2
+
+# Calendrier par défaut du moteur à intervalles (clé "calendar" du problème) :
+# reproduit la grille fixe ci-dessus, une fenêtre de 2h par période
+DEFAULT_CALENDAR = {
+    "days": DAYS,
+    "weeks": 1,
+    "granularity_minutes": 60,
+    "periods": [
+        {"name": "matin", "start": "08:00", "end": "10:00"},
+        {"name": "après-midi", "start": "14:00", "end": "16:00"}
+    ],
+    "min_lesson_minutes": 60,
+    "max_lesson_minutes": 60 * HOURS_PER_SLOT,
+    "one_lesson_per_day": True
+}
 
 def load_problem_data(json_file: str = "problem_structure.json") -> Dict[str, Any]:
     """
@@ -38,6 +59,301 @@ def extract_teachers_info(data: Dict[str, Any]) -> tuple:
 
     return teachers_list, subjects, hours_required, availability
 
+def extract_resources_info(data: Dict[str, Any]) -> tuple:
+    """
+    Extrait les ressources partagées entre enseignants (salles et classes)
+
+    Une salle non déclarée dans "rooms" mais utilisée par un enseignant a
+    une capacité de 1 ; une classe n'a pas besoin d'être déclarée.
+
+    Returns:
+        Tuple contenant (room_capacity, room_teachers, group_teachers) :
+        capacité de chaque salle, enseignants utilisant chaque salle,
+        enseignants de chaque classe
+    """
+    room_capacity = {room['name']: room.get('capacity', 1) for room in data.get('rooms') or []}
+    room_teachers = {}
+    group_teachers = {group['name']: [] for group in data.get('groups') or []}
+
+    for teacher in data['teachers']:
+        room = teacher.get('room')
+        if room:
+            room_capacity.setdefault(room, 1)
+            room_teachers.setdefault(room, []).append(teacher['name'])
+        for group in dict.fromkeys(teacher.get('groups') or []):
+            group_teachers.setdefault(group, []).append(teacher['name'])
+
+    return room_capacity, room_teachers, group_teachers
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    """Nombre de bits à 1 de chaque masque (uint64)"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks).astype(np.int64)
+    # NumPy < 2.0 : décompte octet par octet
+    bits = np.unpackbits(masks.astype(np.uint64).view(np.uint8).reshape(len(masks), 8), axis=1)
+    return bits.sum(axis=1, dtype=np.int64)
+
+class AvailabilityIndex:
+    """
+    Index des disponibilités : un masque de bits par enseignant sur la grille jour x période
+
+    Le créneau (jour j, période k) correspond au bit j * nb_périodes + k.
+    Un enseignant disponible un jour a les bits de toutes les périodes de ce
+    jour à 1 ; les jours inconnus sont ignorés (indisponibles). Les tests
+    d'appartenance deviennent des opérations sur les masques : ET avec le
+    masque d'un jour ou d'une solution, décompte des bits (popcount).
+
+    Les masques sont gardés sous deux formes : entiers Python (tests
+    ponctuels pendant la construction du modèle) et tableau uint64
+    (vérifications vectorisées sur tous les enseignants).
+    """
+
+    def __init__(
+        self,
+        teachers: Sequence[str],
+        masks: np.ndarray,
+        days: Sequence[str] = DAYS,
+        periods: Sequence[str] = PERIODS
+    ):
+        """
+        Args:
+            teachers: Noms des enseignants (ordre du problème)
+            masks: Masque de disponibilité de chaque enseignant (uint64)
+            days: Noms des jours
+            periods: Noms des périodes
+        """
+        self.days = list(days)
+        self.periods = list(periods)
+        if len(self.days) * len(self.periods) > 64:
+            raise ValueError("La grille jour x période dépasse 64 créneaux")
+
+        self.teachers = teachers
+        self.masks = np.asarray(masks, dtype=np.uint64)
+        self._masks = self.masks.tolist()
+        self._teacher_index = None
+        self._day_masks = [self.day_mask(j) for j in range(len(self.days))]
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], days: Sequence[str] = DAYS, periods: Sequence[str] = PERIODS) -> 'AvailabilityIndex':
+        """Construit l'index à partir des données du problème (une passe sur les enseignants)"""
+        n_periods = len(periods)
+        day_bits = {day: ((1 << n_periods) - 1) << (j * n_periods) for j, day in enumerate(days)}
+        # Un même jeu de jours disponibles revient très souvent : masque calculé une fois
+        masks_by_days = {}
+        masks = []
+        for teacher in data['teachers']:
+            available_days = tuple(teacher['available_days'])
+            mask = masks_by_days.get(available_days)
+            if mask is None:
+                mask = 0
+                for day in available_days:
+                    mask |= day_bits.get(day, 0)
+                masks_by_days[available_days] = mask
+            masks.append(mask)
+        teachers = [teacher['name'] for teacher in data['teachers']]
+        return cls(teachers, np.array(masks, dtype=np.uint64), days, periods)
+
+    @classmethod
+    def from_day_matrix(
+        cls,
+        teachers: Sequence[str],
+        available: np.ndarray,
+        days: Sequence[str] = DAYS,
+        periods: Sequence[str] = PERIODS
+    ) -> 'AvailabilityIndex':
+        """Construit l'index à partir d'une matrice booléenne enseignant x jour"""
+        slots = np.repeat(np.asarray(available, dtype=bool), len(periods), axis=1)
+        return cls(teachers, cls.pack(slots), days, periods)
+
+    @staticmethod
+    def pack(slots: np.ndarray) -> np.ndarray:
+        """
+        Masques uint64 d'un tableau booléen (enseignants, créneaux) ou
+        (enseignants, jours, périodes), créneau c -> bit c
+        """
+        slots = np.asarray(slots, dtype=bool).reshape(len(slots), -1)
+        # Bits distincts : la somme est le OU des bits
+        bits = np.left_shift(np.uint64(1), np.arange(slots.shape[1], dtype=np.uint64))
+        return (slots * bits).sum(axis=1, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def slot_bit(self, day_idx: int, period_idx: int) -> int:
+        """Bit du créneau (jour, période)"""
+        return 1 << (day_idx * len(self.periods) + period_idx)
+
+    def day_mask(self, day_idx: int) -> int:
+        """Bits de toutes les périodes d'un jour"""
+        n_periods = len(self.periods)
+        return ((1 << n_periods) - 1) << (day_idx * n_periods)
+
+    @property
+    def teacher_index(self) -> Dict[str, int]:
+        """Position de chaque enseignant, construite au premier accès par nom"""
+        if self._teacher_index is None:
+            # En cas de doublon, le dernier l'emporte (comme extract_teachers_info)
+            self._teacher_index = {name: i for i, name in enumerate(self.teachers)}
+        return self._teacher_index
+
+    def mask(self, teacher: str) -> int:
+        """Masque de disponibilité d'un enseignant (par nom, 0 si inconnu)"""
+        i = self.teacher_index.get(teacher)
+        return 0 if i is None else self._masks[i]
+
+    def is_available(self, teacher: str, day_idx: int) -> bool:
+        """Indique si l'enseignant est disponible ce jour"""
+        return bool(self.mask(teacher) & self._day_masks[day_idx])
+
+    def available_day_indices(self, teacher: str) -> List[int]:
+        """Indices des jours disponibles d'un enseignant, dans l'ordre de la semaine"""
+        mask = self.mask(teacher)
+        return [j for j, day_mask in enumerate(self._day_masks) if mask & day_mask]
+
+    def day_names(self, mask: int) -> List[str]:
+        """Jours ayant au moins un bit à 1 dans un masque"""
+        return [day for day, day_mask in zip(self.days, self._day_masks) if mask & day_mask]
+
+    def day_matrix(self) -> np.ndarray:
+        """Matrice booléenne de disponibilité (enseignants x jours)"""
+        available = np.zeros((len(self.masks), len(self.days)), dtype=bool)
+        for j, day_mask in enumerate(self._day_masks):
+            available[:, j] = (self.masks & np.uint64(day_mask)) != 0
+        return available
+
+    def slot_counts(self) -> np.ndarray:
+        """Nombre de créneaux disponibles de chaque enseignant (popcount)"""
+        return _popcount(self.masks)
+
+    def day_counts(self) -> np.ndarray:
+        """Nombre de jours disponibles de chaque enseignant"""
+        return self.slot_counts() // len(self.periods)
+
+    def masks_for(self, teachers: Sequence[str]) -> np.ndarray:
+        """Masques d'une liste de noms (0 pour un enseignant inconnu)"""
+        return np.fromiter((self.mask(teacher) for teacher in teachers), dtype=np.uint64, count=len(teachers))
+
+    def unavailable(self, solution_masks: np.ndarray, masks: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Créneaux utilisés hors disponibilités : solution ET NON disponibilité
+
+        Args:
+            solution_masks: Masques des créneaux utilisés (voir pack)
+            masks: Masques de disponibilité alignés (par défaut ceux de l'index)
+        """
+        masks = self.masks if masks is None else masks
+        return np.asarray(solution_masks, dtype=np.uint64) & ~masks
+
+def _minutes(time: str) -> int:
+    """Heure "HH:MM" en minutes depuis minuit"""
+    hours, minutes = time.split(":")
+    return int(hours) * 60 + int(minutes)
+
+class Calendar:
+    """
+    Calendrier du problème : horizon, périodes et granularité du temps
+
+    Le temps est compté en unités de granularity_minutes depuis le début de
+    l'horizon (jour 0, minuit). Chaque jour de l'horizon contient les mêmes
+    fenêtres (périodes) ; un cours tient entièrement dans une fenêtre.
+    Sur plusieurs semaines, les jours sont nommés "Lundi S1", "Lundi S2"...
+    et les disponibilités (available_days) s'appliquent chaque semaine.
+    """
+
+    def __init__(
+        self,
+        days: List[str],
+        weeks: int,
+        granularity_minutes: int,
+        periods: List[Dict[str, str]],
+        min_lesson_minutes: int,
+        max_lesson_minutes: int,
+        one_lesson_per_day: bool
+    ):
+        """
+        Args:
+            days: Jours d'une semaine (noms utilisés par available_days)
+            weeks: Nombre de semaines de l'horizon
+            granularity_minutes: Durée d'une unité de temps
+            periods: Fenêtres de chaque jour, {"name", "start": "HH:MM", "end": "HH:MM"}
+            min_lesson_minutes: Durée minimale d'un cours
+            max_lesson_minutes: Durée maximale d'un cours
+            one_lesson_per_day: Au plus un cours par jour et par enseignant
+        """
+        if granularity_minutes <= 0 or (24 * 60) % granularity_minutes:
+            raise ValueError(f"La granularité doit diviser une journée : {granularity_minutes} min")
+        if weeks < 1:
+            raise ValueError(f"Horizon invalide : {weeks} semaine(s)")
+
+        self.week_days = list(days)
+        self.weeks = weeks
+        self.granularity_minutes = granularity_minutes
+        self.one_lesson_per_day = one_lesson_per_day
+        self.units_per_day = 24 * 60 // granularity_minutes
+
+        self.period_names = [period["name"] for period in periods]
+        self.windows = [
+            (self.to_units(_minutes(period["start"])), self.to_units(_minutes(period["end"])))
+            for period in periods
+        ]
+        for (start, end), (next_start, _) in zip(self.windows, self.windows[1:] + [(self.units_per_day, None)]):
+            if not start < end <= next_start:
+                raise ValueError("Les périodes doivent être ordonnées, non vides et sans chevauchement")
+
+        self.min_lesson = self.to_units(min_lesson_minutes)
+        self.max_lesson = self.to_units(max_lesson_minutes)
+        if not 0 < self.min_lesson <= self.max_lesson:
+            raise ValueError("Durées de cours invalides")
+
+        # Jours de l'horizon et jour de la semaine correspondant
+        if weeks == 1:
+            self.days = list(self.week_days)
+        else:
+            self.days = [f"{day} S{week + 1}" for week in range(weeks) for day in self.week_days]
+        self.week_day_index = [j % len(self.week_days) for j in range(len(self.days))]
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'Calendar':
+        """Calendrier du problème (clé "calendar"), complété par DEFAULT_CALENDAR"""
+        options = dict(DEFAULT_CALENDAR, **(data.get('calendar') or {}))
+        return cls(**options)
+
+    def to_units(self, minutes: int) -> int:
+        """Durée en minutes -> unités de temps (multiple exact de la granularité)"""
+        if minutes % self.granularity_minutes:
+            raise ValueError(
+                f"{minutes} min n'est pas un multiple de la granularité ({self.granularity_minutes} min)"
+            )
+        return minutes // self.granularity_minutes
+
+    def hours(self, units: int) -> float:
+        """Unités de temps -> heures (entier si la durée tombe sur l'heure)"""
+        minutes = units * self.granularity_minutes
+        return minutes // 60 if minutes % 60 == 0 else minutes / 60
+
+    def format_time(self, unit: int) -> str:
+        """Unité de temps (depuis le début de l'horizon) -> "HH:MM" dans la journée"""
+        minutes = (unit % self.units_per_day) * self.granularity_minutes
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+    @property
+    def horizon(self) -> int:
+        """Longueur de l'horizon en unités"""
+        return len(self.days) * self.units_per_day
+
+    @property
+    def max_window_hours(self) -> float:
+        """Heures maximales d'un enseignant dans une fenêtre (jour, période)"""
+        longest = max(end - start for start, end in self.windows)
+        return self.hours(min(longest, self.max_lesson) if self.one_lesson_per_day else longest)
+
+    @property
+    def max_day_hours(self) -> float:
+        """Heures maximales d'un enseignant sur une journée"""
+        if self.one_lesson_per_day:
+            return self.max_window_hours
+        return self.hours(sum(end - start for start, end in self.windows))
+
 def extract_constraints_info(data: Dict[str, Any]) -> tuple:
     """
     Extrait les contraintes hard et soft
@@ -65,5 +381,7 @@ if __name__ == "__main__":
     data = load_problem_data()
     teachers, subjects, hours, availability = extract_teachers_info(data)
     hard_const, soft_const = extract_constraints_info(data)
+    index = AvailabilityIndex.from_data(data)
+    print(f"Index des disponibilités : {int(index.slot_counts().sum())} créneaux disponibles")
 
     print("\nDonnées extraites avec succès!")
\ No newline at end of file
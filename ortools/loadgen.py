@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import numpy as np
+from typing import Dict, Any, Optional, Tuple, Union
+
+from generate_problem import generate_problem
+from service import SchedulingService, start_server
+
+# Adresse du service : (hôte, port) en TCP ou chemin d'une socket Unix
+Address = Union[Tuple[str, int], str]
+
+async def http_request(address: Address, method: str, path: str, payload: Optional[Dict] = None) -> Tuple[int, Any]:
+    """
+    Envoie une requête HTTP/1.1 au service et lit sa réponse JSON
+
+    Returns:
+        Tuple (code HTTP, contenu JSON)
+    """
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address)
+        host = "localhost"
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+        host = f"{address[0]}:{address[1]}"
+
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else b""
+    head = (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n")
+    try:
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        length = None
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        content = await (reader.readexactly(length) if length is not None else reader.read())
+    finally:
+        writer.close()
+    return status, json.loads(content) if content else None
+
+async def run_job(
+    address: Address,
+    problem: Dict[str, Any],
+    time_limit_seconds: float,
+    fast_path: bool,
+    cancel_after: Optional[float],
+    counters: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    Soumet une tâche (nouvel essai avec attente croissante si la file est
+    pleine), l'annule éventuellement, puis attend sa fin par attente longue
+
+    Returns:
+        Dictionnaire {state, status, latency, rejections}
+    """
+    payload = {"problem": problem, "time_limit_seconds": time_limit_seconds, "fast_path": fast_path}
+    start = time.perf_counter()
+    rejections = 0
+    delay = 0.05
+    while True:
+        code, response = await http_request(address, "POST", "/jobs", payload)
+        if code != 503:
+            break
+        rejections += 1
+        counters["rejected"] += 1
+        await asyncio.sleep(delay * (0.5 + random.random()))
+        delay = min(delay * 2, 1.0)
+    if code != 202:
+        return {"state": "failed", "status": response.get("error"), "latency": time.perf_counter() - start,
+                "rejections": rejections}
+
+    job_id = response["job_id"]
+    if cancel_after is not None:
+        await asyncio.sleep(cancel_after)
+        await http_request(address, "DELETE", f"/jobs/{job_id}")
+
+    while True:
+        code, status = await http_request(address, "GET", f"/jobs/{job_id}?wait=10")
+        if code != 200 or status["state"] in ("done", "failed", "cancelled"):
+            break
+    return {
+        "state": status.get("state", "failed") if code == 200 else "failed",
+        "status": status.get("status") if code == 200 else status.get("error"),
+        "latency": time.perf_counter() - start,
+        "rejections": rejections
+    }
+
+async def run_load(
+    address: Address,
+    n_jobs: int = 100,
+    concurrency: int = 16,
+    n_teachers: int = 20,
+    time_limit_seconds: float = 10,
+    cancel_rate: float = 0.0,
+    fast_path: bool = True,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Envoie n_jobs problèmes synthétiques au service, concurrency à la fois
+
+    Chaque problème est tiré avec une graine différente ; une proportion
+    cancel_rate des tâches est annulée peu après sa soumission.
+
+    Args:
+        address: Adresse du service
+        n_jobs: Nombre de tâches
+        concurrency: Nombre de clients simultanés
+        n_teachers: Enseignants par problème
+        time_limit_seconds: Limite de temps de chaque tâche
+        cancel_rate: Proportion de tâches annulées
+        fast_path: Résolution directe autorisée (False : toujours CP-SAT)
+        seed: Graine des problèmes et des annulations
+
+    Returns:
+        Dictionnaire {jobs, done, cancelled, failed, rejected, elapsed,
+        throughput, latency_p50, latency_p95, latency_p99, server}
+    """
+    rng = random.Random(seed)
+    problems = [generate_problem(n_teachers, seed=seed + i) for i in range(n_jobs)]
+    cancel_after = [rng.uniform(0, 0.1) if rng.random() < cancel_rate else None for _ in range(n_jobs)]
+
+    counters = {"rejected": 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def client(i: int) -> Dict[str, Any]:
+        async with semaphore:
+            return await run_job(address, problems[i], time_limit_seconds, fast_path, cancel_after[i], counters)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(i) for i in range(n_jobs)))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([result["latency"] for result in results if result["state"] == "done"])
+    report = {
+        "jobs": n_jobs,
+        "done": sum(1 for result in results if result["state"] == "done"),
+        "cancelled": sum(1 for result in results if result["state"] == "cancelled"),
+        "failed": sum(1 for result in results if result["state"] == "failed"),
+        "rejected": counters["rejected"],
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0
+    }
+    if len(latencies):
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        report.update(latency_p50=p50, latency_p95=p95, latency_p99=p99)
+    report["server"] = (await http_request(address, "GET", "/stats"))[1]
+    return report
+
+def print_report(report: Dict[str, Any]):
+    """Affiche le débit et les latences côté client et côté service"""
+    print("\n" + "="*60)
+    print("CHARGE DU SERVICE DE PLANIFICATION")
+    print("="*60)
+    print(f"Tâches : {report['jobs']} ({report['done']} terminées, {report['cancelled']} annulées, "
+          f"{report['failed']} en échec)")
+    print(f"Refus (file pleine) : {report['rejected']}")
+    print(f"Durée : {report['elapsed']:.2f}s, débit : {report['throughput']:.1f} tâches/s")
+    if "latency_p99" in report:
+        print(f"Latence client : p50 {report['latency_p50']*1000:.0f} ms, "
+              f"p95 {report['latency_p95']*1000:.0f} ms, p99 {report['latency_p99']*1000:.0f} ms")
+    server = report.get("server") or {}
+    if "latency_p99" in server:
+        print(f"Latence service : p50 {server['latency_p50']*1000:.0f} ms, "
+              f"p95 {server['latency_p95']*1000:.0f} ms, p99 {server['latency_p99']*1000:.0f} ms "
+              f"({server['workers']} processus)")
+    print("="*60)
+
+async def main(args: argparse.Namespace):
+    """Charge un service existant, ou un service local démarré pour l'occasion"""
+    service = server = None
+    if args.unix:
+        address = args.unix
+    elif args.port:
+        address = (args.host, args.port)
+    else:
+        # Service local sur une socket Unix temporaire
+        address = os.path.join(tempfile.mkdtemp(), "planning.sock")
+        service = SchedulingService(workers=args.workers, queue_size=args.queue_size)
+        print(f"Démarrage d'un service local ({service.workers} processus)...")
+        server = await start_server(service, unix_socket=address)
+
+    try:
+        report = await run_load(
+            address,
+            n_jobs=args.jobs,
+            concurrency=args.concurrency,
+            n_teachers=args.teachers,
+            time_limit_seconds=args.time_limit,
+            cancel_rate=args.cancel_rate,
+            fast_path=not args.no_fast_path,
+            seed=args.seed
+        )
+        print_report(report)
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+            os.remove(address)
+            os.rmdir(os.path.dirname(address))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Générateur de charge du service de planification")
+    parser.add_argument("--host", default="127.0.0.1", help="Hôte du service (avec --port)")
+    parser.add_argument("--port", type=int, default=None, help="Port TCP du service")
+    parser.add_argument("--unix", default=None, metavar="SOCKET", help="Socket Unix du service")
+    parser.add_argument("--jobs", type=int, default=100, help="Nombre de tâches")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients simultanés")
+    parser.add_argument("--teachers", type=int, default=20, help="Enseignants par problème")
+    parser.add_argument("--time-limit", type=float, default=10, help="Limite de temps de chaque tâche (s)")
+    parser.add_argument("--cancel-rate", type=float, default=0.0, help="Proportion de tâches annulées")
+    parser.add_argument("--no-fast-path", action="store_true", help="Toujours résoudre avec CP-SAT")
+    parser.add_argument("--seed", type=int, default=0, help="Graine aléatoire")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processus du service local (sans --port ni --unix)")
+    parser.add_argument("--queue-size", type=int, default=100,
+                        help="File d'attente du service local (sans --port ni --unix)")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -1,66 +1,419 @@
+import os
+import argparse
+from typing import Dict, Any, Optional, Tuple
+from load_problem import load_problem_data, Calendar
+from stream_loader import load_problem_columns
+from validator import validate, print_violations
 from model import SchedulingModel
-from solver import SchedulingSolver
+from interval_model import IntervalSchedulingModel, IntervalSchedulingSolver
+from solver import SchedulingSolver, write_solution
+from model_cache import ModelCache
+from fast_scheduler import FastScheduler
+from soft_constraints import has_preferences
+from columnar import ColumnarSolution
+from solution_io import CSV_LAYOUTS, written_header_matches, to_columnar
+from feasibility import check_feasibility, print_feasibility_report, explain_infeasibility, print_conflict
 from visualize import (
     load_solution,
     create_weekly_grid,
     display_grid_table,
     display_teacher_schedules,
-    validate_solution,
-    export_to_csv
+    export_to_csv,
+    export_html_report
 )
 
-def main():
-    """Script principal pour résoudre le problème de planification"""
+# Fichier de solution écrit pour chaque format de sortie
+OUTPUT_FILES = {"json": "solution.json", "ndjson": "solution.ndjson", "binary": "solution.bin"}
 
-    print("="*80)
-    print("SOLVEUR DE PLANIFICATION D'EMPLOI DU TEMPS")
-    print("Utilisation de Google OR-Tools CP-SAT Solver")
-    print("="*80)
+# Moteurs de modélisation : créneaux fixes (SchedulingModel) ou variables
+# d'intervalle sur le calendrier du problème (IntervalSchedulingModel)
+ENGINES = ["auto", "slots", "interval"]
 
-    # Étape 1: Créer le modèle
-    print("\n[1/4] Création du modèle...")
-    model = SchedulingModel("problem_structure.json")
+def solve_problem(
+    data: Dict[str, Any],
+    supported: bool,
+    reason: str,
+    cache: Optional[ModelCache],
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    stream_file: Optional[str] = None,
+    warm_start_file: Optional[str] = None,
+    disruption_weight: int = 0,
+    compare_cold: bool = False,
+    output_file: str = "solution.json",
+    columns: Optional[Any] = None,
+    engine: str = "slots",
+    soft_time_limit: int = 10,
+    time_limit_seconds: int = 30,
+    search_workers: Optional[int] = None
+) -> Tuple[Optional[ColumnarSolution], str]:
+    """
+    Construit le modèle, résout, puis extrait et sauvegarde la solution
+
+    Args:
+        data: Données du problème
+        supported: Résolution directe (FastScheduler) possible
+        reason: Raison pour laquelle elle ne l'est pas
+        cache: Cache des modèles CP-SAT (None pour toujours reconstruire)
+        output_file: Fichier de solution (format d'après l'extension)
+        columns: Problème chargé en colonnes (lecture en flux), utilisé
+            directement par la résolution directe
+        engine: "slots" (créneaux fixes) ou "interval" (calendrier du problème)
+        soft_time_limit: Limite de temps de chaque étape de préférences
+        (autres arguments : voir main)
+
+    Returns:
+        Tuple (solution, statut) : la solution en colonnes (valeurs des
+        variables, sans dictionnaire intermédiaire pour la suite), ou None
+        si aucune solution n'a été trouvée
+    """
+    if supported:
+        # Famille de contraintes résoluble directement : pas de modèle CP-SAT
+        print("\nRésolution directe possible : le modèle CP-SAT n'est pas construit")
+        solver = FastScheduler.from_columns(columns) if columns is not None else FastScheduler(data)
+        if warm_start_file:
+            print("  (la solution précédente n'est pas nécessaire à la résolution directe : "
+                  "--compare-cold ou --no-fast-path pour le rapport d'indications)")
+    elif engine == "interval":
+        # Un intervalle optionnel par cours : ni cache, ni décomposition, ni démarrage à chaud
+        print("\nMoteur à intervalles : calendrier du problème")
+        solver = IntervalSchedulingSolver(IntervalSchedulingModel(data=data))
+    else:
+        print(f"\nRésolution directe impossible ({reason}) : utilisation de CP-SAT")
+        # En mode parallèle, chaque composante construit son propre sous-modèle
+        model_options = dict(
+            build=not parallel,
+            hint_solution=warm_start_file,
+            disruption_weight=disruption_weight
+        )
+        if cache is not None:
+            model = cache.get_model(data, **model_options)
+        else:
+            model = SchedulingModel(data=data, **model_options)
+        solver = SchedulingSolver(model)
+    if search_workers and not supported:
+        solver.solver.parameters.num_workers = search_workers
 
     # Étape 2: Résoudre
     print("\n[2/4] Résolution du problème...")
-    solver = SchedulingSolver(model)
 
-    success = solver.solve(time_limit_seconds=30)
+    if not supported and (parallel or engine == "interval") and has_preferences(data):
+        print("\n(les préférences ne sont prises en compte que par la résolution monolithique à créneaux fixes)")
+
+    if stream_file and parallel and not supported and engine != "interval":
+        print("\n(le flux de solutions n'est pas écrit par la résolution parallèle par composantes)")
+
+    if supported:
+        success = solver.solve()
+    elif parallel and engine != "interval":
+        success = solver.solve_decomposed(time_limit_seconds=time_limit_seconds, max_workers=max_workers)
+    elif engine == "interval":
+        success = solver.solve(time_limit_seconds=time_limit_seconds, stream=stream_file)
+    else:
+        # Objectif principal puis préférences, par priorité (sans préférence : solve)
+        success = solver.solve_lexicographic(time_limit_seconds=time_limit_seconds,
+                                             stage_time_limit_seconds=soft_time_limit, stream=stream_file)
+        if success and compare_cold and warm_start_file and engine != "interval":
+            solver.compare_cold_start(time_limit_seconds=time_limit_seconds)
 
     if not success:
         print("\n[ÉCHEC] Impossible de trouver une solution.")
-        print("Vérifiez que les contraintes ne sont pas incompatibles.")
-        return
+        if not supported and engine != "interval" and solver.status_name() == "INFEASIBLE":
+            # Identifie les enseignants et contraintes en conflit
+            print_conflict(explain_infeasibility(data))
+        else:
+            print("Vérifiez que les contraintes ne sont pas incompatibles.")
+        return None, solver.status_name()
 
     # Étape 3: Extraire et sauvegarder
     print("\n[3/4] Extraction de la solution...")
-    solution = solver.extract_solution()
-    solver.save_solution("solution.json")
+    # Solution en colonnes : le dictionnaire n'est construit que pour l'écriture JSON
+    columnar = solver.extract_solution(as_dict=False)
+    solver.save_solution(output_file)
     solver.print_statistics()
+    return columnar, solver.status_name()
+
+def main(
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    fast_path: bool = True,
+    stream_file: Optional[str] = None,
+    warm_start_file: Optional[str] = None,
+    disruption_weight: int = 0,
+    compare_cold: bool = False,
+    use_cache: bool = True,
+    output_format: str = "json",
+    stream_load: bool = False,
+    max_pages: Optional[int] = 5,
+    html_dir: Optional[str] = None,
+    csv_file: str = "planning.csv",
+    csv_layout: str = "long",
+    engine: str = "auto",
+    soft_time_limit: int = 10,
+    problem_file: str = "problem_structure.json",
+    output_dir: str = ".",
+    time_limit_seconds: int = 30,
+    search_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Script principal pour résoudre le problème de planification
+
+    Args:
+        parallel: Résout chaque composante indépendante séparément, en parallèle
+        max_workers: Nombre de processus pour la résolution parallèle
+        fast_path: Utilise la résolution directe (FastScheduler) quand le
+            problème le permet, CP-SAT sinon
+        stream_file: Fichier NDJSON recevant chaque solution intermédiaire
+            trouvée par CP-SAT (résolution monolithique uniquement)
+        warm_start_file: Solution précédente (solution.json) servant
+            d'indications à CP-SAT
+        disruption_weight: Pénalité par heure modifiée par rapport à
+            warm_start_file (0 = désactivée, impose CP-SAT)
+        compare_cold: Résout aussi sans indications pour mesurer le gain
+            du démarrage à chaud (impose CP-SAT)
+        use_cache: Réutilise le modèle CP-SAT et la solution optimale déjà
+            calculés pour un problème identique (répertoire .model_cache)
+        output_format: Format du fichier de solution ("json", "ndjson" ou
+            "binary", voir solution_io)
+        stream_load: Lit le problème en flux dans des colonnes compactes
+            (stream_loader), pour les très gros fichiers
+        max_pages: Pages du planning par enseignant affichées dans le
+            terminal au-delà de quelques enseignants (None : toutes)
+        html_dir: Répertoire du rapport HTML (None : pas de rapport)
+        csv_file: Fichier CSV du planning (planning.csv.gz... : compressé)
+        csv_layout: Disposition du CSV ("long" ou "wide", voir solution_io.write_csv)
+        engine: Moteur de modélisation ("auto" : intervalles si le problème
+            définit un calendrier, créneaux fixes sinon)
+        soft_time_limit: Limite de temps (s) de chaque étape de préférences
+            (contraintes souples, résolues par priorité après l'objectif)
+        problem_file: Fichier du problème
+        output_dir: Répertoire des fichiers générés (solution, CSV, rapport HTML)
+        time_limit_seconds: Limite de temps (s) de la résolution
+        search_workers: Threads de recherche CP-SAT (None : tous les cœurs)
+
+    Returns:
+        Résumé de l'exécution : statut, objectif, temps de résolution,
+        validité de la solution et fichiers générés
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, OUTPUT_FILES[output_format])
+    csv_file = os.path.join(output_dir, csv_file)
+    html_dir = os.path.join(output_dir, html_dir) if html_dir else None
+    summary = {"problem_file": problem_file, "status": None, "objective_value": None,
+               "solve_time_seconds": None, "valid": False, "violations": None, "files": []}
+
+    print("="*80)
+    print("SOLVEUR DE PLANIFICATION D'EMPLOI DU TEMPS")
+    print("Utilisation de Google OR-Tools CP-SAT Solver")
+    print("="*80)
+
+    # Étape 1: Créer le modèle
+    print("\n[1/4] Création du modèle...")
+    columns = None
+    if stream_load:
+        # Lecture en flux : colonnes compactes, vérifications faites pendant la lecture
+        columns = load_problem_columns(problem_file)
+        report = columns.feasibility_report()
+        data = None
+        if columns.partial:
+            # Le chargeur en flux ne connaît que les jours de la grille fixe et
+            # écarte les champs d'enseignant non gérés (salle, classes...)
+            print("\nCalendrier ou ressources partagées : lecture complète du problème")
+            columns = None
+    if columns is None:
+        data = load_problem_data(problem_file)
+        # Vérification préalable : rejette instantanément les données impossibles
+        report = check_feasibility(data)
+
+    if engine == "auto":
+        engine = "interval" if (data if data is not None else columns.metadata).get('calendar') else "slots"
+
+    print_feasibility_report(report)
+    if not report["feasible"]:
+        print("\n[ÉCHEC] Impossible de trouver une solution.")
+        summary["status"] = "INFEASIBLE"
+        return summary
+
+    if not fast_path:
+        supported, reason = False, "désactivée"
+    elif engine == "interval":
+        supported, reason = False, "moteur à intervalles"
+    elif columns is not None:
+        supported, reason = FastScheduler.supports_columns(columns)
+    else:
+        supported, reason = FastScheduler.supports(data)
+    if supported and disruption_weight:
+        supported, reason = False, "perturbation minimale demandée"
+    elif supported and stream_file:
+        supported, reason = False, "flux de solutions demandé"
+    elif supported and compare_cold:
+        supported, reason = False, "comparaison avec une résolution à froid demandée"
+
+    if data is None and not supported:
+        # CP-SAT construit son modèle depuis le dictionnaire complet
+        data = columns.to_problem_data()
+
+    # Cache : la solution dépend aussi de la méthode de résolution
+    # (pas de cache en lecture en flux : l'empreinte demande le dictionnaire complet)
+    cache = ModelCache() if use_cache and data is not None and columns is None else None
+    solution_options = {
+        "solver": "direct" if supported else "cp-sat",
+        "parallel": parallel and not supported,
+        "engine": engine
+    }
+    solution = None
+    if cache is not None and not warm_start_file:
+        solution = cache.get_solution(data, solution_options)
+
+    if solution is not None:
+        print("\nSolution optimale déjà calculée pour ce problème : aucune résolution")
+        write_solution(solution, output_file)
+        # Validation, affichage et CSV travaillent sur les colonnes, comme après une résolution
+        solution = to_columnar(solution)
+    else:
+        solution, summary["status"] = solve_problem(
+            data, supported, reason, cache,
+            parallel=parallel,
+            max_workers=max_workers,
+            stream_file=stream_file,
+            warm_start_file=warm_start_file,
+            disruption_weight=disruption_weight,
+            compare_cold=compare_cold,
+            output_file=output_file,
+            columns=columns if supported else None,
+            engine=engine,
+            soft_time_limit=soft_time_limit,
+            time_limit_seconds=time_limit_seconds,
+            search_workers=search_workers
+        )
+        if solution is None:
+            return summary
+        if cache is not None and not warm_start_file:
+            cache.put_solution(data, solution, solution_options)
+
+    if cache is not None:
+        cache.print_statistics()
+
+    header = solution.header()
+    summary.update(
+        status=header.get('status'),
+        objective_value=header.get('objective_value'),
+        solve_time_seconds=header.get('solve_time_seconds'),
+        files=[output_file]
+    )
 
     # Étape 4: Visualiser
     print("\n[4/4] Visualisation de la solution...")
 
-    # Valider
-    is_valid = validate_solution(solution)
+    # Relecture de l'en-tête du fichier écrit (sans relire les enseignants)
+    if not written_header_matches(solution, output_file):
+        print(f"\n[ERREUR] {output_file} ne correspond pas à la solution calculée (en-tête relu)")
+        summary.update(valid=False)
+        return summary
+
+    # Valider contre le problème : toutes les contraintes dures, vectorisées
+    calendar = Calendar.from_data(data) if engine == "interval" else None
+    violations = validate(columns if columns is not None else data, solution, calendar)
+    print_violations(violations)
+    is_valid = violations.empty
+    summary.update(valid=is_valid, violations=len(violations))
 
     if is_valid:
         # Afficher
         grid = create_weekly_grid(solution)
         display_grid_table(grid)
-        display_teacher_schedules(solution)
+        display_teacher_schedules(solution, max_pages=max_pages)
 
         # Exporter
-        export_to_csv(solution, "planning.csv")
+        export_to_csv(solution, csv_file, csv_layout)
+        if html_dir:
+            export_html_report(solution, html_dir)
+        summary["files"] += [csv_file] + ([os.path.join(html_dir, "index.html")] if html_dir else [])
 
         print("\n" + "="*80)
         print("[SUCCÈS] Planification terminée!")
         print("Fichiers générés :")
-        print("  - solution.json : Solution complète au format JSON")
-        print("  - planning.csv : Planning au format CSV")
+        print(f"  - {output_file} : Solution complète au format {output_format}")
+        print(f"  - {csv_file} : Planning au format CSV ({csv_layout})")
+        if html_dir:
+            print(f"  - {html_dir}/index.html : Rapport HTML")
         print("="*80)
     else:
         print("\n[ATTENTION] La solution contient des erreurs.")
+    return summary
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Solveur de planification d'emploi du temps")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Résoudre chaque composante indépendante en parallèle")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus pour --parallel (défaut : nombre de cœurs)")
+    parser.add_argument("--no-fast-path", action="store_true",
+                        help="Toujours utiliser CP-SAT, même si la résolution directe est possible")
+    parser.add_argument("--stream", default=None, metavar="FICHIER",
+                        help="Écrire chaque solution intermédiaire CP-SAT en NDJSON")
+    parser.add_argument("--warm-start", default=None, metavar="SOLUTION",
+                        help="Partir d'une solution précédente (solution.json)")
+    parser.add_argument("--disruption-weight", type=int, default=0,
+                        help="Pénalité par heure modifiée par rapport à --warm-start")
+    parser.add_argument("--compare-cold", action="store_true",
+                        help="Mesurer aussi une résolution sans --warm-start")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignorer le cache des modèles et des solutions")
+    parser.add_argument("--format", choices=list(OUTPUT_FILES), default="json",
+                        help="Format du fichier de solution")
+    parser.add_argument("--stream-load", action="store_true",
+                        help="Lire le problème en flux (très gros fichiers)")
+    parser.add_argument("--max-pages", type=int, default=5,
+                        help="Pages du planning par enseignant affichées (0 : toutes)")
+    parser.add_argument("--csv", default="planning.csv",
+                        help="Fichier CSV du planning (.csv.gz, .csv.bz2, .csv.xz, .csv.zst : compressé)")
+    parser.add_argument("--csv-layout", choices=CSV_LAYOUTS, default="long",
+                        help="Une ligne par créneau (long) ou par enseignant (wide)")
+    parser.add_argument("--html", default=None,
+                        help="Exporter un rapport HTML dans ce répertoire")
+    parser.add_argument("--engine", choices=ENGINES, default="auto",
+                        help="Modèle à créneaux fixes, à intervalles, ou auto (intervalles si le problème a un calendrier)")
+    parser.add_argument("--problem", default="problem_structure.json",
+                        help="Fichier du problème")
+    parser.add_argument("--output-dir", default=".",
+                        help="Répertoire des fichiers générés")
+    parser.add_argument("--time-limit", type=int, default=30,
+                        help="Limite de temps (s) de la résolution")
+    parser.add_argument("--soft-time-limit", type=int, default=10,
+                        help="Limite de temps (s) de chaque étape de préférences (contraintes souples)")
+    parser.add_argument("--search-workers", type=int, default=None,
+                        help="Threads de recherche CP-SAT (défaut : tous les cœurs)")
+    args = parser.parse_args()
+
+    if args.disruption_weight and not args.warm_start:
+        parser.error("--disruption-weight nécessite --warm-start")
+    if args.compare_cold and not args.warm_start:
+        parser.error("--compare-cold nécessite --warm-start")
+    if args.compare_cold and (args.parallel or args.engine == "interval"):
+        parser.error("--compare-cold n'est possible qu'avec la résolution monolithique à créneaux fixes")
+    if args.search_workers is not None and args.search_workers < 1:
+        parser.error("--search-workers doit être au moins 1")
+
+    main(
+        parallel=args.parallel,
+        max_workers=args.workers,
+        fast_path=not args.no_fast_path,
+        stream_file=args.stream,
+        warm_start_file=args.warm_start,
+        disruption_weight=args.disruption_weight,
+        compare_cold=args.compare_cold,
+        use_cache=not args.no_cache,
+        output_format=args.format,
+        stream_load=args.stream_load,
+        max_pages=args.max_pages or None,
+        html_dir=args.html,
+        csv_file=args.csv,
+        csv_layout=args.csv_layout,
+        engine=args.engine,
+        soft_time_limit=args.soft_time_limit,
+        problem_file=args.problem,
+        output_dir=args.output_dir,
+        time_limit_seconds=args.time_limit,
+        search_workers=args.search_workers
+    )
\ No newline at end of file
@@ -1,40 +1,195 @@
 from ortools.sat.python import cp_model
-from load_problem import load_problem_data, extract_teachers_info
-from typing import Dict, List
+from load_problem import (
+    load_problem_data, extract_teachers_info, extract_resources_info,
+    AvailabilityIndex, DAYS, PERIODS, HOURS_PER_SLOT
+)
+import json
+import numpy as np
+from typing import Dict, List, Optional, Any, Union
+
+# Familles de contraintes dures construites par SchedulingModel (noms des
+# littéraux d'hypothèse, voir _guard) ; l'empreinte du cache de modèles en dépend
+HARD_CONSTRAINT_KINDS = (
+    "availability",
+    "hours_required",
+    "one_slot_per_day",
+    "group_overlap",
+    "room_capacity"
+)
+
+def load_previous_solution(solution: Union[str, Dict[str, Any]]) -> Dict[tuple, int]:
+    """
+    Charge une solution précédente (format de save_solution)
+
+    Args:
+        solution: Chemin d'un fichier solution.json ou dictionnaire déjà chargé
+
+    Returns:
+        Dictionnaire {(teacher, day, period): heures} des créneaux non nuls ;
+        chaque enseignant de la solution y figure, au besoin avec (teacher, None, None)
+        quand il n'avait aucun créneau
+    """
+    if isinstance(solution, str):
+        with open(solution, 'r', encoding='utf-8') as f:
+            solution = json.load(f)
+    elif solution and all(isinstance(key, tuple) for key in solution):
+        # Déjà au format {(teacher, day, period): heures} (sous-modèles)
+        return dict(solution)
+
+    previous = {}
+    for teacher in solution.get('teachers', []):
+        previous[(teacher['name'], None, None)] = 0
+        for slot in teacher['time_slots']:
+            previous[(teacher['name'], slot['day'], slot['period'])] = slot['hours']
+    return previous
 
 class SchedulingModel:
     """Modèle de planification d'emploi du temps avec OR-Tools"""
 
-    def __init__(self, problem_file: str = "problem_structure.json"):
+    # Encodages disponibles pour la contrainte "une période maximum par jour"
+    # (variables auxiliaires / contraintes par couple enseignant-jour) :
+    # - reified       : 2 booléens "période utilisée" + 4 contraintes réifiées + 1 (<= 1)
+    # - period_choice : 1 booléen "après-midi choisi" + 2 contraintes linéaires
+    # - at_most_one   : 1 littéral par créneau (x <= 2 * u) + 1 AddAtMostOne
+    DAY_ENCODINGS = ("reified", "period_choice", "at_most_one")
+
+    def __init__(
+        self,
+        problem_file: str = "problem_structure.json",
+        bulk: bool = False,
+        data: Optional[Dict[str, Any]] = None,
+        sparse: bool = False,
+        day_encoding: str = "reified",
+        build: bool = True,
+        track_assumptions: bool = False,
+        hint_solution: Optional[Union[str, Dict[str, Any]]] = None,
+        disruption_weight: int = 0
+    ):
         """
         Initialise le modèle
 
         Args:
             problem_file: Chemin vers le fichier JSON du problème
+            bulk: Construit le modèle en mode "bulk" (indices denses, une seule passe)
+            data: Données du problème déjà chargées (remplace problem_file)
+            sparse: Ne crée les variables que pour les jours disponibles
+            day_encoding: Encodage de la contrainte "une période par jour"
+                ("reified", "period_choice" ou "at_most_one", voir DAY_ENCODINGS)
+            build: Construit le modèle CP-SAT (False pour ne charger que les
+                données, par exemple avant une résolution décomposée)
+            track_assumptions: Conditionne chaque famille de contraintes d'un
+                enseignant à un littéral d'hypothèse (diagnostic d'infaisabilité,
+                voir feasibility.explain_infeasibility). Incompatible avec bulk.
+            hint_solution: Solution précédente (chemin d'un solution.json écrit
+                par save_solution, ou dictionnaire déjà chargé) servant de
+                point de départ à la recherche (AddHint)
+            disruption_weight: Poids de la pénalité "perturbation minimale" :
+                chaque heure modifiée par rapport à hint_solution coûte
+                disruption_weight heures dans l'objectif (0 = désactivée)
         """
+        if day_encoding not in self.DAY_ENCODINGS:
+            raise ValueError(
+                f"Encodage inconnu : {day_encoding} (attendu : {', '.join(self.DAY_ENCODINGS)})"
+            )
+        if track_assumptions and bulk:
+            raise ValueError("track_assumptions n'est pas disponible en mode bulk")
+        if disruption_weight < 0:
+            raise ValueError(f"disruption_weight doit être positif : {disruption_weight}")
+        if disruption_weight and hint_solution is None:
+            raise ValueError("disruption_weight nécessite une solution précédente (hint_solution)")
+
         # Charger les données
-        self.data = load_problem_data(problem_file)
+        self.data = data if data is not None else load_problem_data(problem_file)
         self.teachers, self.subjects, self.hours_required, self.availability = \
             extract_teachers_info(self.data)
+        self.room_capacity, self.room_teachers, self.group_teachers = extract_resources_info(self.data)
 
         # Définir les paramètres du problème
-        self.days = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi"]
-        self.periods = ["matin", "après-midi"]
-        self.hours_per_slot = 2  # Chaque créneau dure 2 heures
+        self.days = list(DAYS)
+        self.periods = list(PERIODS)
+        self.hours_per_slot = HOURS_PER_SLOT  # Chaque créneau dure 2 heures
+
+        # Masques de disponibilité (un entier par enseignant), construits une fois
+        self.availability_index = AvailabilityIndex.from_data(self.data, self.days, self.periods)
 
         # Créer le modèle CP-SAT
         self.model = cp_model.CpModel()
+        self.bulk = bulk
+        self.sparse = sparse
+        self.day_encoding = day_encoding
+
+        # Littéraux d'hypothèse : {(teacher, contrainte): littéral}
+        self.track_assumptions = track_assumptions
+        self.assumption_literals = {}
+
+        # Index denses (teacher_idx, day_idx, period_idx) pour le mode bulk
+        self.teacher_index = {teacher: i for i, teacher in enumerate(self.teachers)}
+        self.day_index = {day: j for j, day in enumerate(self.days)}
+        self.period_index = {period: k for k, period in enumerate(self.periods)}
+
+        # Solution précédente : {(teacher, day, period): heures} et indications posées
+        self.previous_solution = load_previous_solution(hint_solution) if hint_solution is not None else None
+        self.disruption_weight = disruption_weight
+        self.hints = {}
 
         # Variables de décision
         self.slots = {}
+        self.slot_vars = []  # Stockage plat, indexé par slot_position()
+        self.occupied = {}   # Littéraux "créneau occupé" des enseignants partageant une ressource
+        if not build:
+            # Indications calculées sans modèle (rapport d'une résolution décomposée)
+            if self.previous_solution is not None:
+                self.hints = self._hint_values()
+            return
         self.create_variables()
 
+        # Démarrage à chaud depuis la solution précédente
+        if self.previous_solution is not None:
+            self.add_hints()
+
         # Contraintes
         self.add_constraints()
 
         # Objectif
         self.add_objective()
 
+    def build_options(self) -> Dict[str, Any]:
+        """Options de construction, pour reconstruire un sous-modèle équivalent"""
+        return {
+            "bulk": self.bulk,
+            "sparse": self.sparse,
+            "day_encoding": self.day_encoding,
+            "hint_solution": self.previous_solution,
+            "disruption_weight": self.disruption_weight
+        }
+
+    def slot_indices(self) -> np.ndarray:
+        """
+        Indice (dans le proto CP-SAT) de la variable de chaque créneau
+
+        Returns:
+            Tableau (enseignants, jours, périodes), -1 pour un créneau sans variable
+        """
+        indices = np.full((len(self.teachers), len(self.days), len(self.periods)), -1, dtype=np.int64)
+        for (teacher, day, period), var in self.slots.items():
+            indices[self.teacher_index[teacher], self.day_index[day], self.period_index[period]] = var.Index()
+        return indices
+
+    def _guard(self, constraint: cp_model.Constraint, teacher: str, name: str) -> cp_model.Constraint:
+        """
+        Conditionne une contrainte au littéral d'hypothèse (teacher, name)
+
+        Sans effet si track_assumptions est désactivé.
+        """
+        if not self.track_assumptions:
+            return constraint
+
+        literal = self.assumption_literals.get((teacher, name))
+        if literal is None:
+            literal = self.model.NewBoolVar(f"assume_{teacher}_{name}")
+            self.assumption_literals[(teacher, name)] = literal
+        return constraint.OnlyEnforceIf(literal)
+
     def create_variables(self):
         """
         Crée les variables de décision du modèle
@@ -43,11 +198,21 @@ class SchedulingModel:
         - 0 si l'enseignant n'enseigne pas
         - 1 si l'enseignant enseigne 1 heure
         - 2 si l'enseignant enseigne 2 heures
+
+        En mode creux (sparse), seuls les créneaux des jours disponibles
+        ont une variable : self.slots ne contient alors que ces clés.
         """
+        if self.bulk:
+            return self._create_variables_bulk()
+
         print("\nCréation des variables de décision...")
 
+        index = self.availability_index
         for teacher in self.teachers:
-            for day in self.days:
+            mask = index.mask(teacher)
+            for d_idx, day in enumerate(self.days):
+                if self.sparse and not mask & index.day_mask(d_idx):
+                    continue
                 for period in self.periods:
                     var_name = f"{teacher}_{day}_{period}"
                     # Variable entière entre 0 et 2 (0h, 1h, ou 2h)
@@ -55,6 +220,76 @@ class SchedulingModel:
 
         print(f"  {len(self.slots)} variables créées")
 
+    def add_hints(self):
+        """
+        Indique à CP-SAT la solution précédente comme point de départ
+
+        Chaque créneau (teacher, day, period) du modèle reçoit la valeur qu'il
+        avait dans la solution précédente, ou 0 s'il n'y figurait pas. Les
+        enseignants absents de la solution précédente (ajoutés depuis) ne
+        reçoivent aucune indication.
+        """
+        print("\nAjout des indications (solution précédente)...")
+
+        self.hints = self._hint_values(self.slots)
+        for key, hours in self.hints.items():
+            self.model.AddHint(self.slots[key], hours)
+
+        known = {teacher for teacher, _, _ in self.hints}
+        print(f"  {len(self.hints)} indications posées ({len(known)}/{len(self.teachers)} enseignants connus)")
+
+    def _hint_values(self, slots: Optional[Dict[tuple, Any]] = None) -> Dict[tuple, int]:
+        """
+        Valeurs précédentes des créneaux d'enseignants connus de la solution précédente
+
+        Args:
+            slots: Créneaux du modèle construit ; si None, tous les créneaux
+                possibles (jours disponibles seulement en mode creux)
+
+        Returns:
+            Dictionnaire {(teacher, day, period): heures précédentes}
+        """
+        known_teachers = {teacher for teacher, _, _ in self.previous_solution}
+        if slots is None:
+            slots = {
+                (teacher, day, period): None
+                for teacher in self.teachers if teacher in known_teachers
+                for d_idx, day in enumerate(self.days)
+                if not self.sparse or self.availability_index.is_available(teacher, d_idx)
+                for period in self.periods
+            }
+
+        return {
+            key: self.previous_solution.get(key, 0)
+            for key in slots
+            if key[0] in known_teachers
+        }
+
+    def _disruption_penalty(self) -> Optional[cp_model.LinearExpr]:
+        """
+        Terme "perturbation minimale" : heures modifiées par rapport aux indications
+
+        Pour chaque créneau indiqué, d >= |x - valeur précédente| via deux
+        inégalités linéaires ; la pénalisation dans l'objectif rend la borne
+        exacte à l'optimum.
+
+        Returns:
+            disruption_weight x somme des écarts, ou None si désactivé
+        """
+        if not self.disruption_weight or not self.hints:
+            return None
+
+        deviations = []
+        for key, hours in self.hints.items():
+            slot_var = self.slots[key]
+            deviation = self.model.NewIntVar(0, self.hours_per_slot, f"diff_{key[0]}_{key[1]}_{key[2]}")
+            self.model.Add(deviation >= slot_var - hours)
+            self.model.Add(deviation >= hours - slot_var)
+            deviations.append(deviation)
+
+        print(f"  Pénalité de perturbation : {self.disruption_weight} x {len(deviations)} écarts")
+        return self.disruption_weight * cp_model.LinearExpr.Sum(deviations)
+
     def add_constraints(self):
         """Ajoute toutes les contraintes au modèle"""
         print("\nAjout des contraintes...")
@@ -68,20 +303,33 @@ class SchedulingModel:
         # Contrainte 3: Maximum 1 créneau par jour par enseignant
         self.constraint_one_slot_per_day()
 
+        # Contrainte 4: Salles et classes partagées
+        self.constraint_shared_resources()
+
     def constraint_availability(self):
         """
         Contrainte: Un enseignant ne peut enseigner que les jours où il est disponible
         """
+        if self.bulk:
+            return self._constraint_availability_bulk()
+
         print("  [1] Contrainte de disponibilité...")
 
+        if self.sparse:
+            # Les créneaux indisponibles n'ont pas de variable : rien à interdire
+            print("      0 créneaux interdits (mode creux)")
+            return
+
+        index = self.availability_index
         count = 0
         for teacher in self.teachers:
-            available_days = self.availability[teacher]
-            for day in self.days:
-                if day not in available_days:
+            mask = index.mask(teacher)
+            for d_idx, day in enumerate(self.days):
+                if not mask & index.day_mask(d_idx):
                     # Interdire tous les créneaux de ce jour
                     for period in self.periods:
-                        self.model.Add(self.slots[(teacher, day, period)] == 0)
+                        self._guard(self.model.Add(self.slots[(teacher, day, period)] == 0),
+                                    teacher, "availability")
                         count += 1
 
         print(f"      {count} créneaux interdits")
@@ -90,6 +338,9 @@ class SchedulingModel:
         """
         Contrainte: Chaque enseignant doit atteindre exactement son nombre d'heures requis
         """
+        if self.bulk:
+            return self._constraint_hours_required_bulk()
+
         print("  [2] Contrainte d'heures requises...")
 
         for teacher in self.teachers:
@@ -100,10 +351,11 @@ class SchedulingModel:
             hours_assigned = []
             for day in self.days:
                 for period in self.periods:
-                    hours_assigned.append(self.slots[(teacher, day, period)])
+                    if (teacher, day, period) in self.slots:
+                        hours_assigned.append(self.slots[(teacher, day, period)])
 
             # Contrainte d'égalité : total des heures doit être exactement celui requis
-            self.model.Add(sum(hours_assigned) == hours_needed)
+            self._guard(self.model.Add(sum(hours_assigned) == hours_needed), teacher, "hours_required")
 
         print(f"      {len(self.teachers)} contraintes d'heures")
 
@@ -112,11 +364,20 @@ class SchedulingModel:
         Contrainte: Chaque enseignant ne peut donner qu'une seule période par jour
         (soit matin, soit après-midi, pas les deux)
         """
+        if self.day_encoding != "reified":
+            return self._constraint_one_slot_per_day_compact()
+
+        if self.bulk:
+            return self._constraint_one_slot_per_day_bulk()
+
         print("  [3] Contrainte une période maximum par jour...")
 
         count = 0
         for teacher in self.teachers:
             for day in self.days:
+                if (teacher, day, "matin") not in self.slots:
+                    continue
+
                 # Au maximum 1 période par jour (matin OU après-midi)
                 # On utilise des variables booléennes pour indiquer si une période est utilisée
                 morning_used = self.model.NewBoolVar(f"{teacher}_{day}_morning_used")
@@ -131,11 +392,127 @@ class SchedulingModel:
                 self.model.Add(self.slots[(teacher, day, "après-midi")] == 0).OnlyEnforceIf(afternoon_used.Not())
                 
                 # Au plus une période utilisée par jour
-                self.model.Add(morning_used + afternoon_used <= 1)
+                self._guard(self.model.Add(morning_used + afternoon_used <= 1),
+                            teacher, "one_slot_per_day")
                 count += 1
 
         print(f"      {count} contraintes jour/enseignant")
 
+    def _constraint_one_slot_per_day_compact(self):
+        """
+        Variante compacte de la contrainte "une période maximum par jour"
+
+        - period_choice : un booléen c par jour, c = 0 autorise le matin,
+          c = 1 autorise l'après-midi (matin + 2c <= 2, après-midi - 2c <= 0)
+        - at_most_one : un littéral u par créneau (x <= 2u) et AddAtMostOne(u)
+
+        Aucune contrainte réifiée : le lien avec les heures est linéaire.
+        """
+        print(f"  [3] Contrainte une période maximum par jour ({self.day_encoding})...")
+
+        max_hours = self.hours_per_slot
+        morning_period, afternoon_period = self.periods
+
+        count = 0
+        for teacher in self.teachers:
+            for day in self.days:
+                morning = self.slots.get((teacher, day, morning_period))
+                if morning is None:
+                    continue
+                afternoon = self.slots[(teacher, day, afternoon_period)]
+
+                if self.day_encoding == "period_choice":
+                    afternoon_chosen = self.model.NewBoolVar(f"{teacher}_{day}_afternoon_chosen")
+                    for ct in (
+                        self.model.AddLinearConstraint(morning + max_hours * afternoon_chosen, 0, max_hours),
+                        self.model.AddLinearConstraint(afternoon - max_hours * afternoon_chosen, -max_hours, 0)
+                    ):
+                        self._guard(ct, teacher, "one_slot_per_day")
+                else:
+                    morning_used = self.model.NewBoolVar(f"{teacher}_{day}_morning_used")
+                    afternoon_used = self.model.NewBoolVar(f"{teacher}_{day}_afternoon_used")
+                    self.model.AddLinearConstraint(morning - max_hours * morning_used, -max_hours, 0)
+                    self.model.AddLinearConstraint(afternoon - max_hours * afternoon_used, -max_hours, 0)
+                    if self.track_assumptions:
+                        # AddAtMostOne n'accepte pas de littéral d'hypothèse (_guard)
+                        constraint = self.model.Add(morning_used + afternoon_used <= 1)
+                    else:
+                        constraint = self.model.AddAtMostOne([morning_used, afternoon_used])
+                    self._guard(constraint, teacher, "one_slot_per_day")
+                count += 1
+
+        print(f"      {count} contraintes jour/enseignant")
+
+    def _occupied_literal(self, teacher: str, d_idx: int, period: str) -> Optional[cp_model.IntVar]:
+        """
+        Littéral "créneau occupé" d'un enseignant (x <= 2 * o), créé une fois
+
+        Returns:
+            Le littéral, ou None si le créneau ne peut pas être occupé (jour
+            non disponible)
+        """
+        day = self.days[d_idx]
+        key = (teacher, day, period)
+        literal = self.occupied.get(key)
+        if literal is None:
+            slot_var = self.slots.get(key)
+            if slot_var is None or not self.availability_index.is_available(teacher, d_idx):
+                return None
+            literal = self.model.NewBoolVar(f"{teacher}_{day}_{period}_occupe")
+            self.model.Add(slot_var <= self.hours_per_slot * literal)
+            self.occupied[key] = literal
+        return literal
+
+    def constraint_shared_resources(self):
+        """
+        Contrainte: Les salles et les classes sont partagées entre enseignants
+
+        - une classe ne suit qu'un cours à la fois : AddAtMostOne sur les
+          littéraux "occupé" de ses enseignants, par créneau
+        - une salle accueille au plus "capacité" cours à la fois : somme des
+          littéraux <= capacité par créneau (AddAtMostOne si elle vaut 1)
+
+        Une seule contrainte par (ressource, créneau), quel que soit le
+        nombre d'enseignants : la taille du modèle reste linéaire, sans
+        contrainte par couple d'enseignants en conflit. Les ressources qui
+        ne peuvent pas être saturées (moins d'enseignants que de places) ne
+        génèrent aucune contrainte.
+        """
+        resources = [
+            (f"classe {group}", "group_overlap", teachers, 1)
+            for group, teachers in self.group_teachers.items()
+        ] + [
+            (f"salle {room}", "room_capacity", teachers, self.room_capacity[room])
+            for room, teachers in self.room_teachers.items()
+        ]
+        if not resources:
+            return
+
+        print("  [4] Contrainte des salles et classes partagées...")
+
+        count = 0
+        for owner, name, teachers, capacity in resources:
+            if len(teachers) <= capacity:
+                continue
+            for d_idx in range(len(self.days)):
+                for period in self.periods:
+                    literals = [
+                        literal for literal in (
+                            self._occupied_literal(teacher, d_idx, period) for teacher in teachers
+                        ) if literal is not None
+                    ]
+                    if len(literals) <= capacity:
+                        continue
+                    if capacity == 1 and not self.track_assumptions:
+                        # AddAtMostOne n'accepte pas de littéral d'hypothèse (_guard)
+                        constraint = self.model.AddAtMostOne(literals)
+                    else:
+                        constraint = self.model.Add(cp_model.LinearExpr.Sum(literals) <= capacity)
+                    self._guard(constraint, owner, name)
+                    count += 1
+
+        print(f"      {count} contraintes ressource/créneau, {len(self.occupied)} littéraux d'occupation")
+
     def add_objective(self):
         """
         Fonction objectif: Maximiser l'utilisation des heures d'enseignement
@@ -143,6 +520,9 @@ class SchedulingModel:
         On cherche à assigner le maximum d'heures possible aux enseignants
         tout en respectant leurs disponibilités et les contraintes.
         """
+        if self.bulk:
+            return self._add_objective_bulk()
+
         print("\nDéfinition de l'objectif...")
         
         objective_type = self.data['objective']['type']
@@ -151,21 +531,190 @@ class SchedulingModel:
         total_hours_assigned = []
         
         for teacher in self.teachers:
-            available_days = self.availability[teacher]
-            
-            for day in available_days:
+            for d_idx in self.availability_index.available_day_indices(teacher):
+                day = self.days[d_idx]
                 for period in self.periods:
                     # Ajouter les heures de chaque slot (0, 1 ou 2 heures)
-                    slot_var = self.slots[(teacher, day, period)]
-                    total_hours_assigned.append(slot_var)
+                    slot_var = self.slots.get((teacher, day, period))
+                    if slot_var is not None:
+                        total_hours_assigned.append(slot_var)
         
         # Maximiser le nombre total d'heures utilisées
+        penalty = self._disruption_penalty()
         if objective_type == "maximize":
-            self.model.Maximize(sum(total_hours_assigned))
+            total = sum(total_hours_assigned)
+            self.model.Maximize(total if penalty is None else total - penalty)
             print("  Objectif défini: maximiser le nombre d'heures d'enseignement assignées")
         elif objective_type == "minimize":
             # Optionnel: garder l'ancienne logique de compacité si besoin
-            self.model.Minimize(sum(total_hours_assigned))
+            total = sum(total_hours_assigned)
+            self.model.Minimize(total if penalty is None else total + penalty)
+            print("  Objectif défini: minimiser le nombre d'heures utilisées")
+
+    # ------------------------------------------------------------------
+    # Construction "bulk"
+    #
+    # Même modèle que la construction classique, mais construit à partir
+    # d'indices denses (teacher_idx, day_idx, period_idx) sur un stockage
+    # plat des variables. Les contraintes élémentaires (une par créneau ou
+    # par jour) sont écrites directement dans le proto CP-SAT, ce qui évite
+    # de créer une expression Python intermédiaire par contrainte.
+    # ------------------------------------------------------------------
+
+    def slot_position(self, teacher_idx: int, day_idx: int, period_idx: int) -> int:
+        """Position d'un créneau dans le stockage plat self.slot_vars"""
+        return (teacher_idx * len(self.days) + day_idx) * len(self.periods) + period_idx
+
+    def _available_day_indices(self, teacher: str) -> List[int]:
+        """Indices des jours disponibles d'un enseignant (jours inconnus ignorés)"""
+        return self.availability_index.available_day_indices(teacher)
+
+    def _create_variables_bulk(self):
+        """Crée toutes les variables en une passe dans un tableau plat"""
+        print("\nCréation des variables de décision...")
+
+        new_int_var = self.model.NewIntVar
+        if self.sparse:
+            # None pour les créneaux des jours non disponibles
+            index = self.availability_index
+            self.slot_vars = []
+            for teacher in self.teachers:
+                mask = index.mask(teacher)
+                for d_idx, day in enumerate(self.days):
+                    available = mask & index.day_mask(d_idx)
+                    for period in self.periods:
+                        self.slot_vars.append(
+                            new_int_var(0, 2, f"{teacher}_{day}_{period}")
+                            if available else None
+                        )
+        else:
+            self.slot_vars = [
+                new_int_var(0, 2, f"{teacher}_{day}_{period}")
+                for teacher in self.teachers
+                for day in self.days
+                for period in self.periods
+            ]
+        keys = (
+            (teacher, day, period)
+            for teacher in self.teachers
+            for day in self.days
+            for period in self.periods
+        )
+        self.slots = {key: var for key, var in zip(keys, self.slot_vars) if var is not None}
+
+        print(f"  {len(self.slots)} variables créées")
+
+    def _constraint_availability_bulk(self):
+        """Fixe à 0 les créneaux des jours non disponibles (écriture directe du proto)"""
+        print("  [1] Contrainte de disponibilité...")
+
+        if self.sparse:
+            print("      0 créneaux interdits (mode creux)")
+            return
+
+        n_days, n_periods = len(self.days), len(self.periods)
+        constraints = self.model.Proto().constraints
+        slot_vars = self.slot_vars
+
+        index = self.availability_index
+        count = 0
+        for t_idx, teacher in enumerate(self.teachers):
+            mask = index.mask(teacher)
+            for d_idx in range(n_days):
+                if mask & index.day_mask(d_idx):
+                    continue
+                base = (t_idx * n_days + d_idx) * n_periods
+                for pos in range(base, base + n_periods):
+                    linear = constraints.add().linear
+                    linear.vars.append(slot_vars[pos].Index())
+                    linear.coeffs.append(1)
+                    linear.domain.extend((0, 0))
+                    count += 1
+
+        print(f"      {count} créneaux interdits")
+
+    def _constraint_hours_required_bulk(self):
+        """Une contrainte linéaire LinearExpr.Sum(...) == heures par enseignant"""
+        print("  [2] Contrainte d'heures requises...")
+
+        width = len(self.days) * len(self.periods)
+        add_linear = self.model.AddLinearConstraint
+        for t_idx, teacher in enumerate(self.teachers):
+            hours_needed = self.hours_required[teacher]
+            teacher_vars = [
+                var for var in self.slot_vars[t_idx * width:(t_idx + 1) * width]
+                if var is not None
+            ]
+            add_linear(cp_model.LinearExpr.Sum(teacher_vars), hours_needed, hours_needed)
+
+        print(f"      {len(self.teachers)} contraintes d'heures")
+
+    def _constraint_one_slot_per_day_bulk(self):
+        """Même encodage réifié que la version classique, écrit directement dans le proto"""
+        print("  [3] Contrainte une période maximum par jour...")
+
+        new_bool_var = self.model.NewBoolVar
+        constraints = self.model.Proto().constraints
+        slot_vars = self.slot_vars
+        n_periods = len(self.periods)
+
+        count = 0
+        pos = 0
+        for teacher in self.teachers:
+            for day in self.days:
+                if slot_vars[pos] is None:
+                    pos += n_periods
+                    continue
+                morning = slot_vars[pos].Index()
+                afternoon = slot_vars[pos + 1].Index()
+                pos += n_periods
+
+                morning_used = new_bool_var(f"{teacher}_{day}_morning_used").Index()
+                afternoon_used = new_bool_var(f"{teacher}_{day}_afternoon_used").Index()
+
+                for slot, used in ((morning, morning_used), (afternoon, afternoon_used)):
+                    # used => slot > 0
+                    ct = constraints.add()
+                    ct.enforcement_literal.append(used)
+                    ct.linear.vars.append(slot)
+                    ct.linear.coeffs.append(1)
+                    ct.linear.domain.extend((1, cp_model.INT_MAX))
+                    # not(used) => slot == 0
+                    ct = constraints.add()
+                    ct.enforcement_literal.append(-used - 1)
+                    ct.linear.vars.append(slot)
+                    ct.linear.coeffs.append(1)
+                    ct.linear.domain.extend((0, 0))
+
+                # morning_used + afternoon_used <= 1
+                linear = constraints.add().linear
+                linear.vars.extend((morning_used, afternoon_used))
+                linear.coeffs.extend((1, 1))
+                linear.domain.extend((cp_model.INT_MIN, 1))
+                count += 1
+
+        print(f"      {count} contraintes jour/enseignant")
+
+    def _add_objective_bulk(self):
+        """Objectif construit en une passe avec LinearExpr.Sum"""
+        print("\nDéfinition de l'objectif...")
+
+        objective_type = self.data['objective']['type']
+        n_periods = len(self.periods)
+
+        total_hours_assigned = []
+        for t_idx, teacher in enumerate(self.teachers):
+            for d_idx in self._available_day_indices(teacher):
+                base = self.slot_position(t_idx, d_idx, 0)
+                total_hours_assigned.extend(self.slot_vars[base:base + n_periods])
+
+        total = cp_model.LinearExpr.Sum(total_hours_assigned)
+        penalty = self._disruption_penalty()
+        if objective_type == "maximize":
+            self.model.Maximize(total if penalty is None else total - penalty)
+            print("  Objectif défini: maximiser le nombre d'heures d'enseignement assignées")
+        elif objective_type == "minimize":
+            self.model.Minimize(total if penalty is None else total + penalty)
             print("  Objectif défini: minimiser le nombre d'heures utilisées")
 
 if __name__ == "__main__":
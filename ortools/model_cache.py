@@ -0,0 +1,357 @@
+import io
+import os
+import json
+import time
+import hashlib
+import inspect
+import contextlib
+from typing import Dict, List, Optional, Any, Union
+
+from model import SchedulingModel, HARD_CONSTRAINT_KINDS
+from soft_constraints import SOFT_CONSTRAINT_KINDS
+from columnar import ColumnarSolution
+
+# Version du format des entrées : à incrémenter si la construction du modèle
+# change sans changer ses options ni ses familles de contraintes (encodage...),
+# pour invalider l'ancien cache
+CACHE_VERSION = 2
+
+# Familles de contraintes prises en compte par le modèle : en ajouter une
+# change l'empreinte de tous les problèmes (pas de réutilisation d'un modèle
+# ou d'une solution construits sans elle)
+CONSTRAINT_KINDS = {
+    "hard": list(HARD_CONSTRAINT_KINDS),
+    "soft": sorted(SOFT_CONSTRAINT_KINDS)
+}
+
+def canonical_json(data: Any) -> str:
+    """
+    Forme canonique d'une structure JSON (clés triées, séparateurs compacts)
+
+    Deux chargements du même problème, quel que soit l'ordre des clés ou
+    l'indentation du fichier, donnent la même chaîne.
+    """
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+def problem_hash(data: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Empreinte SHA-256 d'un problème, des options de construction du modèle
+    et des familles de contraintes qu'il sait construire (CONSTRAINT_KINDS)
+
+    Args:
+        data: Données du problème
+        options: Options de SchedulingModel (bulk, sparse, day_encoding...)
+
+    Returns:
+        Empreinte hexadécimale
+    """
+    payload = {
+        "version": CACHE_VERSION,
+        "constraints": CONSTRAINT_KINDS,
+        "problem": data,
+        "options": options or {}
+    }
+    return hashlib.sha256(canonical_json(payload).encode("utf-8")).hexdigest()
+
+def model_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Options de SchedulingModel complétées par leurs valeurs par défaut
+
+    SchedulingModel(data=data) et SchedulingModel(data=data, sparse=False)
+    construisent le même modèle : ils doivent avoir la même empreinte.
+    """
+    parameters = inspect.signature(SchedulingModel.__init__).parameters
+    normalized = {
+        name: parameter.default
+        for name, parameter in parameters.items()
+        if name not in ("self", "problem_file", "data", "build")
+    }
+    normalized.update((name, value) for name, value in options.items() if name != "build")
+    return normalized
+
+def _write_atomic(path: str, content: bytes):
+    """Écrit un fichier via un fichier temporaire (jamais d'entrée à moitié écrite)"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+class ModelCache:
+    """
+    Cache disque à deux niveaux, indexé par l'empreinte canonique du problème
+
+    - niveau "models" : proto CP-SAT sérialisé + correspondance créneau ->
+      indice de variable, rechargés à la place d'une reconstruction
+    - niveau "solutions" : solution optimale (format de save_solution),
+      renvoyée sans résolution pour une requête identique
+
+    Chaque niveau est borné en octets et évincé du moins récemment utilisé
+    (LRU). L'index et les statistiques de succès/échecs sont persistés dans
+    index.json.
+    """
+
+    LEVELS = ("models", "solutions")
+
+    def __init__(
+        self,
+        cache_dir: str = ".model_cache",
+        max_model_bytes: int = 512 * 1024 * 1024,
+        max_solution_bytes: int = 128 * 1024 * 1024
+    ):
+        """
+        Initialise le cache
+
+        Args:
+            cache_dir: Répertoire du cache (créé au besoin)
+            max_model_bytes: Taille maximale du niveau "models"
+            max_solution_bytes: Taille maximale du niveau "solutions"
+        """
+        self.cache_dir = cache_dir
+        self.limits = {"models": max_model_bytes, "solutions": max_solution_bytes}
+        self.index_file = os.path.join(cache_dir, "index.json")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Any]:
+        empty = {
+            "entries": {level: {} for level in self.LEVELS},
+            "stats": {level: {"hits": 0, "misses": 0, "evictions": 0} for level in self.LEVELS}
+        }
+        if not os.path.exists(self.index_file):
+            return empty
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            # Index illisible : on repart d'un cache vide
+            return empty
+        for key, value in empty.items():
+            index.setdefault(key, value)
+        return index
+
+    def _save_index(self):
+        _write_atomic(self.index_file, json.dumps(self.index, indent=2).encode("utf-8"))
+
+    def _paths(self, level: str, key: str) -> List[str]:
+        """Fichiers d'une entrée du cache"""
+        if level == "models":
+            return [
+                os.path.join(self.cache_dir, f"{key}.pb"),
+                os.path.join(self.cache_dir, f"{key}.slots.json")
+            ]
+        return [os.path.join(self.cache_dir, f"{key}.solution.json")]
+
+    def _lookup(self, level: str, key: str) -> bool:
+        """Enregistre un succès (et l'utilisation) ou un échec sur un niveau"""
+        entry = self.index["entries"][level].get(key)
+        found = entry is not None and all(os.path.exists(path) for path in self._paths(level, key))
+        if found:
+            entry["last_used"] = time.time()
+            self.index["stats"][level]["hits"] += 1
+        else:
+            self.index["entries"][level].pop(key, None)
+            self.index["stats"][level]["misses"] += 1
+        self._save_index()
+        return found
+
+    def _store(self, level: str, key: str, contents: List[bytes]):
+        """Écrit une entrée puis évince les plus anciennes au-delà de la limite"""
+        if sum(len(content) for content in contents) > self.limits[level]:
+            # Entrée plus grande que le niveau entier : inutile de l'écrire
+            return
+        for path, content in zip(self._paths(level, key), contents):
+            _write_atomic(path, content)
+        self.index["entries"][level][key] = {
+            "size": sum(len(content) for content in contents),
+            "last_used": time.time()
+        }
+        self._evict(level)
+        self._save_index()
+
+    def _evict(self, level: str):
+        entries = self.index["entries"][level]
+        total = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.limits[level]:
+                break
+            total -= entries.pop(key)["size"]
+            for path in self._paths(level, key):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.index["stats"][level]["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # Niveau 1 : modèles
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def cacheable(options: Dict[str, Any]) -> bool:
+        """
+        Indique si un modèle construit avec ces options peut être mis en cache
+
+        Les indications (démarrage à chaud) et les littéraux d'hypothèse
+        dépendent de l'exécution, et build=False ne construit pas de modèle :
+        ces cas passent toujours par SchedulingModel.
+        """
+        return (
+            options.get("build", True)
+            and options.get("hint_solution") is None
+            and not options.get("track_assumptions")
+        )
+
+    def get_model(self, data: Dict[str, Any], **options) -> SchedulingModel:
+        """
+        Renvoie le modèle du problème, rechargé du cache ou construit puis mis en cache
+
+        Args:
+            data: Données du problème
+            **options: Options de SchedulingModel
+
+        Returns:
+            Instance de SchedulingModel prête à résoudre
+        """
+        if not self.cacheable(options):
+            return SchedulingModel(data=data, **options)
+
+        options = model_options(options)
+        key = problem_hash(data, options)
+        if self._lookup("models", key):
+            print("\nModèle chargé depuis le cache")
+            return self._load_model(key, data, options)
+
+        scheduling_model = SchedulingModel(data=data, **options)
+        slots = [
+            [teacher, day, period, var.Index()]
+            for (teacher, day, period), var in scheduling_model.slots.items()
+        ]
+        self._store("models", key, [
+            scheduling_model.model.Proto().SerializeToString(),
+            json.dumps(slots, ensure_ascii=False).encode("utf-8")
+        ])
+        return scheduling_model
+
+    def _load_model(self, key: str, data: Dict[str, Any], options: Dict[str, Any]) -> SchedulingModel:
+        """Recrée un SchedulingModel à partir du proto et de la correspondance des créneaux"""
+        proto_path, slots_path = self._paths("models", key)
+
+        # Données et index seulement : le modèle CP-SAT vient du cache
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduling_model = SchedulingModel(data=data, build=False, **options)
+
+        model = scheduling_model.model
+        with open(proto_path, 'rb') as f:
+            model.Proto().ParseFromString(f.read())
+        model.rebuild_var_and_constant_map()
+
+        with open(slots_path, 'r', encoding='utf-8') as f:
+            slots = json.load(f)
+        scheduling_model.slots = {
+            (teacher, day, period): model.GetIntVarFromProtoIndex(index)
+            for teacher, day, period, index in slots
+        }
+        if scheduling_model.bulk:
+            n_slots = len(scheduling_model.teachers) * len(scheduling_model.days) * len(scheduling_model.periods)
+            scheduling_model.slot_vars = [None] * n_slots
+            for (teacher, day, period), var in scheduling_model.slots.items():
+                position = scheduling_model.slot_position(
+                    scheduling_model.teacher_index[teacher],
+                    scheduling_model.day_index[day],
+                    scheduling_model.period_index[period]
+                )
+                scheduling_model.slot_vars[position] = var
+
+        print(f"  {len(model.Proto().variables)} variables, "
+              f"{len(model.Proto().constraints)} contraintes rechargées")
+        return scheduling_model
+
+    # ------------------------------------------------------------------
+    # Niveau 2 : solutions
+    # ------------------------------------------------------------------
+
+    def get_solution(self, data: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
+        """
+        Renvoie la solution déjà calculée pour ce problème, ou None
+
+        Args:
+            data: Données du problème
+            options: Options influençant la solution (encodage, perturbation...)
+        """
+        key = problem_hash(data, options)
+        if not self._lookup("solutions", key):
+            return None
+        with open(self._paths("solutions", key)[0], 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def put_solution(
+        self,
+        data: Dict[str, Any],
+        solution: Union[Dict, ColumnarSolution],
+        options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Met en cache une solution optimale (dictionnaire ou solution en colonnes)
+
+        Les solutions non prouvées optimales ne sont pas conservées : une
+        nouvelle résolution pourrait les améliorer.
+        """
+        if isinstance(solution, ColumnarSolution):
+            if solution.status != "OPTIMAL":
+                return
+            solution = solution.to_dict()
+        if solution is None or solution.get("status") != "OPTIMAL":
+            return
+        key = problem_hash(data, options)
+        self._store("solutions", key, [json.dumps(solution, indent=2, ensure_ascii=False).encode("utf-8")])
+
+    # ------------------------------------------------------------------
+    # Statistiques
+    # ------------------------------------------------------------------
+
+    def statistics(self) -> Dict[str, Dict[str, int]]:
+        """Succès, échecs, évictions, entrées et taille de chaque niveau"""
+        stats = {}
+        for level in self.LEVELS:
+            entries = self.index["entries"][level]
+            stats[level] = dict(
+                self.index["stats"][level],
+                entries=len(entries),
+                bytes=sum(entry["size"] for entry in entries.values())
+            )
+        return stats
+
+    def print_statistics(self):
+        """Affiche les statistiques du cache"""
+        print("\n" + "="*60)
+        print("CACHE")
+        print("="*60)
+        for level, stats in self.statistics().items():
+            lookups = stats["hits"] + stats["misses"]
+            rate = 100 * stats["hits"] / lookups if lookups else 0
+            print(f"{level:<10}: {stats['hits']} succès / {stats['misses']} échecs ({rate:.0f}%), "
+                  f"{stats['entries']} entrées, {stats['bytes'] / 1024:.1f} Ko, "
+                  f"{stats['evictions']} évictions")
+        print("="*60)
+
+    def clear(self):
+        """Vide le cache (entrées et statistiques)"""
+        for level in self.LEVELS:
+            for key in list(self.index["entries"][level]):
+                for path in self._paths(level, key):
+                    if os.path.exists(path):
+                        os.remove(path)
+        if os.path.exists(self.index_file):
+            os.remove(self.index_file)
+        self.index = self._load_index()
+
+if __name__ == "__main__":
+    from load_problem import load_problem_data
+
+    data = load_problem_data()
+    cache = ModelCache()
+
+    for attempt in range(2):
+        start = time.perf_counter()
+        scheduling_model = cache.get_model(data)
+        print(f"Tentative {attempt + 1} : {time.perf_counter() - start:.3f}s")
+
+    cache.print_statistics()
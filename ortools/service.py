@@ -0,0 +1,498 @@
+import io
+import os
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import threading
+import contextlib
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+from ortools.sat.python import cp_model
+from typing import Dict, List, Any, Optional, Tuple
+
+from model import SchedulingModel
+from solver import SchedulingSolver
+from interval_model import IntervalSchedulingModel, IntervalSchedulingSolver
+from fast_scheduler import FastScheduler
+from feasibility import check_feasibility
+
+# Limites de temps d'une tâche (secondes) : par défaut et maximum accepté
+DEFAULT_TIME_LIMIT = 30
+MAX_TIME_LIMIT = 300
+
+# États d'une tâche ; les trois derniers sont définitifs
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+FINAL_STATES = ("done", "failed", "cancelled")
+
+# Taille maximale du corps d'une requête HTTP (octets)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+HTTP_REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"
+}
+
+def _warm_up():
+    """Initialise un processus du pool : bibliothèque CP-SAT chargée par un premier modèle"""
+    model = cp_model.CpModel()
+    x = model.NewBoolVar("x")
+    model.Maximize(x)
+    cp_model.CpSolver().Solve(model)
+
+def _ping() -> int:
+    """Tâche vide : force le démarrage d'un processus du pool"""
+    return os.getpid()
+
+def _watch_cancellation(cancel_event: Any, done: threading.Event, solver: SchedulingSolver, poll_seconds: float = 0.05):
+    """Thread du processus de calcul : StopSearch dès que la tâche est annulée"""
+    while not done.is_set():
+        if cancel_event.wait(poll_seconds):
+            solver.stop_search()
+            return
+
+def solve_job(
+    data: Dict[str, Any],
+    time_limit_seconds: float,
+    soft_time_limit: float,
+    fast_path: bool = True,
+    cancel_event: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Résout un problème dans un processus du pool (même choix de moteur que main)
+
+    Les traces de construction et de résolution sont masquées. Un thread
+    surveille l'événement d'annulation et interrompt CP-SAT (stop_search) :
+    la meilleure solution déjà trouvée est alors renvoyée.
+
+    Args:
+        data: Données du problème (format de problem_structure.json)
+        time_limit_seconds: Limite de temps de la résolution
+        soft_time_limit: Limite de temps de chaque étape de préférences
+        fast_path: Résolution directe (FastScheduler) quand le problème le permet
+        cancel_event: Événement partagé (multiprocessing.Manager().Event())
+
+    Returns:
+        Dictionnaire {status, objective_value, solver, engine, build_time,
+        solve_time, cancelled, diagnostics, solution}
+    """
+    start = time.perf_counter()
+    engine = "interval" if data.get('calendar') else "slots"
+    result = {"status": "UNKNOWN", "objective_value": None, "solver": "cp-sat", "engine": engine,
+              "build_time": 0.0, "solve_time": 0.0, "cancelled": False, "diagnostics": [], "solution": None}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = check_feasibility(data)
+        if not report["feasible"]:
+            # Rejet immédiat, sans modèle
+            result.update(status="INFEASIBLE", diagnostics=report["diagnostics"])
+            return result
+
+        supported = fast_path and engine == "slots" and FastScheduler.supports(data)[0]
+        if supported:
+            solver = FastScheduler(data)
+            result["solver"] = "direct"
+        elif engine == "interval":
+            solver = IntervalSchedulingSolver(IntervalSchedulingModel(data=data))
+        else:
+            solver = SchedulingSolver(SchedulingModel(data=data))
+        result["build_time"] = time.perf_counter() - start
+
+        done = threading.Event()
+        if not supported and cancel_event is not None:
+            threading.Thread(target=_watch_cancellation, args=(cancel_event, done, solver), daemon=True).start()
+        solve_start = time.perf_counter()
+        try:
+            if cancel_event is not None and cancel_event.is_set():
+                success = False
+            elif supported:
+                success = solver.solve()
+            elif engine == "interval":
+                success = solver.solve(time_limit_seconds=time_limit_seconds)
+            else:
+                success = solver.solve_lexicographic(time_limit_seconds, stage_time_limit_seconds=soft_time_limit)
+        finally:
+            done.set()
+        result["solve_time"] = time.perf_counter() - solve_start
+        columnar = solver.extract_columnar() if success else None
+
+    result["cancelled"] = cancel_event is not None and cancel_event.is_set()
+    result["status"] = solver.status_name()
+    if columnar is not None:
+        result["objective_value"] = solver.objective_value()
+        result["solution"] = columnar.to_dict()
+    return result
+
+class SchedulingService:
+    """
+    Service de planification asynchrone : file d'attente et pool de processus
+
+    Les tâches soumises attendent dans une file bornée (refus immédiat quand
+    elle est pleine) ; un répartiteur par processus les envoie au pool de
+    processus de calcul, démarrés et préchauffés (imports, CP-SAT chargé)
+    au lancement du service. Une tâche en attente est annulée sans calcul,
+    une tâche en cours est interrompue par StopSearch.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: int = 100,
+        max_time_limit: float = MAX_TIME_LIMIT,
+        soft_time_limit: float = 10,
+        keep_finished: int = 1000
+    ):
+        """
+        Args:
+            workers: Nombre de processus de calcul (par défaut : nombre de cœurs)
+            queue_size: Nombre maximal de tâches en attente
+            max_time_limit: Limite de temps maximale acceptée pour une tâche
+            soft_time_limit: Limite de temps de chaque étape de préférences
+            keep_finished: Nombre de tâches terminées conservées (état et solution)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.max_time_limit = max_time_limit
+        self.soft_time_limit = soft_time_limit
+        self.keep_finished = keep_finished
+
+        self.jobs: Dict[str, Dict[str, Any]] = OrderedDict()
+        self.queue: Optional[asyncio.Queue] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.manager = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._finished = deque()
+
+        # Statistiques : latences (soumission -> fin) des dernières tâches terminées
+        self.started_at = None
+        self.counts = {state: 0 for state in FINAL_STATES}
+        self.rejected = 0
+        self.latencies = deque(maxlen=10000)
+
+    async def start(self):
+        """Démarre et préchauffe les processus de calcul, puis les répartiteurs"""
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.manager = multiprocessing.Manager()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _ping) for _ in range(self.workers)))
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        self.started_at = time.perf_counter()
+
+    async def close(self):
+        """Annule les tâches en cours et arrête les processus"""
+        for job in self.jobs.values():
+            if job["state"] in ("queued", "running"):
+                self.cancel(job["id"])
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        if self.manager is not None:
+            self.manager.shutdown()
+
+    def submit(
+        self,
+        data: Dict[str, Any],
+        time_limit_seconds: Optional[float] = None,
+        fast_path: bool = True
+    ) -> Optional[str]:
+        """
+        Ajoute une tâche à la file d'attente
+
+        Args:
+            data: Données du problème
+            time_limit_seconds: Limite de temps de la tâche (bornée par max_time_limit)
+            fast_path: Résolution directe autorisée
+
+        Returns:
+            Identifiant de la tâche, ou None si la file est pleine
+
+        Raises:
+            ValueError: Si le problème ou la limite de temps sont invalides
+        """
+        if not isinstance(data, dict) or not isinstance(data.get('teachers'), list):
+            raise ValueError("problème invalide : liste 'teachers' attendue")
+        time_limit_seconds = DEFAULT_TIME_LIMIT if time_limit_seconds is None else float(time_limit_seconds)
+        if time_limit_seconds <= 0:
+            raise ValueError(f"time_limit_seconds doit être positif : {time_limit_seconds}")
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "state": "queued",
+            "data": data,
+            "time_limit_seconds": min(time_limit_seconds, self.max_time_limit),
+            "fast_path": fast_path,
+            "submitted_at": time.perf_counter(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "cancel_event": None,
+            "done": asyncio.Event()
+        }
+        try:
+            self.queue.put_nowait(job["id"])
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return None
+        self.jobs[job["id"]] = job
+        return job["id"]
+
+    async def _dispatch(self):
+        """Répartiteur : une tâche à la fois vers le pool de processus"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id = await self.queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job["state"] != "queued":
+                continue  # Annulée pendant l'attente
+
+            job["state"] = "running"
+            job["started_at"] = time.perf_counter()
+            job["cancel_event"] = self.manager.Event()
+            try:
+                result = await loop.run_in_executor(
+                    self.executor, solve_job, job.pop("data"), job["time_limit_seconds"],
+                    self.soft_time_limit, job["fast_path"], job["cancel_event"]
+                )
+            except Exception as error:
+                self._finish(job, "failed", error=f"{type(error).__name__}: {error}")
+            else:
+                self._finish(job, "cancelled" if result["cancelled"] else "done", result=result)
+
+    def _finish(self, job: Dict[str, Any], state: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Termine une tâche : état, statistiques, réveil des attentes, éviction des plus anciennes"""
+        job.update(state=state, result=result, error=error, finished_at=time.perf_counter(), cancel_event=None)
+        job.pop("data", None)
+        job["done"].set()
+        self.counts[state] += 1
+        if state == "done":
+            self.latencies.append(job["finished_at"] - job["submitted_at"])
+
+        self._finished.append(job["id"])
+        while len(self._finished) > self.keep_finished:
+            self.jobs.pop(self._finished.popleft(), None)
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Annule une tâche (en attente : retirée ; en cours : StopSearch)
+
+        Returns:
+            État de la tâche après la demande, ou None si elle est inconnue
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if job["state"] == "queued":
+            self._finish(job, "cancelled")
+        elif job["state"] == "running":
+            job["cancel_event"].set()  # L'état passe à "cancelled" à la fin du calcul
+        return job["state"]
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """État d'une tâche (sans la solution), ou None si elle est inconnue"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+
+        now = time.perf_counter()
+        status = {
+            "job_id": job_id,
+            "state": job["state"],
+            "time_limit_seconds": job["time_limit_seconds"],
+            "queued_seconds": (job["started_at"] or job["finished_at"] or now) - job["submitted_at"],
+            "running_seconds": ((job["finished_at"] or now) - job["started_at"]) if job["started_at"] else 0.0,
+            "error": job["error"]
+        }
+        if job["result"] is not None:
+            status.update({key: value for key, value in job["result"].items() if key != "solution"})
+        return status
+
+    def solution(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Solution d'une tâche terminée (format de solution.json), ou None"""
+        job = self.jobs.get(job_id)
+        if job is None or job["result"] is None:
+            return None
+        return job["result"]["solution"]
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Attend la fin d'une tâche au plus timeout secondes, puis renvoie son état"""
+        job = self.jobs.get(job_id)
+        if job is not None and timeout > 0:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(job["done"].wait(), timeout)
+        return self.status(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Débit (tâches terminées par seconde) et percentiles de latence"""
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        stats = {
+            "workers": self.workers,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "running": sum(1 for job in self.jobs.values() if job["state"] == "running"),
+            **self.counts,
+            "rejected": self.rejected,
+            "uptime_seconds": elapsed,
+            "throughput": self.counts["done"] / elapsed if elapsed > 0 else 0.0
+        }
+        if self.latencies:
+            p50, p95, p99 = np.percentile(np.fromiter(self.latencies, dtype=np.float64), [50, 95, 99])
+            stats.update(latency_p50=p50, latency_p95=p95, latency_p99=p99)
+        return stats
+
+async def route(service: SchedulingService, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+    """
+    Aiguille une requête HTTP vers le service
+
+    POST /jobs                  soumet {"problem": ..., "time_limit_seconds": ..., "fast_path": ...}
+    GET /jobs/<id>[?wait=s]     état de la tâche (attente de la fin au plus s secondes)
+    GET /jobs/<id>/solution     solution d'une tâche terminée
+    DELETE /jobs/<id>           annulation
+    GET /stats                  débit et latences
+
+    Returns:
+        Tuple (code HTTP, contenu JSON)
+    """
+    url = urlsplit(target)
+    parts = [part for part in url.path.split('/') if part]
+
+    if parts == ["jobs"]:
+        if method != "POST":
+            return 405, {"error": "POST attendu"}
+        payload = json.loads(body or b"{}")
+        job_id = service.submit(
+            payload.get('problem'),
+            payload.get('time_limit_seconds'),
+            fast_path=payload.get('fast_path', True)
+        )
+        if job_id is None:
+            return 503, {"error": "file d'attente pleine", "queue_size": service.queue_size}
+        return 202, {"job_id": job_id, "state": "queued"}
+
+    if parts == ["stats"] and method == "GET":
+        return 200, service.stats()
+
+    if len(parts) in (2, 3) and parts[0] == "jobs":
+        job_id = parts[1]
+        if len(parts) == 3:
+            if parts[2] != "solution" or method != "GET":
+                return 404, {"error": f"ressource inconnue : {url.path}"}
+            status = service.status(job_id)
+            if status is None:
+                return 404, {"error": f"tâche inconnue : {job_id}"}
+            if status["state"] not in FINAL_STATES:
+                return 409, {"error": "tâche non terminée", "state": status["state"]}
+            return 200, service.solution(job_id)
+        if method == "GET":
+            wait = float(parse_qs(url.query).get('wait', ['0'])[0])
+            status = await service.wait(job_id, min(wait, service.max_time_limit))
+        elif method == "DELETE":
+            status = service.status(job_id) if service.cancel(job_id) is not None else None
+        else:
+            return 405, {"error": "GET ou DELETE attendu"}
+        if status is None:
+            return 404, {"error": f"tâche inconnue : {job_id}"}
+        return 200, status
+
+    return 404, {"error": f"ressource inconnue : {url.path}"}
+
+async def handle_connection(service: SchedulingService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Une requête HTTP/1.1 par connexion (Connection: close), réponses JSON"""
+    try:
+        request_line = (await reader.readline()).decode('latin-1')
+        if not request_line.strip():
+            return
+        method, target, _ = request_line.split(' ', 2)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY_BYTES:
+            status, payload = 413, {"error": f"corps limité à {MAX_BODY_BYTES} octets"}
+        else:
+            body = await reader.readexactly(length) if length else b""
+            status, payload = await route(service, method.upper(), target, body)
+    except (ValueError, TypeError, json.JSONDecodeError) as error:
+        status, payload = 400, {"error": str(error)}
+    except asyncio.IncompleteReadError:
+        return
+    except Exception as error:
+        status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+
+    try:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                + ("Retry-After: 1\r\n" if status == 503 else "")
+                + "Connection: close\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+    finally:
+        writer.close()
+
+async def start_server(
+    service: SchedulingService,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    unix_socket: Optional[str] = None
+) -> asyncio.AbstractServer:
+    """Démarre le service puis le serveur HTTP (TCP, ou socket Unix si unix_socket est donné)"""
+    await service.start()
+
+    async def handler(reader, writer):
+        await handle_connection(service, reader, writer)
+
+    if unix_socket:
+        return await asyncio.start_unix_server(handler, path=unix_socket)
+    return await asyncio.start_server(handler, host=host, port=port)
+
+async def serve(args: argparse.Namespace):
+    """Lance le service jusqu'à interruption (Ctrl+C)"""
+    service = SchedulingService(
+        workers=args.workers,
+        queue_size=args.queue_size,
+        max_time_limit=args.max_time_limit,
+        soft_time_limit=args.soft_time_limit
+    )
+    server = await start_server(service, args.host, args.port, args.unix)
+    address = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Service de planification : {address} ({service.workers} processus, file de {service.queue_size} tâches)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Service de planification asynchrone (HTTP, JSON)")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute TCP")
+    parser.add_argument("--port", type=int, default=8080, help="Port d'écoute TCP")
+    parser.add_argument("--unix", default=None, metavar="SOCKET",
+                        help="Écouter sur une socket Unix plutôt qu'en TCP")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus de calcul (défaut : nombre de cœurs)")
+    parser.add_argument("--queue-size", type=int, default=100,
+                        help="Tâches en attente au-delà desquelles les soumissions sont refusées (503)")
+    parser.add_argument("--max-time-limit", type=float, default=MAX_TIME_LIMIT,
+                        help="Limite de temps maximale d'une tâche (s)")
+    parser.add_argument("--soft-time-limit", type=float, default=10,
+                        help="Limite de temps (s) de chaque étape de préférences")
+    args = parser.parse_args()
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args))
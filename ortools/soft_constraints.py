@@ -0,0 +1,179 @@
+from ortools.sat.python import cp_model
+from typing import Dict, List, Any, Optional, Tuple
+
+# Familles de contraintes souples reconnues : chaque créneau utilisé hors de
+# la préférence de l'enseignant coûte "weight" (champ du problème, 1 par défaut)
+SOFT_CONSTRAINT_KINDS = {
+    "preferred_days": "créneau un jour non préféré (preferred_days)",
+    "preferred_periods": "créneau sur une période non préférée (preferred_periods)"
+}
+
+# Mots-clés reconnaissant la famille d'une contrainte sans champ "kind" ;
+# les périodes d'abord ("demi-journée" contient "jour")
+KIND_KEYWORDS = [
+    ("preferred_periods", ("période", "matin", "après-midi", "demi-journée")),
+    ("preferred_days", ("jour",))
+]
+
+def constraint_kind(constraint: Dict[str, Any]) -> Optional[str]:
+    """
+    Famille d'une contrainte souple : champ "kind", sinon déduite de la description
+
+    Returns:
+        Clé de SOFT_CONSTRAINT_KINDS, ou None si la contrainte n'est pas reconnue
+    """
+    kind = constraint.get('kind')
+    if kind:
+        return kind if kind in SOFT_CONSTRAINT_KINDS else None
+    description = constraint.get('description', '').lower()
+    for kind, keywords in KIND_KEYWORDS:
+        if any(keyword in description for keyword in keywords):
+            return kind
+    return None
+
+def soft_stages(data: Dict[str, Any]) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Contraintes souples reconnues, regroupées par priorité
+
+    Les contraintes de même priorité forment une seule étape (somme pondérée
+    de leurs pénalités) ; les étapes sont résolues par priorité croissante.
+
+    Returns:
+        Liste de (priorité, contraintes de l'étape), chaque contrainte
+        complétée de sa famille ("kind")
+    """
+    stages = {}
+    for constraint in data.get('constraints', []):
+        if constraint.get('type') != 'soft':
+            continue
+        kind = constraint_kind(constraint)
+        if kind is None:
+            print(f"  Contrainte souple [{constraint.get('id')}] non reconnue, ignorée : {constraint.get('description')}")
+            continue
+        stages.setdefault(constraint.get('priority', 1), []).append(dict(constraint, kind=kind))
+    return sorted(stages.items(), key=lambda item: item[0])
+
+def has_preferences(data: Dict[str, Any], stages: Optional[List[Tuple[int, List[Dict[str, Any]]]]] = None) -> bool:
+    """Indique si une contrainte souple reconnue porte sur une préférence renseignée"""
+    kinds = {constraint['kind'] for _, constraints in (stages if stages is not None else soft_stages(data))
+             for constraint in constraints}
+    return any(teacher.get(kind) for teacher in data['teachers'] for kind in kinds)
+
+class PenaltyBuilder:
+    """
+    Littéraux de pénalité des préférences, ajoutés à une copie du modèle CP-SAT
+
+    Un littéral "occupé" par créneau hors préférence (x <= 2 * o), créé une
+    fois et partagé entre les contraintes ; minimiser la somme pondérée des
+    littéraux revient à minimiser les créneaux utilisés hors préférence.
+    Le modèle de départ (éventuellement rechargé du cache) n'est pas modifié.
+    """
+
+    def __init__(self, model: cp_model.CpModel, scheduling_model: Any):
+        """
+        Args:
+            model: Copie du modèle CP-SAT (CpModel.Clone()) recevant les littéraux
+            scheduling_model: SchedulingModel d'origine (créneaux et données)
+        """
+        self.model = model
+        self.scheduling_model = scheduling_model
+        self.occupied: Dict[tuple, int] = {}   # (teacher, day, period) -> indice du littéral
+        self.slot_of: Dict[int, int] = {}      # indice du littéral -> indice du créneau
+
+    def _literal(self, key: tuple) -> Optional[int]:
+        """Indice du littéral "occupé" d'un créneau (None si le créneau n'a pas de variable)"""
+        index = self.occupied.get(key)
+        if index is None:
+            slot_var = self.scheduling_model.slots.get(key)
+            if slot_var is None:
+                return None
+            slot = self.model.GetIntVarFromProtoIndex(slot_var.Index())
+            literal = self.model.NewBoolVar(f"{key[0]}_{key[1]}_{key[2]}_hors_preference")
+            self.model.Add(slot <= self.scheduling_model.hours_per_slot * literal)
+            index = self.occupied[key] = literal.Index()
+            self.slot_of[index] = slot_var.Index()
+        return index
+
+    def _outside_slots(self, teacher: Dict[str, Any], kind: str) -> List[tuple]:
+        """Créneaux disponibles d'un enseignant hors de sa préférence (aucun sans préférence)"""
+        scheduling_model = self.scheduling_model
+        preferred = set(teacher.get(kind) or [])
+        if not preferred:
+            return []
+        name = teacher['name']
+        slots = []
+        for d_idx in scheduling_model.availability_index.available_day_indices(name):
+            day = scheduling_model.days[d_idx]
+            for period in scheduling_model.periods:
+                if (kind == "preferred_days" and day not in preferred) or \
+                        (kind == "preferred_periods" and period not in preferred):
+                    slots.append((name, day, period))
+        return slots
+
+    def penalties(self, constraints: List[Dict[str, Any]]) -> Dict[int, int]:
+        """
+        Termes de pénalité d'une étape
+
+        Returns:
+            Dictionnaire {indice du littéral: poids cumulé}
+        """
+        terms: Dict[int, int] = {}
+        for constraint in constraints:
+            weight = constraint.get('weight', 1)
+            for teacher in self.scheduling_model.data['teachers']:
+                for key in self._outside_slots(teacher, constraint['kind']):
+                    index = self._literal(key)
+                    if index is not None:
+                        terms[index] = terms.get(index, 0) + weight
+        return terms
+
+    def hint_values(self, values: List[int]) -> List[int]:
+        """Valeurs de toutes les variables de la copie : solution précédente + littéraux déduits"""
+        values = list(values)
+        n_values = len(values)
+        for index in range(n_values, len(self.model.Proto().variables)):
+            slot = self.slot_of.get(index)
+            values.append(int(slot is not None and values[slot] > 0))
+        return values
+
+def fix_objective(model: cp_model.CpModel, value: float):
+    """
+    Fige l'objectif courant du modèle à la valeur atteinte (contrainte linéaire)
+
+    L'objectif du proto est toujours une minimisation de
+    (somme + offset) x scaling_factor, la maximisation étant stockée avec
+    un facteur -1 : la contrainte somme <= valeur / facteur - offset
+    conserve donc l'optimum de l'étape, quel que soit son sens.
+    """
+    objective = model.Proto().objective
+    scale = objective.scaling_factor or 1
+    bound = round(value / scale - objective.offset)
+    linear = model.Proto().constraints.add().linear
+    linear.vars.extend(objective.vars)
+    linear.coeffs.extend(objective.coeffs)
+    linear.domain.extend((cp_model.INT_MIN, bound))
+
+def set_penalty_objective(model: cp_model.CpModel, terms: Dict[int, int]):
+    """Remplace l'objectif par la minimisation de la somme pondérée des pénalités"""
+    objective = model.Proto().objective
+    objective.Clear()
+    objective.vars.extend(terms.keys())
+    objective.coeffs.extend(terms.values())
+
+def set_hint(model: cp_model.CpModel, values: List[int]):
+    """Indique une solution complète (une valeur par variable) comme point de départ"""
+    model.ClearHints()
+    hint = model.Proto().solution_hint
+    hint.vars.extend(range(len(values)))
+    hint.values.extend(values)
+
+if __name__ == "__main__":
+    from load_problem import load_problem_data
+
+    data = load_problem_data()
+    for priority, constraints in soft_stages(data):
+        print(f"\nÉtape de priorité {priority} :")
+        for constraint in constraints:
+            preferences = sum(1 for teacher in data['teachers'] if teacher.get(constraint['kind']))
+            print(f"  [{constraint['id']}] {SOFT_CONSTRAINT_KINDS[constraint['kind']]}, "
+                  f"poids {constraint.get('weight', 1)}, {preferences} enseignant(s) avec préférence")
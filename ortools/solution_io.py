@@ -0,0 +1,494 @@
+import os
+import csv
+import bz2
+import gzip
+import lzma
+import json
+import struct
+import itertools
+import numpy as np
+from collections import abc
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union, TextIO
+
+try:
+    from compression import zstd
+except ImportError:  # zstd n'est dans la bibliothèque standard qu'à partir de Python 3.14
+    zstd = None
+
+from load_problem import DAYS, PERIODS
+from columnar import ColumnarSolution
+
+# Formats de sortie d'une solution :
+# - json   : dictionnaire complet, indenté (format historique de solution.json)
+# - ndjson : une ligne d'en-tête puis un enseignant par ligne, écrit au fil de l'eau
+# - binary : format en colonnes (tableau des heures + tables de chaînes), mappable en mémoire
+SOLUTION_FORMATS = ("json", "ndjson", "binary")
+
+FORMAT_EXTENSIONS = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".bin": "binary"
+}
+
+# Export CSV : disposition "long" (une ligne par créneau utilisé) ou "wide"
+# (une ligne par enseignant, une colonne par jour x période), compression
+# déduite de l'extension (planning.csv.gz...)
+CSV_LAYOUTS = ("long", "wide")
+CSV_COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+CSV_CHUNK_TEACHERS = 10000
+
+# En-tête du format binaire : magie, version, longueur de l'en-tête JSON
+BINARY_MAGIC = b"SCHEDSOL"
+BINARY_VERSION = 1
+_PREFIX = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+def solution_format(path: str) -> str:
+    """Format d'un fichier de solution d'après son extension (json par défaut)"""
+    return FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower(), "json")
+
+def solution_axes(solution: Any) -> Tuple[List[str], List[str]]:
+    """
+    Jours et périodes d'une solution
+
+    Un dictionnaire ne les contient que si le problème a son propre
+    calendrier (moteur à intervalles) : la grille fixe sinon.
+    """
+    if isinstance(solution, dict):
+        return list(solution.get('days', DAYS)), list(solution.get('periods', PERIODS))
+    return list(getattr(solution, 'days', DAYS)), list(getattr(solution, 'periods', PERIODS))
+
+def to_columnar(solution: Union[Dict, ColumnarSolution]) -> ColumnarSolution:
+    """Forme en colonnes d'une solution (dictionnaire ou déjà en colonnes)"""
+    if isinstance(solution, ColumnarSolution):
+        return solution
+    return ColumnarSolution.from_dict(solution, *solution_axes(solution))
+
+# ----------------------------------------------------------------------
+# Tables de chaînes
+# ----------------------------------------------------------------------
+
+class StringTable(abc.Sequence):
+    """
+    Séquence de chaînes stockée en un bloc UTF-8 et un tableau de décalages
+
+    Le bloc et les décalages peuvent être mappés en mémoire : une chaîne
+    n'est décodée que lorsqu'elle est lue.
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def encode(cls, strings: abc.Sequence) -> 'StringTable':
+        encoded = [string.encode("utf-8") for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+class CategoricalStrings(abc.Sequence):
+    """Séquence de chaînes répétées : un code entier par élément et une table des valeurs"""
+
+    def __init__(self, codes: np.ndarray, categories: List[str]):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def encode(cls, strings: abc.Sequence) -> 'CategoricalStrings':
+        categories = {}
+        codes = np.fromiter(
+            (categories.setdefault(string, len(categories)) for string in strings),
+            dtype=np.int32, count=len(strings)
+        )
+        return cls(codes, list(categories))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.categories[code] for code in self.codes[index].tolist()]
+        return self.categories[self.codes[index]]
+
+# ----------------------------------------------------------------------
+# NDJSON
+# ----------------------------------------------------------------------
+
+def write_ndjson(solution: Union[Dict, ColumnarSolution], output_file: str):
+    """
+    Écrit une solution en NDJSON : une ligne d'en-tête, puis un enseignant par ligne
+
+    Les lignes sont produites au fil de l'eau (ColumnarSolution.iter_teachers),
+    sans construire la liste complète des enseignants.
+    """
+    if isinstance(solution, ColumnarSolution):
+        header, teachers = solution.header(), solution.iter_teachers()
+    else:
+        header = {key: value for key, value in solution.items() if key != 'teachers'}
+        teachers = iter(solution['teachers'])
+    days, periods = solution_axes(solution)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(dict(header, days=days, periods=periods), ensure_ascii=False) + "\n")
+        for teacher in teachers:
+            f.write(json.dumps(teacher, ensure_ascii=False) + "\n")
+
+class NdjsonSolution:
+    """
+    Solution NDJSON lue paresseusement
+
+    L'en-tête est lu à l'ouverture ; chaque itération relit le fichier ligne
+    par ligne, sans jamais charger tous les enseignants.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'r', encoding='utf-8') as f:
+            self.header = json.loads(f.readline())
+        self.days = self.header.get('days', DAYS)
+        self.periods = self.header.get('periods', PERIODS)
+
+    def __getitem__(self, key: str) -> Any:
+        # Accès de type dictionnaire : solution['teachers'] reste un itérable paresseux
+        if key == 'teachers':
+            return self
+        return self.header[key]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            f.readline()
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+# ----------------------------------------------------------------------
+# Format binaire en colonnes
+# ----------------------------------------------------------------------
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+def hours_dtype(hours: np.ndarray) -> np.dtype:
+    """
+    Type le plus compact représentant exactement les heures d'une solution
+
+    Les heures sont entières sur la grille fixe, mais peuvent être
+    fractionnaires avec le moteur à intervalles (durées en minutes / 60) :
+    elles sont alors conservées en flottants.
+    """
+    if hours.size == 0:
+        return np.dtype(np.int8)
+    if np.issubdtype(hours.dtype, np.floating) and not np.array_equal(hours, np.round(hours)):
+        return np.dtype(np.float64)
+    if -128 <= hours.min() and hours.max() < 128:
+        return np.dtype(np.int8)
+    return np.dtype(np.int32)
+
+def write_binary(solution: Union[Dict, ColumnarSolution], output_file: str):
+    """
+    Écrit une solution au format binaire en colonnes
+
+    Disposition du fichier :
+    - préfixe : magie "SCHEDSOL", version (uint32), longueur de l'en-tête (uint32)
+    - en-tête JSON : métadonnées, jours, périodes, table des matières et,
+      pour chaque tableau, type, forme et décalage
+    - tableaux bruts alignés sur 64 octets : heures (enseignant x jour x
+      période, entières ou flottantes, voir hours_dtype), heures requises,
+      codes de matière, noms (bloc UTF-8 + décalages)
+    """
+    columnar = to_columnar(solution)
+    hours = np.asarray(columnar.hours)
+    names = columnar.teachers if isinstance(columnar.teachers, StringTable) else StringTable.encode(columnar.teachers)
+    subjects = (columnar.subjects if isinstance(columnar.subjects, CategoricalStrings)
+                else CategoricalStrings.encode(columnar.subjects))
+
+    arrays = {
+        "hours": np.ascontiguousarray(hours, dtype=hours_dtype(hours)),
+        "hours_required": np.ascontiguousarray(columnar.hours_required, dtype=np.int32),
+        "subject_codes": np.ascontiguousarray(subjects.codes, dtype=np.int32),
+        "name_offsets": np.ascontiguousarray(names.offsets, dtype=np.int64),
+        "names": np.ascontiguousarray(names.blob, dtype=np.uint8)
+    }
+
+    if not np.array_equal(arrays["hours"], hours):
+        raise ValueError("Heures non représentables exactement dans le format binaire")
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+
+    header = dict(
+        columnar.header(),
+        days=list(columnar.days),
+        periods=list(columnar.periods),
+        subjects=subjects.categories,
+        arrays=layout
+    )
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header_bytes))
+
+    with open(output_file, 'wb') as f:
+        f.write(_PREFIX.pack(BINARY_MAGIC, BINARY_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+
+def read_binary(path: str, mmap: bool = True) -> ColumnarSolution:
+    """
+    Lit une solution au format binaire
+
+    Args:
+        path: Fichier écrit par write_binary
+        mmap: Mappe les tableaux en mémoire (np.memmap) au lieu de les charger
+
+    Returns:
+        ColumnarSolution dont les tableaux et les noms sont lus à la demande
+    """
+    with open(path, 'rb') as f:
+        magic, version, header_length = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{path} n'est pas une solution binaire")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Version de solution binaire non gérée : {version}")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    data_start = _align(_PREFIX.size + header_length)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        shape = tuple(spec["shape"])
+        dtype = np.dtype(spec["dtype"])
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.zeros(shape, dtype=dtype)
+        elif mmap:
+            arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=data_start + spec["offset"], shape=shape)
+        else:
+            arrays[name] = np.fromfile(path, dtype=dtype, count=int(np.prod(shape)),
+                                       offset=data_start + spec["offset"]).reshape(shape)
+
+    return ColumnarSolution(
+        header["problem_name"],
+        header["status"],
+        header["objective_value"],
+        header["solve_time_seconds"],
+        StringTable(arrays["names"], arrays["name_offsets"]),
+        CategoricalStrings(arrays["subject_codes"], header["subjects"]),
+        arrays["hours_required"],
+        arrays["hours"],
+        header["days"],
+        header["periods"]
+    )
+
+# ----------------------------------------------------------------------
+# Export CSV
+# ----------------------------------------------------------------------
+
+def csv_compression(path: str) -> Optional[str]:
+    """Compression d'un fichier CSV d'après son extension (None : non compressé)"""
+    return CSV_COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+
+def _open_text(path: str, compression: Optional[str]) -> TextIO:
+    """Ouvre un fichier texte en écriture, compressé à la volée si demandé"""
+    options = dict(newline='', encoding='utf-8')
+    if compression is None:
+        return open(path, 'w', **options)
+    if compression == "gzip":
+        # Niveau 6 (celui de zlib) : le niveau 9 par défaut de gzip est bien plus lent
+        return gzip.open(path, 'wt', compresslevel=6, **options)
+    if compression == "bz2":
+        return bz2.open(path, 'wt', **options)
+    if compression == "xz":
+        return lzma.open(path, 'wt', **options)
+    if compression == "zstd":
+        if zstd is None:
+            raise ValueError("Compression zstd indisponible (Python 3.14 ou plus requis)")
+        return zstd.open(path, 'wt', **options)
+    raise ValueError(
+        f"Compression inconnue : {compression} (attendu : {', '.join(CSV_COMPRESSIONS.values())})"
+    )
+
+def _csv_header(layout: str, days: List[str], periods: List[str]) -> List[str]:
+    if layout == "wide":
+        return (['Enseignant', 'Matière', 'Heures requises', 'Heures assignées']
+                + [f"{day} {period}" for day in days for period in periods])
+    return ['Enseignant', 'Matière', 'Jour', 'Période', 'Heures']
+
+def _csv_chunks_columnar(solution: ColumnarSolution, layout: str, chunk_size: int) -> Iterator[List[tuple]]:
+    """Lignes CSV par blocs d'enseignants, lues directement dans le tableau des heures"""
+    days, periods = solution.days, solution.periods
+    for start in range(0, len(solution), chunk_size):
+        end = min(start + chunk_size, len(solution))
+        block = np.asarray(solution.hours[start:end])
+        names = solution.teachers[start:end]
+        subjects = solution.subjects[start:end]
+
+        if layout == "wide":
+            yield list(zip(
+                names, subjects,
+                solution.hours_required[start:end].tolist(),
+                block.sum(axis=(1, 2)).tolist(),
+                *block.reshape(len(block), -1).T.tolist()
+            ))
+            continue
+
+        # Créneaux non nuls du bloc uniquement
+        t, d, p = np.nonzero(block)
+        rows = t.tolist()
+        yield list(zip(
+            [names[i] for i in rows],
+            [subjects[i] for i in rows],
+            [days[j] for j in d.tolist()],
+            [periods[k] for k in p.tolist()],
+            block[t, d, p].tolist()
+        ))
+
+def _csv_rows(teachers: Iterator[Dict[str, Any]], layout: str, days: List[str], periods: List[str]) -> Iterator[tuple]:
+    """Lignes CSV d'un parcours d'enseignants (dictionnaire ou NDJSON)"""
+    for teacher in teachers:
+        if layout == "wide":
+            hours = {(slot['day'], slot['period']): slot['hours'] for slot in teacher['time_slots']}
+            yield (teacher['name'], teacher['subject'], teacher['hours_required'], teacher['total_hours_assigned'],
+                   *(hours.get((day, period), 0) for day in days for period in periods))
+            continue
+        for slot in teacher['time_slots']:
+            yield teacher['name'], teacher['subject'], slot['day'], slot['period'], slot['hours']
+
+def write_csv(
+    solution: Union[Dict, NdjsonSolution, ColumnarSolution],
+    output_file: str,
+    layout: str = "long",
+    compression: Optional[str] = None,
+    chunk_size: int = CSV_CHUNK_TEACHERS
+) -> int:
+    """
+    Exporte le planning en CSV par blocs (writerows), compressé si demandé
+
+    Une solution en colonnes est écrite directement depuis le tableau des
+    heures (valeurs des variables), sans dictionnaire intermédiaire.
+
+    Args:
+        solution: Dictionnaire, NdjsonSolution ou ColumnarSolution
+        output_file: Fichier de sortie
+        layout: "long" (une ligne par créneau) ou "wide" (une ligne par enseignant)
+        compression: "gzip", "bz2", "xz" ou "zstd" (par défaut : d'après l'extension)
+        chunk_size: Enseignants par appel à writerows
+
+    Returns:
+        Nombre de lignes écrites (en-tête non compris)
+    """
+    if layout not in CSV_LAYOUTS:
+        raise ValueError(f"Disposition inconnue : {layout} (attendu : {', '.join(CSV_LAYOUTS)})")
+    compression = compression or csv_compression(output_file)
+
+    if isinstance(solution, ColumnarSolution):
+        days, periods = solution.days, solution.periods
+        chunks = _csv_chunks_columnar(solution, layout, chunk_size)
+    else:
+        days, periods = solution_axes(solution)
+        rows = _csv_rows(iter_teachers(solution), layout, days, periods)
+        chunks = iter(lambda: list(itertools.islice(rows, chunk_size)), [])
+
+    count = 0
+    with _open_text(output_file, compression) as f:
+        writer = csv.writer(f)
+        writer.writerow(_csv_header(layout, days, periods))
+        for chunk in chunks:
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+# ----------------------------------------------------------------------
+# Lecture / écriture quel que soit le format
+# ----------------------------------------------------------------------
+
+def write_solution_file(
+    solution: Union[Dict, ColumnarSolution],
+    output_file: str,
+    format: Optional[str] = None
+):
+    """
+    Écrit une solution dans le format demandé (déduit de l'extension par défaut)
+
+    Args:
+        solution: Dictionnaire (format extract_solution) ou ColumnarSolution
+        output_file: Fichier de sortie
+        format: "json", "ndjson" ou "binary" (voir SOLUTION_FORMATS)
+    """
+    format = format or solution_format(output_file)
+    if format not in SOLUTION_FORMATS:
+        raise ValueError(f"Format inconnu : {format} (attendu : {', '.join(SOLUTION_FORMATS)})")
+
+    if format == "ndjson":
+        write_ndjson(solution, output_file)
+    elif format == "binary":
+        write_binary(solution, output_file)
+    else:
+        if isinstance(solution, ColumnarSolution):
+            solution = solution.to_dict()
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(solution, f, ensure_ascii=False, indent=2)
+
+def read_solution_file(path: str, format: Optional[str] = None) -> Union[Dict, NdjsonSolution, ColumnarSolution]:
+    """
+    Ouvre une solution quel que soit son format
+
+    Returns:
+        Dictionnaire (json), NdjsonSolution (lecture paresseuse) ou
+        ColumnarSolution mappée en mémoire (binary)
+    """
+    format = format or solution_format(path)
+    if format == "ndjson":
+        return NdjsonSolution(path)
+    if format == "binary":
+        return read_binary(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def written_header_matches(solution: Union[Dict, ColumnarSolution], path: str) -> bool:
+    """
+    Vérification peu coûteuse d'un fichier de solution qui vient d'être écrit
+
+    Seuls l'en-tête (nom, statut, objectif), les jours et les périodes sont
+    relus, ainsi que la forme du tableau des heures pour le format binaire :
+    aucun enseignant n'est décodé. Le format json (json.dump du dictionnaire)
+    n'est pas relu ; l'exactitude des heures binaires est vérifiée à
+    l'écriture (voir write_binary).
+    """
+    format = solution_format(path)
+    if format == "json":
+        return True
+    written = read_solution_file(path, format)
+    written_header = written.header if isinstance(written, NdjsonSolution) else written.header()
+    header = solution.header() if isinstance(solution, ColumnarSolution) else solution
+    if any(written_header.get(key) != header.get(key) for key in ("problem_name", "status", "objective_value")):
+        return False
+    days, periods = solution_axes(solution)
+    if solution_axes(written) != (days, periods):
+        return False
+    if format == "binary":
+        n_teachers = len(solution.teachers) if isinstance(solution, ColumnarSolution) else len(solution['teachers'])
+        return written.hours.shape == (n_teachers, len(days), len(periods))
+    return True
+
+def iter_teachers(solution: Union[Dict, NdjsonSolution, ColumnarSolution]) -> Iterator[Dict[str, Any]]:
+    """Parcourt les enseignants d'une solution, un dictionnaire à la fois"""
+    if isinstance(solution, ColumnarSolution):
+        return solution.iter_teachers()
+    if isinstance(solution, NdjsonSolution):
+        return iter(solution)
+    return iter(solution['teachers'])
@@ -1,7 +1,121 @@
 from ortools.sat.python import cp_model
+from ortools.sat import cp_model_pb2
 from model import SchedulingModel
+from columnar import ColumnarSolution
+from solution_io import write_solution_file, write_csv, solution_format
+from decomposition import solve_decomposed
+from soft_constraints import soft_stages, has_preferences, PenaltyBuilder, fix_objective, set_penalty_objective, set_hint
+import os
 import json
-from typing import Dict, List
+import time
+import numpy as np
+from typing import Dict, List, Optional, Callable, Union, TextIO
+
+def write_solution(
+    solution: Optional[Union[Dict, ColumnarSolution]],
+    output_file: str = "solution.json",
+    format: Optional[str] = None
+):
+    """
+    Écrit une solution (format extract_solution) dans un fichier
+
+    Args:
+        solution: Solution à sauvegarder (dictionnaire ou ColumnarSolution)
+        output_file: Nom du fichier de sortie
+        format: "json", "ndjson" ou "binary" (par défaut : d'après l'extension,
+            voir solution_io.SOLUTION_FORMATS)
+    """
+    if solution is None:
+        print("\n[ERREUR] Aucune solution à sauvegarder")
+        return
+
+    write_solution_file(solution, output_file, format)
+
+    print(f"\n[OK] Solution sauvegardée dans {output_file}")
+
+def stop_when_gap_below(relative_gap: float) -> Callable[[Dict], bool]:
+    """
+    Condition d'arrêt : écart relatif entre objectif et borne inférieur au seuil
+
+    Args:
+        relative_gap: Écart relatif toléré (par exemple 0.01 pour 1%)
+    """
+    def condition(event: Dict) -> bool:
+        objective, bound = event["objective_value"], event["best_bound"]
+        return abs(objective - bound) <= relative_gap * max(abs(objective), 1.0)
+    return condition
+
+class SolutionStreamer(cp_model.CpSolverSolutionCallback):
+    """
+    Diffuse chaque solution améliorante trouvée par CP-SAT
+
+    Chaque solution est écrite dès qu'elle est trouvée :
+    - en NDJSON (une ligne par solution, avec horodatage, objectif et borne)
+    - et/ou dans un fichier JSON contenant la dernière solution, au format
+      de extract_solution (remplacement atomique, lisible à tout moment)
+
+    Une condition d'arrêt fournie par l'utilisateur peut interrompre la
+    recherche (StopSearch) dès qu'une solution suffisante est trouvée.
+    """
+
+    def __init__(
+        self,
+        scheduling_solver: 'SchedulingSolver',
+        stream: Optional[Union[str, TextIO]] = None,
+        latest_file: Optional[str] = None,
+        stop_condition: Optional[Callable[[Dict], bool]] = None
+    ):
+        """
+        Args:
+            scheduling_solver: Solveur dont le modèle est en cours de résolution
+            stream: Chemin ou flux texte recevant les solutions en NDJSON
+            latest_file: Fichier JSON réécrit à chaque nouvelle solution
+            stop_condition: Fonction (événement) -> bool, True pour arrêter la recherche
+        """
+        super().__init__()
+        self.scheduling_solver = scheduling_solver
+        self.latest_file = latest_file
+        self.stop_condition = stop_condition
+        self.solution_count = 0
+        self.events = []  # Historique (sans les plannings) des solutions trouvées
+
+        self._owns_stream = isinstance(stream, str)
+        self._stream = open(stream, 'w', encoding='utf-8') if self._owns_stream else stream
+
+    def close(self):
+        """Ferme le flux NDJSON s'il a été ouvert par le callback"""
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def on_solution_callback(self):
+        self.solution_count += 1
+        event = {
+            "solution_index": self.solution_count,
+            "timestamp": time.time(),
+            "wall_time": self.WallTime(),
+            "objective_value": self.ObjectiveValue(),
+            "best_bound": self.BestObjectiveBound()
+        }
+        self.events.append(dict(event))
+
+        if self._stream is not None or self.latest_file is not None:
+            solution = self.scheduling_solver.columnar_from_response(
+                self.response_proto, "FEASIBLE", event["objective_value"], event["wall_time"]
+            ).to_dict()
+
+            if self._stream is not None:
+                self._stream.write(json.dumps(dict(event, solution=solution), ensure_ascii=False) + "\n")
+                self._stream.flush()
+
+            if self.latest_file is not None:
+                tmp_file = f"{self.latest_file}.tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(solution, f, ensure_ascii=False)
+                os.replace(tmp_file, self.latest_file)
+
+        if self.stop_condition is not None and self.stop_condition(event):
+            self.StopSearch()
 
 class SchedulingSolver:
     """Résout le problème de planification et génère la solution"""
@@ -16,13 +130,32 @@ class SchedulingSolver:
         self.model_instance = model
         self.solver = cp_model.CpSolver()
         self.solution = None
+        self.columnar = None       # ColumnarSolution de la dernière extraction
+        self._slot_indices = None  # Indices proto des créneaux (calculés une fois)
+        self.decomposition = None  # Résultat de solve_decomposed()
+        self.streamer = None       # SolutionStreamer de la dernière résolution
+        self.cold_start = None     # Résultat de compare_cold_start()
+        self.stages = []           # Étapes de solve_lexicographic() (la première : objectif principal)
+        self._stage_response = None  # Réponse de la dernière étape de préférences réussie
+        self._stage_solver = None    # CpSolver de l'étape de préférences en cours
+        self._stop_requested = False  # stop_search() appelé : plus de nouvelle étape
 
-    def solve(self, time_limit_seconds: int = 30) -> bool:
+    def solve(
+        self,
+        time_limit_seconds: int = 30,
+        stream: Optional[Union[str, TextIO]] = None,
+        latest_file: Optional[str] = None,
+        stop_condition: Optional[Callable[[Dict], bool]] = None
+    ) -> bool:
         """
         Résout le problème
 
         Args:
             time_limit_seconds: Limite de temps pour la résolution
+            stream: Chemin ou flux recevant chaque solution améliorante en NDJSON
+            latest_file: Fichier JSON contenant toujours la dernière solution trouvée
+            stop_condition: Fonction (événement) -> bool arrêtant la recherche
+                (voir SolutionStreamer et stop_when_gap_below)
 
         Returns:
             True si une solution a été trouvée, False sinon
@@ -33,13 +166,214 @@ class SchedulingSolver:
 
         # Configuration du solver
         self.solver.parameters.max_time_in_seconds = time_limit_seconds
+        self.decomposition = None
+        self.cold_start = None
+        self.stages = []
+        self._stage_response = None
+        self._stop_requested = False  # un stop_search() antérieur ne vaut pas pour cette résolution
 
         print(f"\nRecherche de solution (max {time_limit_seconds}s)...")
 
         # Résolution
-        status = self.solver.Solve(self.model_instance.model)
+        if stream is None and latest_file is None and stop_condition is None:
+            status = self.solver.Solve(self.model_instance.model)
+        else:
+            self.streamer = SolutionStreamer(self, stream, latest_file, stop_condition)
+            try:
+                status = self.solver.Solve(self.model_instance.model, self.streamer)
+            finally:
+                self.streamer.close()
+            print(f"  {self.streamer.solution_count} solutions intermédiaires diffusées")
+
+        return self._report_status(status)
+
+    def solve_lexicographic(
+        self,
+        time_limit_seconds: int = 30,
+        stage_time_limit_seconds: int = 10,
+        stream: Optional[Union[str, TextIO]] = None
+    ) -> bool:
+        """
+        Résout l'objectif principal, puis les préférences par priorité croissante
+
+        L'étape 1 est la résolution habituelle (solve). Chaque étape suivante
+        travaille sur une copie du modèle : la valeur atteinte à l'étape
+        précédente y est figée par une contrainte, l'objectif est remplacé par
+        la somme pondérée des pénalités de la priorité (voir soft_constraints),
+        et la solution précédente sert d'indication. Une étape sans solution
+        dans son temps imparti conserve la solution de l'étape précédente.
+
+        Args:
+            time_limit_seconds: Limite de temps de l'objectif principal
+            stage_time_limit_seconds: Limite de temps de chaque étape de préférences
+            stream: Flux NDJSON des solutions de l'objectif principal (voir solve)
+
+        Returns:
+            True si une solution a été trouvée, False sinon
+        """
+        # Remis à zéro ici (et non entre les étapes) : un arrêt demandé pendant
+        # l'objectif principal doit empêcher les étapes de préférences
+        self._stop_requested = False
+        if not self.solve(time_limit_seconds, stream=stream):
+            return False
+
+        self.stages = [{"stage": 1, "priority": None, "status": self.solver.StatusName(),
+                        "objective_value": self.solver.ObjectiveValue(), "wall_time": self.solver.WallTime()}]
+        stages = soft_stages(self.model_instance.data)
+        if not has_preferences(self.model_instance.data, stages):
+            return True
+
+        print("\nRésolution des préférences par priorité...")
+        stage_model = self.model_instance.model.Clone()
+        builder = PenaltyBuilder(stage_model, self.model_instance)
+        response = self.solver.ResponseProto()
+        objective_value = self.solver.ObjectiveValue()
+
+        for priority, constraints in stages:
+            if self._stop_requested:
+                print(f"  Priorité {priority} : recherche interrompue, solution précédente conservée")
+                break
+            # Figer l'étape précédente avant d'ajouter les littéraux de pénalité
+            fix_objective(stage_model, objective_value)
+            terms = builder.penalties(constraints)
+            if not terms:
+                print(f"  Priorité {priority} : aucune préférence à respecter")
+                continue
+            set_penalty_objective(stage_model, terms)
+            set_hint(stage_model, builder.hint_values(response.solution))
+
+            stage_solver = cp_model.CpSolver()
+            stage_solver.parameters.CopyFrom(self.solver.parameters)
+            stage_solver.parameters.max_time_in_seconds = stage_time_limit_seconds
+            self._stage_solver = stage_solver
+            try:
+                status = stage_solver.Solve(stage_model)
+            finally:
+                self._stage_solver = None
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                print(f"  Priorité {priority} : {stage_solver.StatusName(status)}, solution précédente conservée")
+                break
+
+            response = stage_solver.ResponseProto()
+            objective_value = stage_solver.ObjectiveValue()
+            self._stage_response = response
+            self.stages.append({"stage": len(self.stages) + 1, "priority": priority,
+                                "status": stage_solver.StatusName(status),
+                                "objective_value": objective_value, "wall_time": stage_solver.WallTime()})
+            print(f"  Priorité {priority} : pénalité {objective_value:g} "
+                  f"({stage_solver.StatusName(status)}, {stage_solver.WallTime():.3f}s)")
+
+        return True
+
+    def stop_search(self):
+        """
+        Interrompt la résolution en cours (appelable depuis un autre thread)
+
+        CP-SAT s'arrête avec la meilleure solution déjà trouvée ; dans
+        solve_lexicographic, les étapes de préférences restantes ne sont
+        pas lancées.
+        """
+        self._stop_requested = True
+        self.solver.StopSearch()
+        stage_solver = self._stage_solver
+        if stage_solver is not None:
+            stage_solver.StopSearch()
+
+    def compare_cold_start(self, time_limit_seconds: int = 30) -> Dict:
+        """
+        Résout une copie du modèle sans indications (démarrage à froid)
+
+        À appeler après solve() : le modèle est identique (y compris la
+        pénalité de perturbation), seules les indications sont retirées,
+        ce qui mesure le gain du démarrage à chaud.
+
+        Args:
+            time_limit_seconds: Limite de temps de la résolution à froid
+
+        Returns:
+            Dictionnaire {status, objective_value, wall_time, speedup}
+        """
+        cold_model = self.model_instance.model.Clone()
+        cold_model.ClearHints()
+
+        cold_solver = cp_model.CpSolver()
+        cold_solver.parameters.CopyFrom(self.solver.parameters)
+        cold_solver.parameters.max_time_in_seconds = time_limit_seconds
+        status = cold_solver.Solve(cold_model)
 
-        # Analyse du statut
+        warm_time = self.wall_time()
+        self.cold_start = {
+            "status": cold_solver.StatusName(status),
+            "objective_value": cold_solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None,
+            "wall_time": cold_solver.WallTime(),
+            "speedup": cold_solver.WallTime() / warm_time if warm_time > 0 else None
+        }
+        return self.cold_start
+
+    def hint_report(self) -> Optional[Dict]:
+        """
+        Créneaux de la solution précédente conservés par la nouvelle solution
+
+        Returns:
+            Dictionnaire {hints, kept, changed, hours_changed}, ou None si le
+            modèle n'a pas d'indications
+        """
+        hints = self.model_instance.hints
+        if not hints:
+            return None
+
+        kept = 0
+        hours_changed = 0
+        for (teacher, day, period), hours in hints.items():
+            value = self.slot_value(teacher, day, period)
+            if value == hours:
+                kept += 1
+            else:
+                hours_changed += abs(value - hours)
+
+        return {
+            "hints": len(hints),
+            "kept": kept,
+            "changed": len(hints) - kept,
+            "hours_changed": hours_changed
+        }
+
+    def solve_decomposed(self, time_limit_seconds: int = 30, max_workers: Optional[int] = None) -> bool:
+        """
+        Résout le problème par composantes indépendantes, en parallèle
+
+        Chaque composante (aujourd'hui : chaque enseignant) est construite et
+        résolue comme un sous-modèle séparé dans un ProcessPoolExecutor. Le
+        modèle monolithique n'est pas utilisé : il peut être créé avec
+        SchedulingModel(build=False).
+
+        Args:
+            time_limit_seconds: Limite de temps globale
+            max_workers: Nombre de processus (par défaut : nombre de cœurs)
+
+        Returns:
+            True si une solution a été trouvée pour toutes les composantes, False sinon
+        """
+        print("\n" + "="*60)
+        print("RÉSOLUTION DÉCOMPOSÉE DU PROBLÈME")
+        print("="*60)
+
+        print(f"\nRecherche de solution par composante (max {time_limit_seconds}s)...")
+        self.stages = []
+        self._stage_response = None
+
+        self.decomposition = solve_decomposed(
+            self.model_instance.data,
+            self.model_instance.build_options(),
+            time_limit_seconds=time_limit_seconds,
+            max_workers=max_workers
+        )
+        print(f"  {self.decomposition['components']} composantes indépendantes résolues")
+
+        return self._report_status(cp_model_pb2.CpSolverStatus.Value(self.decomposition["status"]))
+
+    def _report_status(self, status: int) -> bool:
+        """Affiche le statut de résolution et indique si une solution existe"""
         if status == cp_model.OPTIMAL:
             print("\n[SUCCÈS] Solution optimale trouvée!")
             return True
@@ -56,90 +390,195 @@ class SchedulingSolver:
             print("\n[ÉCHEC] Aucune solution trouvée dans le temps imparti")
             return False
 
-    def extract_solution(self) -> Dict:
+    def extract_solution(self, as_dict: bool = True) -> Union[Dict, ColumnarSolution, None]:
         """
         Extrait la solution du solver
 
+        Args:
+            as_dict: Construit le dictionnaire de solution ; False renvoie la
+                solution en colonnes, le dictionnaire n'étant construit qu'à
+                la demande (solution_dict, écriture JSON)
+
         Returns:
             Dictionnaire contenant le planning pour chaque enseignant
+            (ColumnarSolution si as_dict est faux)
         """
-        if self.solver.StatusName() not in ['OPTIMAL', 'FEASIBLE']:
+        if self.status_name() not in ['OPTIMAL', 'FEASIBLE']:
             return None
 
         print("\n" + "="*60)
         print("EXTRACTION DE LA SOLUTION")
         print("="*60)
 
-        solution = {
-            "problem_name": self.model_instance.data['problem_name'],
-            "status": self.solver.StatusName(),
-            "objective_value": self.solver.ObjectiveValue(),
-            "solve_time_seconds": self.solver.WallTime(),
-            "teachers": []
-        }
+        self.solution = None
+        self.columnar = self.extract_columnar()
+        self.columnar.print_summary()
+
+        return self.solution_dict() if as_dict else self.columnar
+
+    def solution_dict(self) -> Optional[Dict]:
+        """Dictionnaire de solution, construit une seule fois depuis la solution en colonnes"""
+        if self.solution is None and self.columnar is not None:
+            self.solution = self.columnar.to_dict()
+        return self.solution
+
+    def extract_columnar(self) -> Optional[ColumnarSolution]:
+        """
+        Extrait la solution en colonnes, sans construire le dictionnaire
+
+        Les valeurs de toutes les variables sont lues en un seul appel
+        (CpSolverResponse.solution) puis réparties sur le tableau
+        (enseignant, jour, période) par indexation NumPy.
+
+        Returns:
+            ColumnarSolution, ou None si aucune solution n'a été trouvée
+        """
+        if self.status_name() not in ['OPTIMAL', 'FEASIBLE']:
+            return None
+
+        if self.decomposition is not None:
+            return self._columnar_from_decomposition()
+
+        response = self._stage_response if self._stage_response is not None else self.solver.ResponseProto()
+        return self.columnar_from_response(response, self.status_name(), self.objective_value(), self.wall_time())
 
-        # Extraire les créneaux pour chaque enseignant
-        for teacher in self.model_instance.teachers:
-            teacher_schedule = {
-                "name": teacher,
-                "subject": self.model_instance.subjects[self.model_instance.teachers.index(teacher)],
-                "hours_required": self.model_instance.hours_required[teacher],
-                "time_slots": []
-            }
+    def columnar_from_response(
+        self,
+        response: cp_model_pb2.CpSolverResponse,
+        status: str,
+        objective_value: float,
+        solve_time_seconds: float
+    ) -> ColumnarSolution:
+        """
+        Construit la solution en colonnes à partir d'une réponse CP-SAT
+
+        Args:
+            response: Réponse du solveur (ou du callback) contenant la solution
+            status: Statut à inscrire dans la solution
+            objective_value: Valeur de l'objectif
+            solve_time_seconds: Temps de résolution
+        """
+        if self._slot_indices is None:
+            self._slot_indices = self.model_instance.slot_indices()
 
-            total_hours = 0
+        model = self.model_instance
+        return ColumnarSolution.from_values(
+            np.fromiter(response.solution, dtype=np.int64, count=len(response.solution)),
+            self._slot_indices,
+            model.data['problem_name'],
+            status, objective_value, solve_time_seconds,
+            model.teachers, model.subjects,
+            [model.hours_required[teacher] for teacher in model.teachers],
+            model.days, model.periods
+        )
 
-            for day in self.model_instance.days:
-                for period in self.model_instance.periods:
-                    var = self.model_instance.slots[(teacher, day, period)]
-                    hours = self.solver.Value(var)
+    def _columnar_from_decomposition(self) -> ColumnarSolution:
+        """Solution en colonnes d'une résolution décomposée (valeurs non nulles)"""
+        model = self.model_instance
+        hours = np.zeros((len(model.teachers), len(model.days), len(model.periods)), dtype=np.int64)
+        for (teacher, day, period), value in self.decomposition['values'].items():
+            hours[model.teacher_index[teacher], model.day_index[day], model.period_index[period]] = value
 
-                    # Si des heures sont assignées à ce créneau (1h ou 2h)
-                    if hours > 0:
-                        teacher_schedule["time_slots"].append({
-                            "day": day,
-                            "period": period,
-                            "hours": hours
-                        })
-                        total_hours += hours
+        return ColumnarSolution(
+            model.data['problem_name'],
+            self.status_name(), self.objective_value(), self.wall_time(),
+            model.teachers, model.subjects,
+            [model.hours_required[teacher] for teacher in model.teachers],
+            hours, model.days, model.periods
+        )
 
-            teacher_schedule["total_hours_assigned"] = total_hours
-            solution["teachers"].append(teacher_schedule)
+    def status_name(self) -> str:
+        """Statut de la dernière résolution (monolithique ou décomposée)"""
+        if self.decomposition is not None:
+            return self.decomposition["status"]
+        if self._stage_response is not None:
+            # Optimal seulement si toutes les étapes le sont
+            return "OPTIMAL" if all(stage["status"] == "OPTIMAL" for stage in self.stages) else "FEASIBLE"
+        return self.solver.StatusName()
 
-            print(f"\n{teacher} ({teacher_schedule['subject']}):")
-            print(f"  Heures requises : {teacher_schedule['hours_required']}h")
-            print(f"  Heures assignées : {total_hours}h")
-            print(f"  Créneaux : {len(teacher_schedule['time_slots'])}")
+    def objective_value(self) -> float:
+        """Valeur de l'objectif de la dernière résolution"""
+        if self.decomposition is not None:
+            return self.decomposition["objective_value"]
+        return self.solver.ObjectiveValue()
 
-        self.solution = solution
-        return solution
+    def wall_time(self) -> float:
+        """Temps de résolution de la dernière résolution"""
+        if self.decomposition is not None:
+            return self.decomposition["wall_time"]
+        if self._stage_response is not None:
+            return sum(stage["wall_time"] for stage in self.stages)
+        return self.solver.WallTime()
 
-    def save_solution(self, output_file: str = "solution.json"):
+    def slot_value(self, teacher: str, day: str, period: str) -> int:
+        """Nombre d'heures assignées à un créneau (0 si le créneau n'existe pas)"""
+        if self.decomposition is not None:
+            return self.decomposition["values"].get((teacher, day, period), 0)
+
+        # En mode creux, les créneaux indisponibles n'ont pas de variable
+        var = self.model_instance.slots.get((teacher, day, period))
+        if var is None:
+            return 0
+        if self._stage_response is not None:
+            return self._stage_response.solution[var.Index()]
+        return self.solver.Value(var)
+
+    def save_solution(self, output_file: str = "solution.json", format: Optional[str] = None):
         """
-        Sauvegarde la solution dans un fichier JSON
+        Sauvegarde la solution dans un fichier
+
+        Les formats ndjson et binary sont écrits depuis la solution en
+        colonnes, sans passer par le dictionnaire complet.
 
         Args:
             output_file: Nom du fichier de sortie
+            format: "json", "ndjson" ou "binary" (par défaut : d'après l'extension)
         """
-        if self.solution is None:
-            print("\n[ERREUR] Aucune solution à sauvegarder")
-            return
+        format = format or solution_format(output_file)
+        solution = self.solution_dict() if format == "json" else self.columnar
+        write_solution(solution, output_file, format)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.solution, f, ensure_ascii=False, indent=2)
+    def export_csv(self, output_file: str = "planning.csv", layout: str = "long", compression: Optional[str] = None) -> int:
+        """
+        Exporte le planning en CSV directement depuis les valeurs des variables
+
+        Passe par la solution en colonnes (extract_columnar), jamais par le
+        dictionnaire de solution ; voir solution_io.write_csv.
 
-        print(f"\n[OK] Solution sauvegardée dans {output_file}")
+        Returns:
+            Nombre de lignes écrites
+        """
+        if self.columnar is None:
+            self.columnar = self.extract_columnar()
+        return write_csv(self.columnar, output_file, layout, compression)
 
     def print_statistics(self):
         """Affiche les statistiques de résolution"""
         print("\n" + "="*60)
         print("STATISTIQUES")
         print("="*60)
-        print(f"Statut : {self.solver.StatusName()}")
-        print(f"Valeur objectif : {self.solver.ObjectiveValue()}")
-        print(f"Temps de résolution : {self.solver.WallTime():.3f}s")
-        print(f"Branches explorées : {self.solver.NumBranches()}")
-        print(f"Conflits : {self.solver.NumConflicts()}")
+        print(f"Statut : {self.status_name()}")
+        print(f"Valeur objectif : {self.objective_value()}")
+        print(f"Temps de résolution : {self.wall_time():.3f}s")
+        if self.decomposition is not None:
+            print(f"Composantes résolues : {self.decomposition['components']}")
+            print(f"Branches explorées : {self.decomposition['branches']}")
+            print(f"Conflits : {self.decomposition['conflicts']}")
+        else:
+            print(f"Branches explorées : {self.solver.NumBranches()}")
+            print(f"Conflits : {self.solver.NumConflicts()}")
+        for stage in self.stages[1:]:
+            print(f"Étape {stage['stage']} (priorité {stage['priority']}) : pénalité "
+                  f"{stage['objective_value']:g}, {stage['status']}, {stage['wall_time']:.3f}s")
+
+        report = self.hint_report()
+        if report is not None:
+            print(f"Indications conservées : {report['kept']}/{report['hints']} créneaux "
+                  f"({report['changed']} modifiés, {report['hours_changed']}h déplacées)")
+        if self.cold_start is not None:
+            speedup = self.cold_start['speedup']
+            print(f"Démarrage à froid : {self.cold_start['wall_time']:.3f}s ({self.cold_start['status']})"
+                  + (f", démarrage à chaud {speedup:.1f}x plus rapide" if speedup else ""))
         print("="*60)
 
 if __name__ == "__main__":
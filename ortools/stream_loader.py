@@ -0,0 +1,487 @@
+import re
+import json
+import json.scanner
+import numpy as np
+from array import array
+from typing import Dict, List, Any, Iterator, Tuple, Optional
+
+from load_problem import AvailabilityIndex, DAYS, PERIODS, HOURS_PER_SLOT
+from solution_io import StringTable, CategoricalStrings
+
+try:
+    import ijson
+except ImportError:  # Lecteur optionnel : repli sur le décodeur de la bibliothèque standard
+    ijson = None
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_SEPARATOR = re.compile(r"[ \t\r\n]*([,\]])")
+
+# Champs d'enseignant conservés par le chargeur en colonnes
+TEACHER_FIELDS = ("name", "subject", "hours_per_week", "available_days")
+
+def ijson_backend() -> Optional[Any]:
+    """
+    Lecteur ijson le plus rapide disponible (yajl2_c natif en priorité)
+
+    Returns:
+        Module de backend ijson, ou None si ijson n'est pas installé
+    """
+    if ijson is None:
+        return None
+    for name in ("yajl2_c", "yajl2_cffi", "yajl2", "python"):
+        try:
+            return ijson.get_backend(name)
+        except ImportError:
+            continue
+    return ijson
+
+# ----------------------------------------------------------------------
+# Lecture incrémentale
+# ----------------------------------------------------------------------
+
+def _iter_ijson(json_file: str, backend) -> Iterator[Tuple[str, Any]]:
+    """
+    Parcourt l'objet racine avec ijson : ("teacher", enseignant) pour chaque
+    élément du tableau teachers, (clé, valeur) pour les autres champs
+
+    Deux passes : les enseignants sont construits par items() (entièrement
+    en C avec yajl2_c), puis les autres champs, courts, sont reconstruits à
+    partir des événements en ignorant ceux du tableau teachers.
+    """
+    from ijson.common import ObjectBuilder
+
+    with open(json_file, 'rb') as f:
+        for teacher in backend.items(f, 'teachers.item', use_float=True):
+            yield "teacher", teacher
+
+    key = None
+    builder = None
+    depth = 0
+    with open(json_file, 'rb') as f:
+        for prefix, event, value in backend.parse(f, use_float=True):
+            if key == 'teachers' and prefix != '':
+                if prefix == 'teachers' and event not in ('start_array', 'end_array'):
+                    raise ValueError("Le champ 'teachers' doit être une liste")
+                continue
+            if depth == 0:
+                if prefix == '':
+                    if event == 'map_key':
+                        key = value
+                    continue
+                if event not in ('start_map', 'start_array'):
+                    yield key, value
+                    continue
+                builder = ObjectBuilder()
+
+            # Valeur composée : reconstruite jusqu'à la fin de son imbrication
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+                if depth == 0:
+                    yield key, builder.value
+
+class _BufferedDecoder:
+    """
+    Décodage incrémental d'un fichier texte avec json.JSONDecoder.raw_decode
+
+    Le fichier est lu par blocs ; chaque valeur JSON est décodée par le
+    scanner C de la bibliothèque standard dès qu'elle est complète, et le
+    tampon est tronqué au fil de la lecture.
+    """
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > len(self.buffer) // 2:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Premier caractère significatif (après les espaces), '' en fin de fichier"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON invalide : '{char}' attendu, '{found}' trouvé")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """
+        Décode la valeur suivante
+
+        Une valeur n'est acceptée que si un caractère significatif la suit
+        dans le tampon : un nombre coupé en fin de bloc n'est jamais tronqué.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            followed = _WHITESPACE.match(self.buffer, end).end() < len(self.buffer)
+            if followed or self.eof or not self._fill():
+                self.pos = end
+                return value
+
+    def array_items(self) -> Iterator[Any]:
+        """
+        Décode les éléments d'un tableau jusqu'au ']' final (boucle rapide)
+
+        Chaque élément est décodé par le scanner C puis son séparateur est
+        reconnu par une seule expression régulière ; le tampon n'est
+        complété qu'en fin de bloc.
+        """
+        scan_once = self.decoder.scan_once
+        while True:
+            self.peek()
+            try:
+                value, end = scan_once(self.buffer, self.pos)
+                separator = _SEPARATOR.match(self.buffer, end)
+            except (StopIteration, json.JSONDecodeError):
+                separator = None
+                if not self.eof:
+                    self._fill()
+                    continue
+                raise ValueError(f"JSON invalide à la position {self.pos} du bloc courant")
+            if separator is None:
+                # Valeur en fin de tampon : séparateur pas encore lu
+                if self._fill():
+                    continue
+                raise ValueError("JSON invalide : ',' ou ']' attendu après un élément")
+            yield value
+            self.pos = separator.end()
+            if separator.group(1) == "]":
+                return
+
+def _iter_builtin(json_file: str, chunk_size: int) -> Iterator[Tuple[str, Any]]:
+    """Même parcours que _iter_ijson, en une passe, avec le décodeur de la bibliothèque standard"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        yield from _iter_object(_BufferedDecoder(f, chunk_size))
+
+def _iter_object(reader: '_BufferedDecoder') -> Iterator[Tuple[str, Any]]:
+    """Parcourt l'objet racine ; le tableau teachers est décodé élément par élément"""
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "teachers":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                yield from (("teacher", teacher) for teacher in reader.array_items())
+        else:
+            yield key, reader.value()
+
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
+
+# ----------------------------------------------------------------------
+# Problème en colonnes
+# ----------------------------------------------------------------------
+
+class ProblemColumns:
+    """
+    Problème de planification stocké en colonnes compactes
+
+    - teachers : table de chaînes (bloc UTF-8 + décalages)
+    - subjects : codes entiers + table des matières distinctes
+    - hours_required : tableau int32
+    - availability : tableau booléen (enseignant x jour)
+
+    Les autres champs du problème (nom, variables, contraintes, objectif)
+    sont conservés tels quels dans metadata.
+    """
+
+    def __init__(
+        self,
+        metadata: Dict[str, Any],
+        teachers: StringTable,
+        subjects: CategoricalStrings,
+        hours_required: np.ndarray,
+        availability: np.ndarray,
+        diagnostics: List[Dict[str, str]],
+        extra_teacher_keys: List[str]
+    ):
+        self.metadata = metadata
+        self.problem_name = metadata.get('problem_name')
+        self.teachers = teachers
+        self.subjects = subjects
+        self.hours_required = hours_required
+        self.availability = availability
+        self.diagnostics = diagnostics
+        self.extra_teacher_keys = extra_teacher_keys
+        self.days = list(DAYS)
+        self.periods = list(PERIODS)
+
+    def __len__(self) -> int:
+        return len(self.teachers)
+
+    @property
+    def feasible(self) -> bool:
+        """Aucune erreur détectée pendant la lecture"""
+        return not any(d["severity"] == "error" for d in self.diagnostics)
+
+    def feasibility_report(self) -> Dict[str, Any]:
+        """Diagnostics au format de feasibility.check_feasibility"""
+        return {"feasible": self.feasible, "diagnostics": self.diagnostics}
+
+    @property
+    def partial(self) -> bool:
+        """
+        Vrai si la lecture en flux a écarté une partie du problème : calendrier
+        propre, salles ou classes déclarées, champs d'enseignant non gérés
+        (salle, classes...). Le problème doit alors être relu en entier
+        (load_problem_data) pour être résolu ou validé.
+        """
+        return bool(self.metadata.get('calendar') or self.metadata.get('rooms')
+                    or self.metadata.get('groups') or self.extra_teacher_keys)
+
+    def nbytes(self) -> int:
+        """Taille des colonnes en mémoire"""
+        return (self.teachers.blob.nbytes + self.teachers.offsets.nbytes + self.subjects.codes.nbytes
+                + self.hours_required.nbytes + self.availability.nbytes)
+
+    def availability_index(self) -> AvailabilityIndex:
+        """Masques de disponibilité des enseignants (voir load_problem.AvailabilityIndex)"""
+        return AvailabilityIndex.from_day_matrix(self.teachers, self.availability, self.days, self.periods)
+
+    def teacher(self, i: int) -> Dict[str, Any]:
+        """Enseignant i au format de problem_structure.json"""
+        return {
+            "name": self.teachers[i],
+            "subject": self.subjects[i],
+            "hours_per_week": int(self.hours_required[i]),
+            "available_days": [day for day, available in zip(self.days, self.availability[i]) if available]
+        }
+
+    def iter_teachers(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.teacher(i)
+
+    def to_problem_data(self) -> Dict[str, Any]:
+        """
+        Reconstruit le dictionnaire complet (format de load_problem_data)
+
+        Nécessaire pour la construction du modèle CP-SAT ; les jours inconnus
+        et les champs d'enseignant non gérés ont été écartés à la lecture.
+        """
+        return dict(self.metadata, teachers=list(self.iter_teachers()))
+
+class _ColumnsBuilder:
+    """Remplit les colonnes enseignant par enseignant et valide au passage"""
+
+    def __init__(self):
+        self.day_bits = {day: 1 << j for j, day in enumerate(DAYS)}
+        self.days_by_lower = {day.lower(): day for day in DAYS}
+        self.day_masks: Dict[tuple, Tuple[int, list]] = {}
+        self.capacity = [HOURS_PER_SLOT * bin(mask).count("1") for mask in range(1 << len(DAYS))]
+        self.name_blob = bytearray()
+        self.name_offsets = array('q', [0])
+        self.name_hashes = array('q')
+        self.subject_codes = array('i')
+        self.subject_table: Dict[str, int] = {}
+        self.hours = array('i')
+        self.availability = bytearray()
+        self.diagnostics: List[Dict[str, str]] = []
+        self.extra_teacher_keys = set()
+
+    def _diagnostic(self, teacher: str, code: str, severity: str, message: str):
+        self.diagnostics.append({"teacher": teacher, "code": code, "severity": severity, "message": message})
+
+    def _missing_fields(self, teacher: Any):
+        fields = teacher if isinstance(teacher, dict) else {}
+        missing = [field for field in TEACHER_FIELDS if field not in fields]
+        name = fields.get('name', f"#{len(self.hours)}")
+        self._diagnostic(str(name), "missing_field", "error", f"champs manquants : {', '.join(missing)}")
+
+    def _day_mask(self, days: List[Any]) -> Tuple[int, List[Tuple[Any, Optional[str]]]]:
+        """Masque des jours reconnus et jours inconnus (avec suggestion éventuelle)"""
+        mask = 0
+        unknown = []
+        for day in days:
+            bit = self.day_bits.get(day) if isinstance(day, str) else None
+            if bit is not None:
+                mask |= bit
+            else:
+                unknown.append((day, self.days_by_lower.get(str(day).strip().lower())))
+        return mask, unknown
+
+    def add(self, teacher: Any):
+        try:
+            name = teacher['name']
+            subject = teacher['subject']
+            hours = teacher['hours_per_week']
+            days = teacher['available_days']
+        except (KeyError, TypeError):
+            self._missing_fields(teacher)
+            return
+
+        if type(name) is not str:
+            name = str(name)
+        self.name_blob += name.encode("utf-8")
+        self.name_offsets.append(len(self.name_blob))
+        # Empreinte du nom : détection des doublons sans garder les chaînes
+        self.name_hashes.append(hash(name))
+
+        if type(subject) is not str:
+            subject = str(subject)
+        code = self.subject_table.get(subject)
+        if code is None:
+            code = self.subject_table[subject] = len(self.subject_table)
+        self.subject_codes.append(code)
+
+        if len(teacher) > len(TEACHER_FIELDS):
+            # Champs vides (salle absente, aucune classe) : sans effet, non signalés
+            self.extra_teacher_keys.update(key for key in teacher if key not in TEACHER_FIELDS and teacher[key])
+
+        # Peu de combinaisons de jours distinctes : masque mis en cache par combinaison
+        try:
+            key = tuple(days)
+            day_mask = self.day_masks.get(key)
+        except TypeError:
+            key, day_mask = None, None
+        if day_mask is None:
+            day_mask = self._day_mask(days)
+            if key is not None:
+                self.day_masks[key] = day_mask
+        mask, unknown = day_mask
+        for day, suggestion in unknown:
+            hint = f" (vouliez-vous dire « {suggestion} » ?)" if suggestion else ""
+            self._diagnostic(name, "unknown_day", "warning",
+                             f"jour inconnu « {day} », considéré comme indisponible{hint}")
+        self.availability.append(mask)
+
+        if type(hours) is not int:
+            self._diagnostic(name, "invalid_hours", "error", f"heures requises non entières : {hours!r}")
+            hours = 0
+        elif hours < 0:
+            self._diagnostic(name, "negative_hours", "error", f"heures requises négatives : {hours}h")
+        elif hours > self.capacity[mask]:
+            n_days = self.capacity[mask] // HOURS_PER_SLOT
+            self._diagnostic(name, "hours_exceed_capacity", "error",
+                             f"{hours}h requises mais au plus {self.capacity[mask]}h possibles "
+                             f"({n_days} jour(s) disponible(s) x {HOURS_PER_SLOT}h)")
+        self.hours.append(hours)
+
+    def build(self, metadata: Dict[str, Any]) -> ProblemColumns:
+        names = StringTable(np.frombuffer(bytes(self.name_blob), dtype=np.uint8),
+                            np.frombuffer(self.name_offsets, dtype=np.int64))
+        self.name_blob = None
+
+        # Doublons : empreintes égales, confirmées en comparant les noms
+        hashes = np.frombuffer(self.name_hashes, dtype=np.int64)
+        order = np.argsort(hashes, kind="stable")
+        candidates = np.flatnonzero(hashes[order][1:] == hashes[order][:-1])
+        duplicates = {}
+        for c in candidates.tolist():
+            first, second = names[int(order[c])], names[int(order[c + 1])]
+            if first == second:
+                duplicates[first] = duplicates.get(first, 1) + 1
+        for name, count in duplicates.items():
+            self._diagnostic(name, "duplicate_teacher", "error",
+                             f"{count} enseignants portent ce nom (leurs données seraient fusionnées)")
+
+        masks = np.frombuffer(bytes(self.availability), dtype=np.uint8)
+        availability = (masks[:, None] >> np.arange(len(DAYS), dtype=np.uint8)) & 1
+
+        return ProblemColumns(
+            metadata,
+            names,
+            CategoricalStrings(np.frombuffer(self.subject_codes, dtype=np.int32), list(self.subject_table)),
+            np.frombuffer(self.hours, dtype=np.int32),
+            availability.astype(bool),
+            self.diagnostics,
+            sorted(self.extra_teacher_keys)
+        )
+
+def load_problem_columns(
+    json_file: str = "problem_structure.json",
+    parser: str = "auto",
+    chunk_size: int = 1 << 20
+) -> ProblemColumns:
+    """
+    Charge un problème en flux, directement dans des colonnes compactes
+
+    Le tableau teachers est lu élément par élément : seul l'enseignant en
+    cours existe sous forme d'objets Python, le reste est stocké dans des
+    tableaux compacts. Les vérifications de check_feasibility (heures,
+    jours inconnus, capacité, doublons) sont faites pendant la lecture.
+
+    Args:
+        json_file: Chemin vers le fichier JSON
+        parser: "builtin" (json.JSONDecoder par blocs, scanner C de la
+            bibliothèque standard), "ijson" (backend yajl2_c si disponible)
+            ou "auto" : builtin si le scanner C est disponible (le plus
+            rapide), sinon ijson s'il est installé, sinon builtin en Python pur
+        chunk_size: Taille des blocs lus par le lecteur builtin
+
+    Returns:
+        ProblemColumns (les diagnostics sont dans .diagnostics)
+    """
+    if parser not in ("auto", "ijson", "builtin"):
+        raise ValueError(f"Lecteur inconnu : {parser} (attendu : auto, ijson, builtin)")
+    backend = None
+    if parser == "ijson" or (parser == "auto" and json.scanner.c_make_scanner is None):
+        backend = ijson_backend()
+        if parser == "ijson" and backend is None:
+            raise ImportError("ijson n'est pas installé (pip install ijson)")
+
+    builder = _ColumnsBuilder()
+    metadata = {}
+    if backend is not None:
+        items = _iter_ijson(json_file, backend)
+    else:
+        items = _iter_builtin(json_file, chunk_size)
+    for key, value in items:
+        if key == "teacher":
+            builder.add(value)
+        else:
+            metadata[key] = value
+
+    columns = builder.build(metadata)
+
+    reader = f"ijson {getattr(backend, 'backend', '')}".strip() if backend is not None else "json"
+    print(f"Problème chargé (lecture en flux, {reader}) : {columns.problem_name}")
+    print(f"- {len(columns)} enseignants ({columns.nbytes() / 2**20:.1f} Mo en colonnes)")
+    print(f"- {len(metadata.get('variables', []))} types de variables")
+    print(f"- {len(metadata.get('constraints', []))} contraintes")
+    print(f"- Objectif : {metadata.get('objective', {}).get('type')}")
+
+    return columns
+
+if __name__ == "__main__":
+    import sys
+
+    columns = load_problem_columns(sys.argv[1] if len(sys.argv) > 1 else "problem_structure.json")
+    errors = sum(d["severity"] == "error" for d in columns.diagnostics)
+    print(f"\n{errors} erreur(s), {len(columns.diagnostics) - errors} avertissement(s)")
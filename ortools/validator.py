@@ -0,0 +1,309 @@
+import time
+import numpy as np
+import pandas as pd
+from collections import abc
+from typing import Dict, List, Any, Tuple, Union, Optional
+
+from load_problem import load_problem_data, AvailabilityIndex, Calendar, DAYS, PERIODS, HOURS_PER_SLOT, extract_resources_info
+from columnar import ColumnarSolution
+from solution_io import StringTable, read_solution_file, to_columnar
+from stream_loader import ProblemColumns, load_problem_columns
+
+# Contraintes vérifiées (celles de SchedulingModel) et cohérence problème / solution
+CONSTRAINTS = {
+    "slot_bounds": f"heures d'un créneau entre 0 et sa durée ({HOURS_PER_SLOT}h par défaut)",
+    "availability": "créneau sur un jour disponible",
+    "hours_required": "heures assignées = heures requises",
+    "one_slot_per_day": "une période maximum par jour (si le calendrier l'impose)",
+    "room_capacity": "cours simultanés d'une salle <= capacité",
+    "group_overlap": "un cours à la fois par classe",
+    "unknown_teacher": "enseignant absent du problème",
+    "missing_teacher": "enseignant du problème absent de la solution",
+    "duplicate_teacher": "enseignant présent plusieurs fois dans la solution"
+}
+
+# Colonnes de la table des violations : une ligne par violation, jour et
+# période vides (None) pour les violations portant sur un enseignant entier
+VIOLATION_COLUMNS = ["teacher", "constraint", "day", "period", "value", "expected"]
+
+def _same_teachers(a: abc.Sequence, b: abc.Sequence) -> bool:
+    """Mêmes noms dans le même ordre (tables de chaînes comparées sans décodage)"""
+    if a is b:
+        return True
+    if isinstance(a, StringTable) and isinstance(b, StringTable):
+        return np.array_equal(a.offsets, b.offsets) and np.array_equal(a.blob, b.blob)
+    return len(a) == len(b) and list(a) == list(b)
+
+def _take(teachers: abc.Sequence, indices: np.ndarray) -> np.ndarray:
+    """Noms des seuls enseignants en violation"""
+    return np.array([teachers[i] for i in indices.tolist()], dtype=object)
+
+def problem_calendar(problem: Union[Dict[str, Any], ProblemColumns]) -> Optional[Calendar]:
+    """Calendrier du problème (moteur à intervalles), None pour la grille fixe"""
+    metadata = problem.metadata if isinstance(problem, ProblemColumns) else problem
+    return Calendar.from_data(metadata) if metadata.get('calendar') else None
+
+def problem_arrays(problem: Union[Dict[str, Any], ProblemColumns]) -> Tuple[abc.Sequence, np.ndarray, np.ndarray, List[str]]:
+    """
+    Tableaux du problème utilisés par la validation
+
+    Args:
+        problem: Données du problème (load_problem_data) ou problème en colonnes
+            (stream_loader.load_problem_columns)
+
+    Returns:
+        Tuple (noms, heures requises par semaine, disponibilités enseignant x
+        jour, jours de la semaine correspondants)
+    """
+    if isinstance(problem, ProblemColumns):
+        return problem.teachers, problem.hours_required.astype(np.int64), problem.availability, list(DAYS)
+    calendar = problem_calendar(problem)
+    days = calendar.week_days if calendar is not None else DAYS
+    index = AvailabilityIndex.from_data(problem, days, PERIODS)
+    hours_required = np.array([teacher['hours_per_week'] for teacher in problem['teachers']])
+    return index.teachers, hours_required, index.day_matrix(), list(days)
+
+def problem_resources(
+    problem: Union[Dict[str, Any], ProblemColumns],
+    names: abc.Sequence
+) -> List[Tuple[str, str, np.ndarray, int]]:
+    """
+    Salles et classes partagées du problème
+
+    Returns:
+        Liste de (ressource, contrainte, enseignants concernés (booléens
+        alignés sur names), cours simultanés permis)
+
+    Raises:
+        ValueError: problème en colonnes dont la lecture en flux a écarté
+            salles ou classes (relire le problème avec load_problem_data)
+    """
+    if isinstance(problem, ProblemColumns):
+        if problem.partial:
+            raise ValueError("Problème lu en flux sans ses salles, classes ou calendrier : "
+                             "validation impossible, relire le problème en entier")
+        return []
+    room_capacity, room_teachers, group_teachers = extract_resources_info(problem)
+    index = {name: i for i, name in enumerate(names)}
+
+    def members(teachers: List[str]) -> np.ndarray:
+        mask = np.zeros(len(names), dtype=bool)
+        mask[[index[teacher] for teacher in teachers]] = True
+        return mask
+
+    return [
+        (f"classe {group}", "group_overlap", members(teachers), 1)
+        for group, teachers in group_teachers.items()
+    ] + [
+        (f"salle {room}", "room_capacity", members(teachers), room_capacity[room])
+        for room, teachers in room_teachers.items()
+    ]
+
+def _rows(
+    teachers: abc.Sequence,
+    indices: np.ndarray,
+    constraint: str,
+    days: Any = None,
+    periods: Any = None,
+    values: Any = None,
+    expected: Any = None
+) -> Dict[str, np.ndarray]:
+    """Colonnes d'un bloc de violations (scalaires répétés sur toutes les lignes)"""
+    n = len(indices)
+
+    def column(value: Any) -> np.ndarray:
+        if isinstance(value, np.ndarray):
+            return value.astype(object)
+        return np.full(n, value, dtype=object)
+
+    return {
+        "teacher": _take(teachers, indices),
+        "constraint": np.full(n, constraint, dtype=object),
+        "day": column(days),
+        "period": column(periods),
+        "value": column(values),
+        "expected": column(expected)
+    }
+
+def validate(
+    problem: Union[Dict[str, Any], ProblemColumns],
+    solution: Union[Dict, ColumnarSolution],
+    calendar: Optional[Calendar] = None
+) -> pd.DataFrame:
+    """
+    Vérifie une solution contre toutes les contraintes dures du problème
+
+    Problème et solution sont mis sous forme de tableaux NumPy ; chaque
+    contrainte est une opération vectorisée sur le tableau des heures
+    (enseignant x jour x période), sans boucle sur les enseignants :
+    - bornes de chaque créneau (0 à 2h, ou durée de la fenêtre du calendrier)
+    - disponibilités (créneau utilisé un jour non disponible)
+    - heures exactes (comparées aux heures du problème, pas à celles
+      recopiées dans la solution ; multipliées par le nombre de semaines)
+    - une période maximum par jour (sauf calendrier à plusieurs cours par jour)
+    - salles et classes partagées (grille fixe seulement : avec un
+      calendrier, plusieurs cours d'une fenêtre ne se chevauchent pas
+      forcément et la solution en colonnes n'a pas leurs horaires)
+    - enseignants inconnus, manquants ou en double
+
+    Args:
+        problem: Données du problème ou problème en colonnes
+        solution: Solution (dictionnaire, NDJSON ou ColumnarSolution)
+        calendar: Calendrier de la solution (moteur à intervalles) ; par
+            défaut celui du problème, ou la grille fixe
+
+    Returns:
+        DataFrame des violations (colonnes VIOLATION_COLUMNS), vide si la
+        solution est valide
+    """
+    names, hours_required, available, week_days = problem_arrays(problem)
+    calendar = calendar if calendar is not None else problem_calendar(problem)
+    solution = to_columnar(solution) if isinstance(solution, dict) else solution
+    if not isinstance(solution, ColumnarSolution):
+        # Solution NDJSON : lue une fois, enseignant par enseignant
+        solution = to_columnar(dict(solution.header, days=solution.days, periods=solution.periods,
+                                    teachers=list(solution)))
+
+    hours = np.asarray(solution.hours)
+    solution_names = solution.teachers
+    days = np.array(solution.days, dtype=object)
+    periods = np.array(solution.periods, dtype=object)
+
+    # Jour de la semaine (colonne de disponibilité) de chaque jour de la solution
+    if calendar is not None:
+        max_slot_hours = calendar.max_window_hours
+        hours_required = hours_required * calendar.weeks
+        week_day = {label: calendar.week_days[k] for label, k in zip(calendar.days, calendar.week_day_index)}
+    else:
+        max_slot_hours = HOURS_PER_SLOT
+        week_day = {day: day for day in DAYS}
+    day_position = np.array([
+        week_days.index(week_day[day]) if week_day.get(day) in week_days else -1
+        for day in solution.days
+    ], dtype=np.int64)
+
+    # Position de chaque enseignant de la solution dans le problème (-1 : inconnu)
+    if _same_teachers(solution_names, names):
+        position = np.arange(len(names))
+    else:
+        problem_index = {name: i for i, name in enumerate(names)}
+        position = np.fromiter((problem_index.get(name, -1) for name in solution_names),
+                               dtype=np.int64, count=len(solution_names))
+    known = position >= 0
+    blocks = []
+
+    # Bornes des créneaux
+    t, d, p = np.nonzero((hours < 0) | (hours > max_slot_hours))
+    blocks.append(_rows(solution_names, t, "slot_bounds", days[d], periods[p],
+                        hours[t, d, p], f"0-{max_slot_hours}"))
+
+    # Disponibilités : jours inconnus du problème considérés comme indisponibles
+    solution_available = np.zeros((len(solution_names), len(solution.days)), dtype=bool)
+    known_days = day_position >= 0
+    solution_available[np.ix_(known, known_days)] = available[np.ix_(position[known], day_position[known_days])]
+    t, d, p = np.nonzero((hours > 0) & ~solution_available[:, :, None] & known[:, None, None])
+    blocks.append(_rows(solution_names, t, "availability", days[d], periods[p], hours[t, d, p], 0))
+
+    # Heures exactes
+    total_hours = hours.sum(axis=(1, 2))
+    expected_hours = np.zeros(len(solution_names), dtype=hours_required.dtype)
+    expected_hours[known] = hours_required[position[known]]
+    t = np.flatnonzero(known & ~np.isclose(total_hours, expected_hours))
+    blocks.append(_rows(solution_names, t, "hours_required", values=total_hours[t], expected=expected_hours[t]))
+
+    # Une période maximum par jour
+    slots_per_day = (hours > 0).sum(axis=2)
+    if calendar is not None and not calendar.one_lesson_per_day:
+        slots_per_day = np.zeros_like(slots_per_day)
+    t, d = np.nonzero(slots_per_day > 1)
+    blocks.append(_rows(solution_names, t, "one_slot_per_day", days[d], values=slots_per_day[t, d], expected=1))
+
+    # Salles et classes : cours simultanés par créneau
+    if calendar is None:
+        occupied = hours > 0
+        for owner, constraint, members, capacity in problem_resources(problem, names):
+            in_resource = np.zeros(len(solution_names), dtype=bool)
+            in_resource[known] = members[position[known]]
+            counts = occupied[in_resource].sum(axis=0)
+            d, p = np.nonzero(counts > capacity)
+            blocks.append(_rows([owner], np.zeros(len(d), dtype=np.int64), constraint,
+                                days[d], periods[p], counts[d, p], capacity))
+
+    # Cohérence des enseignants
+    t = np.flatnonzero(~known)
+    blocks.append(_rows(solution_names, t, "unknown_teacher"))
+
+    counts = np.bincount(position[known], minlength=len(names))
+    t = np.flatnonzero(counts == 0)
+    blocks.append(_rows(names, t, "missing_teacher",
+                        values=0, expected=hours_required[t]))
+    t = np.flatnonzero(counts > 1)
+    blocks.append(_rows(names, t, "duplicate_teacher", values=counts[t], expected=1))
+
+    violations = pd.DataFrame({
+        column: np.concatenate([block[column] for block in blocks])
+        for column in VIOLATION_COLUMNS
+    })
+    violations["constraint"] = pd.Categorical(violations["constraint"], categories=list(CONSTRAINTS))
+    return violations
+
+def validate_files(problem_file: str = "problem_structure.json", solution_file: str = "solution.json") -> pd.DataFrame:
+    """
+    Valide un fichier de solution (json, ndjson ou binaire) contre le fichier du problème
+
+    Le problème est lu en flux (colonnes compactes), sauf s'il déclare un
+    calendrier, des salles ou des classes : il est alors relu en entier
+    pour que toutes les contraintes soient vérifiées.
+    """
+    problem = load_problem_columns(problem_file)
+    if problem.partial:
+        problem = load_problem_data(problem_file)
+    return validate(problem, read_solution_file(solution_file))
+
+def summarize(violations: pd.DataFrame) -> pd.Series:
+    """Nombre de violations par contrainte (contraintes respectées comprises)"""
+    return violations.groupby("constraint", observed=False).size()
+
+def print_violations(violations: pd.DataFrame, max_rows: int = 20):
+    """Affiche le résumé par contrainte puis les premières violations"""
+    print("\n" + "="*80)
+    print("VALIDATION COMPLÈTE DE LA SOLUTION")
+    print("="*80)
+
+    for constraint, count in summarize(violations).items():
+        label = "OK" if count == 0 else "ERREUR"
+        print(f"  [{label}] {CONSTRAINTS[constraint]} : {count} violation(s)")
+
+    if violations.empty:
+        print("\n[OK] Solution valide!")
+        return
+
+    print(f"\n[ERREUR] {len(violations)} violation(s) :")
+    print(violations.head(max_rows).fillna("-").to_string(index=False))
+    if len(violations) > max_rows:
+        print(f"  ... et {len(violations) - max_rows} autres violations")
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validation d'une solution contre le problème")
+    parser.add_argument("solution", nargs="?", default="solution.json",
+                        help="Fichier de solution (.json, .ndjson ou .bin)")
+    parser.add_argument("--problem", default="problem_structure.json", help="Fichier du problème")
+    parser.add_argument("--max-rows", type=int, default=20, help="Violations affichées")
+    parser.add_argument("--csv", default=None, help="Exporte la table des violations en CSV")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    violations = validate_files(args.problem, args.solution)
+    elapsed = time.perf_counter() - start
+
+    print_violations(violations, args.max_rows)
+    print(f"\nValidation en {elapsed:.3f}s")
+    if args.csv:
+        violations.to_csv(args.csv, index=False)
+        print(f"Violations exportées dans {args.csv}")
+
+    # Code de sortie non nul : utilisable comme barrière avant publication
+    sys.exit(1 if len(violations) else 0)
@@ -1,37 +1,159 @@
-import json
+import os
+import sys
+import html
+import math
+import itertools
+import numpy as np
 from tabulate import tabulate
-from typing import Dict, List
+from typing import Dict, List, Any, Iterator, Tuple, Union, Optional, TextIO
 
-def load_solution(solution_file: str = "solution.json") -> Dict:
-    """Charge la solution depuis le fichier JSON"""
-    with open(solution_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from columnar import ColumnarSolution, VERBOSE_TEACHERS
+from load_problem import AvailabilityIndex
+from solution_io import NdjsonSolution, read_solution_file, iter_teachers, write_csv, solution_axes
 
-def create_weekly_grid(solution: Dict) -> Dict[str, Dict[str, str]]:
-    """
-    Crée une grille hebdomadaire du planning
+# Une solution peut être un dictionnaire (solution.json), une solution NDJSON
+# lue paresseusement ou une solution en colonnes (éventuellement mappée en mémoire)
+AnySolution = Union[Dict, NdjsonSolution, ColumnarSolution]
 
-    Returns:
-        Dictionnaire {jour: {période: enseignant-matière-heures}}
+# Rendu des gros plannings
+MAX_CELL_TEACHERS = 3   # Enseignants nommés dans une case de la grille
+PAGE_SIZE = 50          # Enseignants par page affichée dans le terminal
+HTML_PAGE_SIZE = 500    # Enseignants par page du rapport HTML
+
+def load_solution(solution_file: str = "solution.json") -> AnySolution:
     """
-    days = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi"]
-    periods = ["matin", "après-midi"]
+    Charge la solution depuis le fichier (format d'après l'extension)
 
-    # Initialiser la grille
-    grid = {day: {period: "-" for period in periods} for day in days}
+    Les fichiers .ndjson sont lus ligne par ligne à chaque parcours, les
+    fichiers .bin sont mappés en mémoire : seul le JSON est chargé en entier.
+    """
+    return read_solution_file(solution_file)
+
+def _solution_axes(solution: AnySolution) -> Tuple[List[str], List[str]]:
+    """Jours et périodes d'une solution (voir solution_io.solution_axes)"""
+    return solution_axes(solution)
+
+def _solution_header(solution: AnySolution) -> Dict[str, Any]:
+    """Champs de la solution autres que la liste des enseignants"""
+    if isinstance(solution, ColumnarSolution):
+        return solution.header()
+    if isinstance(solution, NdjsonSolution):
+        return solution.header
+    return {key: value for key, value in solution.items() if key != 'teachers'}
+
+def _teacher_count(solution: AnySolution) -> Optional[int]:
+    """Nombre d'enseignants, None s'il n'est connu qu'après lecture complète (NDJSON)"""
+    if isinstance(solution, ColumnarSolution):
+        return len(solution)
+    if isinstance(solution, NdjsonSolution):
+        return None
+    return len(solution['teachers'])
+
+def _pages(teachers: Iterator[Dict[str, Any]], page_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Découpe un parcours d'enseignants en pages, sans le matérialiser"""
+    while True:
+        page = list(itertools.islice(teachers, page_size))
+        if not page:
+            return
+        yield page
+
+def format_hours(hours: float) -> str:
+    """Heures sans décimales inutiles (2, 1.5) : le calendrier permet des durées fractionnaires"""
+    return f"{float(hours):g}"
+
+class SlotAggregator:
+    """
+    Agrège tous les enseignants de chaque créneau (jour, période)
 
-    # Remplir avec les créneaux
-    for teacher_data in solution['teachers']:
-        teacher_name = teacher_data['name'].split()[0]  # Prénom seulement
-        subject = teacher_data['subject']
+    Pour chaque créneau : nombre d'enseignants, heures totales et les
+    max_names premiers enseignants (dans l'ordre de la solution). La mémoire
+    ne dépend pas du nombre d'enseignants ; add() agrège au fil d'un
+    parcours, from_columnar() en quelques opérations sur le tableau des heures.
+    """
 
+    def __init__(self, days: List[str], periods: List[str], max_names: int = MAX_CELL_TEACHERS):
+        self.days = days
+        self.periods = periods
+        self.max_names = max_names
+        self.counts = np.zeros((len(days), len(periods)), dtype=np.int64)
+        # Flottants : heures fractionnaires possibles avec un calendrier fin
+        self.hours = np.zeros((len(days), len(periods)), dtype=np.float64)
+        self.names = [[[] for _ in periods] for _ in days]
+        self._day_index = {day: j for j, day in enumerate(days)}
+        self._period_index = {period: k for k, period in enumerate(periods)}
+
+    @staticmethod
+    def _label(name: str, subject: str, hours: float) -> str:
+        first_name = name.split()[0] if name.strip() else name  # Prénom seulement
+        return f"{first_name} - {subject} ({format_hours(hours)}h)"
+
+    def add(self, teacher_data: Dict[str, Any]):
+        """Ajoute les créneaux d'un enseignant (créneaux hors grille ignorés)"""
         for slot in teacher_data['time_slots']:
-            day = slot['day']
-            period = slot['period']
-            hours = slot['hours']
-            grid[day][period] = f"{teacher_name}\n{subject}\n({hours}h)"
+            j = self._day_index.get(slot['day'])
+            k = self._period_index.get(slot['period'])
+            if j is None or k is None or slot['hours'] <= 0:
+                continue
+            self.counts[j, k] += 1
+            self.hours[j, k] += slot['hours']
+            names = self.names[j][k]
+            if len(names) < self.max_names:
+                names.append(self._label(teacher_data['name'], teacher_data['subject'], slot['hours']))
+
+    @classmethod
+    def from_columnar(cls, solution: ColumnarSolution, max_names: int = MAX_CELL_TEACHERS) -> 'SlotAggregator':
+        """Agrégation vectorisée d'une solution en colonnes"""
+        aggregator = cls(list(solution.days), list(solution.periods), max_names)
+        used = solution.hours > 0
+        aggregator.counts = used.sum(axis=0)
+        aggregator.hours = np.where(used, solution.hours, 0).sum(axis=0).astype(np.float64)
+        for j in range(len(solution.days)):
+            for k in range(len(solution.periods)):
+                for i in np.flatnonzero(used[:, j, k])[:max_names].tolist():
+                    aggregator.names[j][k].append(cls._label(
+                        solution.teachers[i], solution.subjects[i], solution.hours[i, j, k]
+                    ))
+        return aggregator
+
+    def cell(self, j: int, k: int) -> List[str]:
+        """Lignes d'une case : enseignants nommés, reste et total"""
+        count = int(self.counts[j, k])
+        if count == 0:
+            return []
+        lines = list(self.names[j][k])
+        if count > len(lines):
+            lines.append(f"+ {count - len(lines)} autres")
+        if count > 1:
+            lines.append(f"Total : {count} enseignants, {format_hours(self.hours[j, k])}h")
+        return lines
+
+    def grid(self) -> Dict[str, Dict[str, str]]:
+        """Grille {jour: {période: texte de la case}}"""
+        return {
+            day: {period: "\n".join(self.cell(j, k)) or "-" for k, period in enumerate(self.periods)}
+            for j, day in enumerate(self.days)
+        }
+
+def aggregate_slots(solution: AnySolution, max_names: int = MAX_CELL_TEACHERS) -> SlotAggregator:
+    """Agrège les enseignants de chaque créneau (un seul parcours de la solution)"""
+    if isinstance(solution, ColumnarSolution):
+        return SlotAggregator.from_columnar(solution, max_names)
+    aggregator = SlotAggregator(*_solution_axes(solution), max_names)
+    for teacher_data in iter_teachers(solution):
+        aggregator.add(teacher_data)
+    return aggregator
+
+def create_weekly_grid(solution: AnySolution, max_names: int = MAX_CELL_TEACHERS) -> Dict[str, Dict[str, str]]:
+    """
+    Crée une grille hebdomadaire du planning
 
-    return grid
+    Chaque case regroupe tous les enseignants du créneau : les max_names
+    premiers sont nommés, les autres sont comptés.
+
+    Returns:
+        Dictionnaire {jour: {période: enseignants-matières-heures}}
+    """
+    return aggregate_slots(solution, max_names).grid()
 
 def display_grid_table(grid: Dict[str, Dict[str, str]]):
     """Affiche la grille sous forme de tableau"""
@@ -43,34 +165,252 @@ def display_grid_table(grid: Dict[str, Dict[str, str]]):
     # Préparer les données pour tabulate
     table_data = []
 
+    # Périodes de la grille, dans l'ordre du calendrier (pas forcément matin / après-midi)
+    period_names = list(next(iter(grid.values()))) if grid else []
     for day, periods in grid.items():
-        row = [day, periods['matin'], periods['après-midi']]
+        row = [day] + [periods.get(period, "-") for period in period_names]
         table_data.append(row)
 
-    headers = ["Jour", "Matin (1-2h)", "Après-midi (1-2h)"]
+    headers = ["Jour"] + [period[:1].upper() + period[1:] for period in period_names]
 
     print(tabulate(table_data, headers=headers, tablefmt="grid"))
 
-def display_teacher_schedules(solution: Dict):
-    """Affiche le planning par enseignant"""
+def _schedule_row(teacher_data: Dict[str, Any], days: List[str]) -> List[str]:
+    """Ligne du tableau des plannings : enseignant, heures et créneaux de chaque jour"""
+    cells = {day: [] for day in days}
+    for slot in teacher_data['time_slots']:
+        cells.setdefault(slot['day'], []).append(f"{slot['period']} {slot['hours']}h")
+    return [
+        teacher_data['name'],
+        teacher_data['subject'],
+        f"{teacher_data['hours_required']}h",
+        f"{teacher_data['total_hours_assigned']}h"
+    ] + [" + ".join(cells[day]) or "-" for day in days]
+
+def _format_table(headers: List[str], rows: List[List[str]]) -> str:
+    """Tableau texte à largeurs fixes (une page), sans tabulate"""
+    widths = [len(header) for header in headers]
+    for row in rows:
+        for c, value in enumerate(row):
+            if len(value) > widths[c]:
+                widths[c] = len(value)
+    lines = [" | ".join(header.ljust(width) for header, width in zip(headers, widths))]
+    lines.append("-+-".join("-" * width for width in widths))
+    for row in rows:
+        lines.append(" | ".join(value.ljust(width) for value, width in zip(row, widths)))
+    return "\n".join(lines)
+
+def display_teacher_schedules(
+    solution: AnySolution,
+    page_size: int = PAGE_SIZE,
+    max_pages: Optional[int] = None,
+    out: Optional[TextIO] = None
+):
+    """
+    Affiche le planning par enseignant
+
+    Jusqu'à VERBOSE_TEACHERS enseignants, chaque planning est détaillé.
+    Au-delà, les enseignants sont affichés par pages de page_size lignes
+    (un tableau texte par page, écrit dès qu'il est prêt) : temps et
+    mémoire restent proportionnels à la taille de la page.
+
+    Args:
+        solution: Solution à afficher
+        page_size: Enseignants par page
+        max_pages: Nombre maximal de pages affichées (None : toutes)
+        out: Flux de sortie (sys.stdout par défaut)
+    """
+    out = out or sys.stdout
 
-    print("\n" + "="*80)
-    print("PLANNING PAR ENSEIGNANT")
-    print("="*80)
+    print("\n" + "="*80, file=out)
+    print("PLANNING PAR ENSEIGNANT", file=out)
+    print("="*80, file=out)
 
-    for teacher_data in solution['teachers']:
-        print(f"\n{teacher_data['name']} - {teacher_data['subject']}")
-        print(f"  Heures requises : {teacher_data['hours_required']}h")
-        print(f"  Heures assignées : {teacher_data['total_hours_assigned']}h")
-        print(f"  Créneaux :")
+    count = _teacher_count(solution)
+    if count is not None and count <= VERBOSE_TEACHERS:
+        for teacher_data in iter_teachers(solution):
+            print(f"\n{teacher_data['name']} - {teacher_data['subject']}", file=out)
+            print(f"  Heures requises : {teacher_data['hours_required']}h", file=out)
+            print(f"  Heures assignées : {teacher_data['total_hours_assigned']}h", file=out)
+            print(f"  Créneaux :", file=out)
 
-        for slot in teacher_data['time_slots']:
-            print(f"    - {slot['day']} {slot['period']} ({slot['hours']}h)")
+            for slot in teacher_data['time_slots']:
+                print(f"    - {slot['day']} {slot['period']} ({slot['hours']}h)", file=out)
+        return
+
+    days, _ = _solution_axes(solution)
+    headers = ["Enseignant", "Matière", "Requises", "Assignées"] + days
+    total_pages = None if count is None else math.ceil(count / page_size)
+    for number, page in enumerate(_pages(iter_teachers(solution), page_size), 1):
+        if max_pages is not None and number > max_pages:
+            remaining = f" sur {total_pages}" if total_pages else ""
+            out.write(f"\n... {max_pages} page(s) affichée(s){remaining}\n")
+            break
+        of_total = f"/{total_pages}" if total_pages else ""
+        out.write(f"\nPage {number}{of_total}\n")
+        out.write(_format_table(headers, [_schedule_row(teacher_data, days) for teacher_data in page]) + "\n")
+        out.flush()
+
+# ----------------------------------------------------------------------
+# Rapport HTML
+# ----------------------------------------------------------------------
+
+_HTML_STYLE = """
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; margin: 0.5em 0 1.5em; }
+th, td { border: 1px solid #ccc; padding: 0.3em 0.6em; vertical-align: top; }
+th { background: #f0f0f0; }
+td.empty { color: #aaa; }
+.teacher { margin-bottom: 1.5em; }
+nav { margin: 1em 0; }
+"""
+
+_HTML_TAIL = "\n</body>\n</html>\n"
+
+def _html_head(title: str) -> str:
+    return (
+        "<!DOCTYPE html>\n<html lang=\"fr\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)}</title>\n<style>{_HTML_STYLE}</style>\n</head>\n<body>\n"
+    )
+
+def _html_teacher(teacher_data: Dict[str, Any], anchor: str, days: List[str], periods: List[str]) -> str:
+    """Bloc HTML d'un enseignant : en-tête et grille jour x période"""
+    hours = {(slot['day'], slot['period']): slot['hours'] for slot in teacher_data['time_slots']}
+    rows = []
+    for period in periods:
+        cells = []
+        for day in days:
+            value = hours.get((day, period))
+            cells.append(f"<td>{value}h</td>" if value else "<td class=\"empty\">-</td>")
+        rows.append(f"<tr><th>{html.escape(period)}</th>{''.join(cells)}</tr>")
+    day_headers = "".join(f"<th>{html.escape(day)}</th>" for day in days)
+    return (
+        f"<div class=\"teacher\" id=\"{anchor}\">"
+        f"<h3>{html.escape(teacher_data['name'])} - {html.escape(teacher_data['subject'])}</h3>"
+        f"<p>{teacher_data['total_hours_assigned']}h assignées / {teacher_data['hours_required']}h requises</p>"
+        f"<table><tr><th></th>{day_headers}</tr>{''.join(rows)}</table></div>"
+    )
+
+def _write_html_page(
+    path: str,
+    number: int,
+    page: List[Dict[str, Any]],
+    first_index: int,
+    has_next: bool,
+    days: List[str],
+    periods: List[str]
+):
+    """Écrit une page du rapport, enseignant par enseignant"""
+    links = ['<a href="index.html">Sommaire</a>']
+    if number > 1:
+        links.append(f'<a href="{_html_page_file(number - 1)}">Page précédente</a>')
+    if has_next:
+        links.append(f'<a href="{_html_page_file(number + 1)}">Page suivante</a>')
+    nav = f"<nav>{' | '.join(links)}</nav>"
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(_html_head(f"Planning - page {number}"))
+        f.write(f"<h1>Planning - page {number}</h1>\n{nav}\n")
+        for offset, teacher_data in enumerate(page):
+            f.write(_html_teacher(teacher_data, f"t{first_index + offset}", days, periods) + "\n")
+        f.write(nav)
+        f.write(_HTML_TAIL)
+
+def _html_page_file(number: int) -> str:
+    return f"page-{number:05d}.html"
+
+def export_html_report(
+    solution: AnySolution,
+    output_dir: str = "planning_html",
+    page_size: int = HTML_PAGE_SIZE,
+    max_names: int = MAX_CELL_TEACHERS
+) -> str:
+    """
+    Exporte un rapport HTML statique du planning
+
+    - index.html : résumé, grille hebdomadaire agrégée (tous les
+      enseignants de chaque créneau) et sommaire des pages
+    - page-00001.html, ... : page_size enseignants par page, chacun avec sa
+      grille jour x période et une ancre (#t<indice>)
+
+    Les pages sont écrites au fil d'un seul parcours de la solution : la
+    mémoire utilisée dépend de page_size, pas du nombre d'enseignants.
 
-def validate_solution(solution: Dict) -> bool:
+    Args:
+        solution: Solution à exporter
+        output_dir: Répertoire du rapport (créé au besoin)
+        page_size: Enseignants par page
+        max_names: Enseignants nommés dans chaque case de la grille
+
+    Returns:
+        Chemin de index.html
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    days, periods = _solution_axes(solution)
+    columnar = isinstance(solution, ColumnarSolution)
+    aggregator = SlotAggregator.from_columnar(solution, max_names) if columnar else SlotAggregator(days, periods, max_names)
+
+    # Sommaire : (fichier, premier enseignant, dernier enseignant, effectif) par page
+    contents = []
+    pages = _pages(iter_teachers(solution), page_size)
+    page = next(pages, None)
+    number = 1
+    while page is not None:
+        # Page suivante lue d'avance : le lien "suivante" n'est écrit que si elle existe
+        next_page = next(pages, None)
+        if not columnar:
+            for teacher_data in page:
+                aggregator.add(teacher_data)
+        _write_html_page(os.path.join(output_dir, _html_page_file(number)), number, page,
+                         (number - 1) * page_size, next_page is not None, days, periods)
+        contents.append((_html_page_file(number), page[0]['name'], page[-1]['name'], len(page)))
+        page = next_page
+        number += 1
+
+    header = _solution_header(solution)
+    body = [f"<h1>{html.escape(str(header.get('problem_name')))}</h1>"]
+    body.append(
+        f"<p>Statut : {html.escape(str(header.get('status')))} - "
+        f"objectif : {html.escape(str(header.get('objective_value')))} - "
+        f"{sum(count for *_, count in contents)} enseignants</p>"
+    )
+
+    body.append("<h2>Emploi du temps</h2>\n<table>")
+    body.append("<tr><th>Jour</th>" + "".join(f"<th>{html.escape(period)}</th>" for period in periods) + "</tr>")
+    for j, day in enumerate(days):
+        cells = []
+        for k in range(len(periods)):
+            lines = aggregator.cell(j, k)
+            cells.append(f"<td>{'<br>'.join(html.escape(line) for line in lines)}</td>" if lines
+                         else "<td class=\"empty\">-</td>")
+        body.append(f"<tr><th>{html.escape(day)}</th>{''.join(cells)}</tr>")
+    body.append("</table>")
+
+    body.append("<h2>Plannings par enseignant</h2>\n<table>")
+    body.append("<tr><th>Page</th><th>Enseignants</th><th>Effectif</th></tr>")
+    for file, first, last, count in contents:
+        body.append(f'<tr><td><a href="{file}">{file}</a></td>'
+                    f"<td>{html.escape(first)} ... {html.escape(last)}</td><td>{count}</td></tr>")
+    body.append("</table>")
+
+    index = os.path.join(output_dir, "index.html")
+    with open(index, 'w', encoding='utf-8') as f:
+        f.write(_html_head(f"Planning - {header.get('problem_name')}"))
+        f.write("\n".join(body))
+        f.write(_HTML_TAIL)
+
+    print(f"\n[OK] Rapport HTML exporté dans {index} ({len(contents)} page(s))")
+    return index
+
+def validate_solution(solution: AnySolution, availability: Optional[AvailabilityIndex] = None) -> bool:
     """
     Valide que la solution respecte toutes les contraintes
 
+    Args:
+        solution: Solution à valider
+        availability: Index des disponibilités du problème ; si fourni, chaque
+            créneau utilisé doit tomber sur un jour disponible
+
     Returns:
         True si valide, False sinon
     """
@@ -81,23 +421,55 @@ def validate_solution(solution: Dict) -> bool:
     errors = []
     warnings = []
 
-    # Vérifier que chaque enseignant a le bon nombre d'heures
-    for teacher_data in solution['teachers']:
-        required = teacher_data['hours_required']
-        assigned = teacher_data['total_hours_assigned']
-
-        if required != assigned:
-            errors.append(
-                f"{teacher_data['name']}: {assigned}h assignées au lieu de {required}h"
-            )
-
-    # Vérifier qu'il n'y a pas de doublons de jours
-    for teacher_data in solution['teachers']:
-        days_used = [slot['day'] for slot in teacher_data['time_slots']]
-        if len(days_used) != len(set(days_used)):
-            errors.append(
-                f"{teacher_data['name']}: Plusieurs créneaux le même jour"
-            )
+    if isinstance(solution, ColumnarSolution):
+        errors = _validate_columnar(solution, availability)
+    else:
+        if availability is not None:
+            slot_bits = {
+                (day, period): availability.slot_bit(j, k)
+                for j, day in enumerate(availability.days)
+                for k, period in enumerate(availability.periods)
+            }
+
+        # Un seul parcours (une solution NDJSON est relue à chaque itération)
+        day_errors = []
+        availability_errors = []
+        for teacher_data in iter_teachers(solution):
+            # Vérifier que chaque enseignant a le bon nombre d'heures
+            required = teacher_data['hours_required']
+            assigned = teacher_data['total_hours_assigned']
+
+            if required != assigned:
+                errors.append(
+                    f"{teacher_data['name']}: {assigned}h assignées au lieu de {required}h"
+                )
+
+            # Vérifier qu'il n'y a pas de doublons de jours
+            days_used = [slot['day'] for slot in teacher_data['time_slots']]
+            if len(days_used) != len(set(days_used)):
+                day_errors.append(
+                    f"{teacher_data['name']}: Plusieurs créneaux le même jour"
+                )
+
+            # Vérifier que chaque créneau utilisé est sur un jour disponible
+            if availability is not None:
+                used = 0
+                off_grid = []
+                for slot in teacher_data['time_slots']:
+                    if slot['hours'] <= 0:
+                        continue
+                    bit = slot_bits.get((slot['day'], slot['period']))
+                    if bit is None:
+                        off_grid.append(slot['day'])
+                    else:
+                        used |= bit
+                outside = used & ~availability.mask(teacher_data['name'])
+                if outside or off_grid:
+                    availability_errors.append(_availability_error(
+                        teacher_data['name'], availability.day_names(outside) + off_grid
+                    ))
+        errors.extend(day_errors)
+        errors.extend(availability_errors)
 
     # Afficher les résultats
     if errors:
@@ -114,32 +486,78 @@ def validate_solution(solution: Dict) -> bool:
     print("\n[OK] Solution valide!")
     return True
 
-def export_to_csv(solution: Dict, output_file: str = "planning.csv"):
-    """Exporte le planning au format CSV"""
-    import csv
+def _availability_error(teacher: str, days: List[str]) -> str:
+    return f"{teacher}: Créneaux hors disponibilités ({', '.join(days)})"
 
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Enseignant', 'Matière', 'Jour', 'Période', 'Heures'])
-
-        for teacher_data in solution['teachers']:
-            for slot in teacher_data['time_slots']:
-                writer.writerow([
-                    teacher_data['name'],
-                    teacher_data['subject'],
-                    slot['day'],
-                    slot['period'],
-                    slot['hours']
-                ])
+def _validate_columnar(solution: ColumnarSolution, availability: Optional[AvailabilityIndex] = None) -> List[str]:
+    """Mêmes vérifications que validate_solution, vectorisées sur le tableau des heures"""
+    errors = []
 
-    print(f"\n[OK] Planning exporté dans {output_file}")
+    # Heures assignées différentes des heures requises
+    total_hours = solution.total_hours
+    for i in np.flatnonzero(total_hours != solution.hours_required).tolist():
+        errors.append(
+            f"{solution.teachers[i]}: {format_hours(total_hours[i])}h assignées au lieu de "
+            f"{int(solution.hours_required[i])}h"
+        )
+
+    # Plusieurs créneaux le même jour
+    slots_per_day = (solution.hours > 0).sum(axis=2)
+    for i in np.flatnonzero((slots_per_day > 1).any(axis=1)).tolist():
+        errors.append(f"{solution.teachers[i]}: Plusieurs créneaux le même jour")
+
+    # Créneaux utilisés hors disponibilités : masque de la solution ET NON disponibilité
+    if availability is not None:
+        if solution.teachers is availability.teachers:
+            masks = availability.masks
+        else:
+            masks = availability.masks_for(solution.teachers)
+        outside = availability.unavailable(AvailabilityIndex.pack(solution.hours > 0), masks)
+        for i in np.flatnonzero(outside).tolist():
+            errors.append(_availability_error(solution.teachers[i], availability.day_names(int(outside[i]))))
+
+    return errors
+
+def export_to_csv(
+    solution: AnySolution,
+    output_file: str = "planning.csv",
+    layout: str = "long",
+    compression: Optional[str] = None
+):
+    """
+    Exporte le planning au format CSV
+
+    Args:
+        solution: Solution à exporter (une solution en colonnes est écrite
+            directement depuis le tableau des heures)
+        output_file: Fichier de sortie (planning.csv.gz, .bz2, .xz ou .zst : compressé)
+        layout: "long" (une ligne par créneau) ou "wide" (une ligne par
+            enseignant, une colonne par jour x période)
+        compression: Compression explicite (par défaut : d'après l'extension)
+    """
+    rows = write_csv(solution, output_file, layout, compression)
+    print(f"\n[OK] Planning exporté dans {output_file} ({rows} lignes)")
 
 if __name__ == "__main__":
-    # Charger la solution
-    solution = load_solution()
-
-    # Valider
-    is_valid = validate_solution(solution)
+    import argparse
+    from load_problem import load_problem_data
+
+    parser = argparse.ArgumentParser(description="Visualisation d'une solution")
+    parser.add_argument("solution", nargs="?", default="solution.json",
+                        help="Fichier de solution (.json, .ndjson ou .bin)")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Enseignants par page")
+    parser.add_argument("--max-pages", type=int, default=None, help="Pages affichées dans le terminal")
+    parser.add_argument("--html", default=None, help="Répertoire du rapport HTML")
+    args = parser.parse_args()
+
+    # Charger la solution (solution.json, .ndjson ou .bin)
+    solution = load_solution(args.solution)
+
+    # Valider (disponibilités comprises si le fichier du problème est présent)
+    availability = None
+    if os.path.exists("problem_structure.json"):
+        availability = AvailabilityIndex.from_data(load_problem_data("problem_structure.json"))
+    is_valid = validate_solution(solution, availability)
 
     if is_valid:
         # Créer la grille
@@ -147,7 +565,9 @@ if __name__ == "__main__":
 
         # Afficher
         display_grid_table(grid)
-        display_teacher_schedules(solution)
+        display_teacher_schedules(solution, args.page_size, args.max_pages)
 
-        # Exporter en CSV
-        export_to_csv(solution)
\ No newline at end of file
+        # Exporter en CSV et en HTML
+        export_to_csv(solution)
+        if args.html:
+            export_html_report(solution, args.html)